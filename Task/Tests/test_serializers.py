@@ -59,10 +59,11 @@ class TaskSerializerTest(TestCase):
         # Prepare duplicated data,
         duplicate_data = {'name': 'Test Task'}
 
-        # Check is validation running correctly
+        # Uniqueness is left to the database constraint, so the error surfaces on save
         serializer = TaskCreateSerializer(data=duplicate_data, context=self.context)
+        self.assertTrue(serializer.is_valid())
         with self.assertRaises(ValidationError) as context:
-            serializer.is_valid(raise_exception=True)
+            serializer.save()
 
         # Check error msg
         errors = context.exception.detail['non_field_errors']
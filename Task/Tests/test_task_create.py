@@ -1,10 +1,12 @@
 # Django imports
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 # DRF imports
 from rest_framework import status
 # Internal imports
-from TimeMate.Utils.test_helpers import get_error_code
+from TimeMate.Utils.test_helpers import get_app_queries, get_error_code
 from Task.validators import VALIDATION_ERROR_CODE_UNIQUE_TASK_NAME
 from .base import BaseTaskAPITestCase
 
@@ -66,4 +68,21 @@ class TaskCreateViewTests(BaseTaskAPITestCase):
         response = self.client.post(self.url, data, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(response.data['owner']['username'], self.user1.username)
\ No newline at end of file
+        self.assertEqual(response.data['owner']['username'], self.user1.username)
+
+    def test_create_task_query_budget(self):
+        """
+        Creating a task is a single INSERT, also when the name is taken: uniqueness is left to the constraint.
+        """
+        self.authenticate(self.user1)
+        payload = {'name': 'Test Task'}
+
+        for expected_status in (status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(self.url, payload, format='json')
+
+            self.assertEqual(response.status_code, expected_status)
+            queries = get_app_queries(context.captured_queries)
+            self.assertEqual(len(queries), 1, queries)
+            self.assertTrue(queries[0].startswith('INSERT'))
+        self.assertEqual(get_error_code(response.data['non_field_errors']), VALIDATION_ERROR_CODE_UNIQUE_TASK_NAME)
@@ -1,9 +1,11 @@
 # Django imports
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 # DRF imports
 from rest_framework import status
 # Internal imports
-from TimeMate.Utils.test_helpers import get_error_code
+from TimeMate.Utils.test_helpers import get_app_queries, get_error_code
 from Task.models import Task
 from Task.validators import VALIDATION_ERROR_CODE_UNIQUE_TASK_NAME
 from TimeMate.Permissions.owner_permissions import PERMISSION_ERROR_CODE_NOT_TASK_OWNER
@@ -90,3 +92,18 @@ class TaskUpdateTests(BaseTaskAPITestCase):
         self.task.refresh_from_db()
         # Owner pozostaje user1
         self.assertEqual(self.task.owner, self.user1)
+
+    def test_update_task_query_budget(self):
+        """
+        Ensure that a rename runs no uniqueness query before the UPDATE.
+        """
+        self.authenticate(self.user1)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(self.detail_url, {"name": "Renamed Task"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = get_app_queries(context.captured_queries)
+        # Task lookup filtered by owner, UPDATE.
+        self.assertEqual(len(queries), 2, queries)
+        self.assertTrue(queries[-1].startswith('UPDATE'))
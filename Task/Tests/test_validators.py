@@ -1,54 +1,23 @@
 # Python imports
 import uuid
 # Django Imports
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 # DRF imports
 from rest_framework.serializers import ValidationError
 # Internal imports
-from TimeMate.Utils.test_helpers import get_error_code
+from TimeMate.Utils.test_helpers import get_app_queries
 from Task.models import Task
-from Task.validators import unique_owner_for_task_name, get_task_or_raise, validate_task_ownership
-from Task.validators import VALIDATION_ERROR_CODE_UNIQUE_TASK_NAME, VALIDATION_ERROR_CODE_TASK_NOT_FOUND, \
-    VALIDATION_ERROR_CODE_TASK_INVALID_OWNER
+from Task.validators import get_task_or_raise, validate_task_ownership, \
+    cache_task_owner, get_task_owner_cache_key
+from Task.validators import VALIDATION_ERROR_CODE_TASK_NOT_FOUND, VALIDATION_ERROR_CODE_TASK_INVALID_OWNER
 
 User = get_user_model()
 
 
-class UniqueOwnerForTaskNameValidatorTests(TestCase):
-    def setUp(self):
-        # User objects related set up
-        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
-        # Data set up
-        self.task_name = "Test Task"
-
-    def test_validator_passes_when_task_does_not_exist(self):
-        """
-        Ensure that validation passes when no task with the given name exists for the user.
-        """
-        try:
-            # Call validation when the task does not exist.
-            unique_owner_for_task_name(self.user, self.task_name)
-        except ValidationError:
-            self.fail("ValidationError raised unexpectedly when task does not exist.")
-
-    def test_validator_raises_error_when_task_exists(self):
-        """
-        Ensure that validation raises an error when a task with the given name already exists for the user.
-        """
-        # Create a task first.
-        Task.objects.create(name=self.task_name, owner=self.user)
-
-        with self.assertRaises(ValidationError) as context:
-            # Call validation when the task exists.
-            unique_owner_for_task_name(self.user, self.task_name)
-
-        errors = context.exception.detail
-        self.assertEqual(get_error_code(errors), VALIDATION_ERROR_CODE_UNIQUE_TASK_NAME)
-        self.assertIn(self.task_name, str(errors))
-        self.assertIn(self.user.username, str(errors))
-
-
 class GetTaskOrRaiseValidatorTests(TestCase):
     def setUp(self):
         # User objects related set up
@@ -110,3 +79,80 @@ class ValidateTaskOwnershipTests(TestCase):
 
         error_msg = context.exception.detail[0]
         self.assertEqual(error_msg.code, VALIDATION_ERROR_CODE_TASK_NOT_FOUND)
+
+    def test_validate_task_ownership_by_id_runs_one_query(self):
+        """
+        Ensure an owned task ID is resolved with a single query, without loading the owner.
+        """
+        with CaptureQueriesContext(connection) as context:
+            fetched_task = validate_task_ownership(str(self.task.id), self.user)
+        self.assertEqual(fetched_task, self.task)
+        self.assertEqual(len(get_app_queries(context.captured_queries)), 1)
+
+    def test_validate_task_ownership_memoizes_per_request(self):
+        """
+        Ensure repeated references to the same task within one request hit the database once.
+        """
+        request = RequestFactory().post('/time-entries/')
+
+        with CaptureQueriesContext(connection) as context:
+            for _ in range(3):
+                fetched_task = validate_task_ownership(self.task.id, self.user, request=request)
+        self.assertEqual(fetched_task, self.task)
+        self.assertEqual(len(get_app_queries(context.captured_queries)), 1)
+
+    def test_validate_task_ownership_by_id_of_other_user(self):
+        """
+        Ensure a task ID of another user is rejected as invalid owner, not as missing.
+        """
+        with self.assertRaises(ValidationError) as context:
+            validate_task_ownership(self.task.id, self.not_owner_user)
+
+        error_msg = context.exception.detail[0]
+        self.assertEqual(error_msg.code, VALIDATION_ERROR_CODE_TASK_INVALID_OWNER)
+
+
+class TaskOwnerCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.other_user = User.objects.create_user(username='other', email='<EMAIL>', password='<PASSWORD>')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task = Task.objects.create(name='Test Task', owner=self.user)
+
+    def test_task_save_caches_owner_on_commit(self):
+        self.assertEqual(cache.get(get_task_owner_cache_key(self.task.id)), self.user.pk)
+
+    def test_cached_owner_needs_no_query(self):
+        """
+        Ensure a task ID found in the owner cache is validated without touching the database.
+        """
+        with CaptureQueriesContext(connection) as context:
+            fetched_task = validate_task_ownership(str(self.task.id), self.user)
+
+        self.assertEqual(get_app_queries(context.captured_queries), [])
+        self.assertEqual(fetched_task.pk, self.task.pk)
+        self.assertEqual(fetched_task.owner_id, self.user.pk)
+
+    def test_stale_cached_owner_falls_back_to_database(self):
+        """
+        Ensure a cache entry naming another owner is not trusted: the database decides, and the entry is repaired.
+        """
+        cache_task_owner(self.task.id, self.other_user.pk)
+
+        with CaptureQueriesContext(connection) as context:
+            fetched_task = validate_task_ownership(self.task.id, self.user)
+
+        self.assertEqual(fetched_task, self.task)
+        self.assertEqual(len(get_app_queries(context.captured_queries)), 1)
+        self.assertEqual(cache.get(get_task_owner_cache_key(self.task.id)), self.user.pk)
+
+    def test_task_delete_drops_cached_owner(self):
+        task_id = self.task.id
+
+        self.task.delete()
+
+        self.assertIsNone(cache.get(get_task_owner_cache_key(task_id)))
+        with self.assertRaises(ValidationError) as context:
+            validate_task_ownership(task_id, self.user)
+        self.assertEqual(context.exception.detail[0].code, VALIDATION_ERROR_CODE_TASK_NOT_FOUND)
@@ -1,14 +1,17 @@
 # DRF imports
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 # Internal imports
 from .models import Task
 from TimeMate.Serializers.user_serializers import UserSerializer
-from .validators import unique_owner_for_task_name
-from TimeMate.Utils.mixins import OwnerRepresentationMixin
+from .validators import get_unique_task_name_error, validate_task_ownership
+from TimeMate.Utils.mixins import ConstraintViolationMixin, OwnerRepresentationMixin
 
 
-class TaskCreateSerializer(OwnerRepresentationMixin, serializers.ModelSerializer):
+class TaskCreateSerializer(ConstraintViolationMixin, OwnerRepresentationMixin, serializers.ModelSerializer):
     owner = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    # Unique names are enforced by the constraint on insert, without a query beforehand.
+    constraint_errors = {'unique_task_name_per_owner': api_settings.NON_FIELD_ERRORS_KEY}
 
     class Meta:
         model = Task
@@ -17,11 +20,8 @@ class TaskCreateSerializer(OwnerRepresentationMixin, serializers.ModelSerializer
         # Overwrite validators attribute to turn off default UniqueConstraint validator
         validators = []
 
-    def validate(self, data):
-        data = super().validate(data)
-        # Calling custom validator
-        unique_owner_for_task_name(data['owner'], data.get('name'))
-        return data
+    def get_constraint_error(self, constraint, validated_data):
+        return get_unique_task_name_error(validated_data['owner'], validated_data.get('name'))
 
 
 class TaskDetailSerializer(OwnerRepresentationMixin, serializers.ModelSerializer):
@@ -39,8 +39,26 @@ class TaskListSerializer(serializers.ModelSerializer):
         fields = ['name', 'id', 'detail_url']
 
 
-class TaskUpdateSerializer(serializers.ModelSerializer):
+class OwnedTaskField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field accepting only tasks of the request user.
+
+    Resolves the ID with `validate_task_ownership` (one query filtered by owner, memoized
+    per request) instead of loading the task by ID and then its owner for the check.
+    """
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Task.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        request = self.context['request']
+        return validate_task_ownership(data, request.user, request=request)
+
+
+class TaskUpdateSerializer(ConstraintViolationMixin, serializers.ModelSerializer):
     owner = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    # A rename onto an existing name is rejected by the constraint on update, without a query beforehand.
+    constraint_errors = {'unique_task_name_per_owner': 'name'}
 
     class Meta:
         model = Task
@@ -48,9 +66,6 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at']
         validators = []
 
-    def validate_name(self, value):
-        # In update operations, validate the 'name' field only if it has changed.
-        if self.instance and value != self.instance.name:
-            # Check correctness of the new data by unique_owner_for_task_name
-            unique_owner_for_task_name(self.instance.owner, value)
-        return value
+    def get_constraint_error(self, constraint, validated_data):
+        # `update()` has already applied the new values; partial updates carry no `owner` in `validated_data`.
+        return get_unique_task_name_error(self.instance.owner, self.instance.name)
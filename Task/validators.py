@@ -2,34 +2,67 @@
 VALIDATION_ERROR_CODE_UNIQUE_TASK_NAME = "unique_task_name"
 VALIDATION_ERROR_CODE_TASK_NOT_FOUND = "task_not_found"
 VALIDATION_ERROR_CODE_TASK_INVALID_OWNER = "task_invalid_owner"
+# Django imports
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
 # DRF imports
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 # Internal imports
 from .models import Task
 
+# Task owners rarely change; entries are rewritten by `Task` signals and dropped on delete.
+TASK_OWNER_CACHE_TIMEOUT = 24 * 3600
 
-def unique_owner_for_task_name(owner, task_name):
+
+def get_unique_task_name_error(owner, task_name):
+    """
+    Build the error reported when the owner already has a task named `task_name`,
+    found by the `unique_task_name_per_owner` constraint.
+
+    :rtype: serializers.ValidationError
     """
-    Check for unique ownership of a task name.
+    return serializers.ValidationError(
+        f"This user: {owner.username}, already has an object with the same name: {task_name}",
+        code=VALIDATION_ERROR_CODE_UNIQUE_TASK_NAME
+    )
+
+
+def get_task_owner_cache_key(task_id):
+    return f'task_owner:{task_id}'
 
-    This function checks whether a task name provided by an owner already
-    exists in the database. If the task name already exists under the specified
-    owner, it raises a validation error. It helps maintain the uniqueness of
-    task names within each owner's scope.
 
-    :param owner: The user who owns the task.
-    :type owner: User
-    :param task_name: The name of the task to be checked for uniqueness.
-    :type task_name: str
-    :raises serializers.ValidationError: If the owner already has a task with
-        the provided name.
+def cache_task_owner(task_id, owner_id):
+    cache.set(get_task_owner_cache_key(task_id), owner_id, TASK_OWNER_CACHE_TIMEOUT)
+
+
+def forget_task_owners(task_ids):
+    cache.delete_many([get_task_owner_cache_key(task_id) for task_id in task_ids])
+
+
+def get_cached_owned_task(task_id, user):
     """
-    if Task.objects.filter(owner=owner, name=task_name).exists():
-        raise serializers.ValidationError(
-            f"This user: {owner.username}, already has an object with the same name: {task_name}",
-            code=VALIDATION_ERROR_CODE_UNIQUE_TASK_NAME
-        )
+    Return a task of `user` built from the cached `task_id -> owner_id` map, without touching the database.
+
+    :param task_id: Primary key of the task.
+    :type task_id: UUID
+    :param user: The user expected to own the task.
+    :return: The task, or None on a cache miss or when the cached owner is someone else,
+        in which case the caller must ask the database. The task may have been deleted since it was cached:
+        writes report its foreign key violation with `get_deleted_task_error`.
+    :rtype: Task | None
+    """
+    if cache.get(get_task_owner_cache_key(task_id)) != user.pk:
+        return None
+    return build_owned_task(task_id, user)
+
+
+def build_owned_task(task_id, user):
+    """
+    Build a task of `user` with only `id` and `owner_id` loaded; other fields are deferred and load on access.
+    """
+    # No database alias: routers pick one when the task is used, like for a new instance.
+    return Task.from_db(None, ['id', 'owner_id'], [task_id, user.pk])
 
 
 def get_task_or_raise(task_value):
@@ -57,40 +90,148 @@ def get_task_or_raise(task_value):
     try:
         task = Task.objects.get(id=task_value)
     except Task.DoesNotExist:
-        raise serializers.ValidationError(
-            "Task with given id does not exist",
-            code=VALIDATION_ERROR_CODE_TASK_NOT_FOUND
-        )
+        raise get_task_not_found_error()
     return task
 
 
-def validate_task_ownership(task_value, user):
+def get_task_not_found_error():
+    return serializers.ValidationError(
+        "Task with given id does not exist",
+        code=VALIDATION_ERROR_CODE_TASK_NOT_FOUND
+    )
+
+
+def get_deleted_task_error(task_ids):
+    """
+    Build the error reported when a write fails on the foreign key of a task resolved from a cached owner
+    (see `get_cached_owned_task`), deleted since. The cached owners of `task_ids` are dropped, so that the
+    next request asks the database.
+
+    :rtype: serializers.ValidationError
+    """
+    forget_task_owners(task_ids)
+    return get_task_not_found_error()
+
+
+def get_task_invalid_owner_error():
+    return ValidationError(
+        "You do not have permission to access this task",
+        code=VALIDATION_ERROR_CODE_TASK_INVALID_OWNER
+    )
+
+
+def get_owned_tasks_memo(request):
+    """
+    Return the per-request memo of resolved tasks: `(user id, task id) -> Task | ValidationError`.
+    """
+    owned_tasks = getattr(request, '_owned_tasks', None)
+    if owned_tasks is None:
+        owned_tasks = request._owned_tasks = {}
+    return owned_tasks
+
+
+def prefetch_owned_tasks(task_values, user, request):
+    """
+    Resolve many task IDs at once for later `validate_task_ownership(..., request=request)` calls.
+
+    IDs found in the task owner cache need no query; the others are loaded with one query filtered
+    by owner, and those not owned are told apart (missing or foreign) with one more. Results, errors
+    included, are memoized on `request`, so validating each item of a batch runs no further query.
+    Malformed IDs are skipped; validating their item reports them.
+
+    :param task_values: Task IDs referenced by the batch, in any spelling and with repetitions.
+    :type task_values: Iterable[UUID | str]
+    :param user: The user the tasks must belong to.
+    :param request: Request to memoize resolved tasks on.
+    :type request: rest_framework.request.Request
+    """
+    owned_tasks = get_owned_tasks_memo(request)
+    task_ids = set()
+    for task_value in task_values:
+        try:
+            task_id = Task._meta.pk.to_python(task_value)
+        except DjangoValidationError:
+            continue
+        if task_id is not None and (user.pk, task_id) not in owned_tasks:
+            task_ids.add(task_id)
+    if not task_ids:
+        return
+
+    cached_owners = cache.get_many([get_task_owner_cache_key(task_id) for task_id in task_ids])
+    for task_id in list(task_ids):
+        if cached_owners.get(get_task_owner_cache_key(task_id)) == user.pk:
+            owned_tasks[(user.pk, task_id)] = build_owned_task(task_id, user)
+            task_ids.discard(task_id)
+    if not task_ids:
+        return
+
+    for task in Task.objects.filter(id__in=task_ids, owner_id=user.pk):
+        cache_task_owner(task.pk, task.owner_id)
+        owned_tasks[(user.pk, task.pk)] = task
+        task_ids.discard(task.pk)
+    if not task_ids:
+        return
+
+    existing = set(Task.objects.filter(id__in=task_ids).values_list('id', flat=True))
+    for task_id in task_ids:
+        owned_tasks[(user.pk, task_id)] = (
+            get_task_invalid_owner_error() if task_id in existing else get_task_not_found_error()
+        )
+
+
+def validate_task_ownership(task_value, user, request=None):
     """
     Validates ownership of a task for a specific user and ensures
     that only the owner can proceed with accessing the task.
 
-    This function retrieves a task using the provided task value,
-    compares the ownership against the given user, and raises a
-    ValidationError if the user does not own the task. If the
-    validation passes, the task object is returned.
+    A task ID is first looked up in the cached `task_id -> owner_id` map, which
+    needs no query at all. On a miss, or when the cached owner differs, it is
+    resolved with a single query already filtered by owner, and the owner is
+    compared by ID, so the owner row is never loaded. Only when no owned task
+    matches does a second query tell a missing task from a foreign one.
+    With `request`, resolved tasks are memoized on it, so repeated references to
+    the same task within one request (e.g. bulk payloads) hit the database once.
 
     :param task_value: The task input, which can either be a Task instance or
         an ID corresponding to a Task object.
     :type task_value: Task | UUID
     :param user: The user attempting to access the task
     :type user: Any relevant user object type
+    :param request: Request to memoize resolved tasks on.
+    :type request: rest_framework.request.Request | None
     :return: The validated task object
-    :rtype: The type returned by the get_task_or_raise function
+    :rtype: Task
 
-    :raises ValidationError: If the task is owned by someone other
-        than the specified user
+    :raises ValidationError: If the task does not exist or is owned by someone
+        other than the specified user
     """
-    task = get_task_or_raise(task_value)
-
-    if task.owner != user:
-        raise ValidationError(
-            "You do not have permission to access this task",
-            code=VALIDATION_ERROR_CODE_TASK_INVALID_OWNER
-        )
+    if isinstance(task_value, Task):
+        task = task_value
+    else:
+        # Same key for every spelling of the ID; raises Django's ValidationError for malformed ones, like a lookup.
+        task_value = Task._meta.pk.to_python(task_value)
+        owned_tasks = None
+        if request is not None:
+            owned_tasks = get_owned_tasks_memo(request)
+            key = (user.pk, task_value)
+            if key in owned_tasks:
+                resolved = owned_tasks[key]
+                if isinstance(resolved, ValidationError):
+                    raise ValidationError(resolved.detail)
+                return resolved
+        task = get_cached_owned_task(task_value, user)
+        if task is None:
+            try:
+                task = Task.objects.get(id=task_value, owner_id=user.pk)
+            except Task.DoesNotExist:
+                # Raises `task_not_found` for a missing task, else falls through to `task_invalid_owner`.
+                task = get_task_or_raise(task_value)
+            else:
+                cache_task_owner(task.pk, task.owner_id)
+        if owned_tasks is not None and task.owner_id == user.pk:
+            owned_tasks[key] = task
+
+    if task.owner_id != user.pk:
+        raise get_task_invalid_owner_error()
 
     return task
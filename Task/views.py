@@ -7,6 +7,7 @@ from .models import Task
 from .serializers import TaskCreateSerializer, TaskDetailSerializer, TaskListSerializer, TaskUpdateSerializer
 from TimeMate.Permissions.owner_permissions import IsObjectOwner
 from TimeMate.Utils.pagination import DefaultPagination
+from TimeMate.Utils.mixins import CompiledListMixin, IdempotencyMixin, OwnedObjectMixin, QuerysetProjectionMixin
 from .filters import TaskFilter
 from .task_spectacular_extensions import (
     TASK_DETAIL_SCHEMA,
@@ -14,13 +15,13 @@ from .task_spectacular_extensions import (
 )
 
 @TASK_DETAIL_SCHEMA
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TaskDetailView(OwnedObjectMixin, QuerysetProjectionMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsObjectOwner]
     serializer_class = TaskDetailSerializer
 
     def get_queryset(self):
         pk = self.kwargs.get("pk")
-        return Task.objects.filter(pk=pk)
+        return Task.objects.filter(pk=pk, owner_id=self.request.user.id)
 
     def get_serializer_class(self):
         if self.request.method in ('PUT', 'PATCH'):
@@ -28,7 +29,7 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
         return TaskDetailSerializer
 
 @TASK_LIST_CREATE_SCHEMA
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(IdempotencyMixin, CompiledListMixin, QuerysetProjectionMixin, generics.ListCreateAPIView):
     permission_classes = [IsObjectOwner]
     pagination_class = DefaultPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
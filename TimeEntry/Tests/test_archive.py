@@ -0,0 +1,130 @@
+# Python imports
+from datetime import timedelta
+from io import StringIO
+# Django imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+# DRF imports
+from rest_framework import status
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from TimeEntry.models import ArchivedTimeEntry, TimeEntry, TimeEntryDailyAggregate, TimeEntryWithArchive
+
+User = get_user_model()
+
+
+@override_settings(TIME_ENTRY_ARCHIVE_HORIZON_DAYS=30)
+class TimeEntryArchiveTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        now = timezone.now()
+        self.old_entries = [
+            self.create_entry(now - timedelta(days=60, hours=hours)) for hours in (2, 4)
+        ]
+        self.recent_entry = self.create_entry(now - timedelta(days=1))
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('time_entry_list_create')
+
+    def create_entry(self, start_time):
+        return TimeEntry.objects.create(
+            task=self.task, owner=self.user, start_time=start_time, end_time=start_time + timedelta(hours=1)
+        )
+
+    def archive(self, **options):
+        call_command('archive_time_entries', stdout=StringIO(), **options)
+
+    def test_command_moves_old_entries_to_archive(self):
+        self.archive(batch_size=1)
+
+        self.assertEqual(list(TimeEntry.objects.values_list('id', flat=True)), [self.recent_entry.id])
+        self.assertEqual(
+            set(ArchivedTimeEntry.objects.values_list('id', flat=True)),
+            {entry.id for entry in self.old_entries}
+        )
+
+    def test_command_aggregates_archived_entries_per_day(self):
+        self.archive(batch_size=1)
+
+        aggregate = TimeEntryDailyAggregate.objects.get()
+        self.assertEqual(aggregate.entry_count, 2)
+        self.assertEqual(aggregate.total_duration, timedelta(hours=2))
+        self.assertEqual(aggregate.task, self.task)
+
+    @override_settings(TIME_ENTRY_ARCHIVE_HORIZON_DAYS=None)
+    def test_command_fails_when_archiving_is_disabled(self):
+        with self.assertRaises(CommandError):
+            self.archive()
+
+    def test_command_invalidates_cached_lists(self):
+        self.client.get(self.url)
+        self.assertTrue(list(cache.iter_keys('*')))
+
+        self.archive()
+
+        self.assertFalse(list(cache.iter_keys('*')))
+
+    def test_list_without_window_includes_archived_entries(self):
+        self.archive()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(
+            {entry['duration'] for entry in response.data['results']},
+            {'01:00:00'}
+        )
+
+    def test_list_with_recent_window_skips_archive(self):
+        self.archive()
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(
+                self.url, {'end_time_after': (timezone.now() - timedelta(days=7)).isoformat()}
+            )
+
+        self.assertFalse([
+            query['sql'] for query in captured.captured_queries
+            if query['sql'].startswith('SELECT') and TimeEntryWithArchive._meta.db_table in query['sql']
+        ])
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], str(self.recent_entry.id))
+
+    def test_list_with_old_window_reads_archive(self):
+        self.archive()
+
+        response = self.client.get(self.url, {'overlaps_after': (timezone.now() - timedelta(days=90)).isoformat()})
+
+        self.assertEqual(response.data['count'], 3)
+
+    def test_archived_entries_have_no_detail_url(self):
+        self.archive()
+
+        results = self.client.get(self.url).data['results']
+        entries = self.client.get(reverse('time_entry_sorted_by_task_name')).data['results'][0]['entries']
+
+        for rendered in (results, entries):
+            detail_urls = {entry['id']: entry['detail_url'] for entry in rendered}
+            self.assertEqual([detail_urls[str(entry.id)] for entry in self.old_entries], [None, None])
+            self.assertTrue(detail_urls[str(self.recent_entry.id)].endswith(
+                reverse('time_entry_detail', args=[self.recent_entry.id])
+            ))
+
+    def test_sorted_views_include_archived_entries(self):
+        self.archive()
+
+        by_task = self.client.get(reverse('time_entry_sorted_by_task_name'))
+        by_date = self.client.get(reverse('time_entry_sorted_by_date'))
+
+        self.assertEqual(len(by_task.data['results'][0]['entries']), 3)
+        self.assertEqual(sum(len(group['entries']) for group in by_date.data['results']), 3)
@@ -0,0 +1,151 @@
+# Python imports
+import json
+from datetime import timedelta
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+# DRF Imports
+from rest_framework import status
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from TimeEntry.columnar import COLUMNAR_BINARY_MEDIA_TYPE, COLUMNAR_MEDIA_TYPE, decode_frame
+from TimeEntry.models import TimeEntry
+from TimeMate.Utils.test_helpers import get_app_queries
+
+User = get_user_model()
+
+
+class TimeEntryColumnarTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.other_task = Task.objects.create(name='Other Task', owner=self.user)
+        self.start = timezone.now().replace(microsecond=500000) - timedelta(days=10)
+        self.time_entries = [
+            TimeEntry.objects.create(
+                owner=self.user,
+                task=task,
+                start_time=self.start + timedelta(days=index),
+                end_time=self.start + timedelta(days=index, minutes=30),
+            )
+            for index, task in enumerate([self.task, self.other_task, self.task])
+        ]
+        self.list_url = reverse('time_entry_list_create')
+        self.client.force_authenticate(user=self.user)
+
+    def expected_columns(self, time_entries):
+        tasks = list(dict.fromkeys(entry.task for entry in time_entries))
+        return {
+            'start_time': [int(entry.start_time.timestamp()) for entry in time_entries],
+            'end_time': [int(entry.end_time.timestamp()) for entry in time_entries],
+            'duration': [1800] * len(time_entries),
+            'task': [tasks.index(entry.task) for entry in time_entries],
+            'tasks': {'id': [str(task.id) for task in tasks], 'name': [task.name for task in tasks]},
+        }
+
+    def test_list_columnar(self):
+        response = self.client.get(self.list_url, {'format': 'columnar', 'ordering': 'start_time'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], COLUMNAR_MEDIA_TYPE)
+        data = json.loads(response.content)
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['results'], self.expected_columns(self.time_entries))
+
+    def test_list_columnar_is_paginated_and_filtered(self):
+        response = self.client.get(self.list_url, {
+            'format': 'columnar', 'ordering': 'start_time', 'page_size': 1, 'task': 'Other',
+        })
+
+        data = json.loads(response.content)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'], self.expected_columns(self.time_entries[1:2]))
+
+    def test_list_columnar_reads_one_page_of_values(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.list_url, {'format': 'columnar'})
+
+        # The count and the page, with the task name joined in.
+        queries = get_app_queries(context)
+        self.assertEqual(len(queries), 2)
+        self.assertIn('EXTRACT', queries[1])
+
+    def test_list_columnar_binary(self):
+        response = self.client.get(self.list_url, {'format': 'columnar-binary', 'ordering': 'start_time'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], COLUMNAR_BINARY_MEDIA_TYPE)
+        columns, metadata, end = decode_frame(response.content)
+        self.assertEqual(columns, self.expected_columns(self.time_entries))
+        self.assertEqual(metadata, {'count': 3, 'next': None, 'previous': None})
+        self.assertEqual(end, len(response.content))
+
+    def test_binary_columns_are_aligned_for_zero_copy_reads(self):
+        content = self.client.get(self.list_url, {'format': 'columnar-binary'}).content
+        header_length = int.from_bytes(content[8:12], 'little')
+        header = json.loads(content[16:16 + header_length])
+
+        self.assertEqual((16 + header_length) % 8, 0)
+        self.assertEqual([column['dtype'] for column in header['columns']], ['<i8', '<i8', '<i8', '<i4'])
+        self.assertTrue(all(column['offset'] % 8 == 0 for column in header['columns']))
+
+    def test_columnar_errors_are_json(self):
+        response = self.client.get(self.list_url, {'format': 'columnar-binary', 'start_time_after': 'not-a-date'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_default_format_is_unchanged(self):
+        self.client.get(self.list_url, {'format': 'columnar'})
+
+        response = self.client.get(self.list_url, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('detail_url', response.data['results'][0])
+
+    def test_columnar_response_is_cached_separately(self):
+        self.client.get(self.list_url)
+
+        response = self.client.get(self.list_url, HTTP_ACCEPT=COLUMNAR_MEDIA_TYPE)
+
+        self.assertEqual(json.loads(response.content)['results']['task'], [0, 1, 0])
+
+    @override_settings(TIME_ENTRY_EXPORT_CHUNK_SIZE=2)
+    def test_export_columnar_batches(self):
+        response = self.client.get(reverse('time_entry_export_csv'), {'format': 'columnar', 'ordering': 'start_time'})
+
+        self.assertEqual(response['Content-Type'], COLUMNAR_MEDIA_TYPE)
+        batches = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        expected = self.expected_columns(self.time_entries)
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(batches[0]['tasks'], expected['tasks'])
+        # Tasks of earlier batches are referenced, not repeated.
+        self.assertEqual(batches[1]['tasks'], {'id': [], 'name': []})
+        self.assertEqual(batches[0]['task'] + batches[1]['task'], expected['task'])
+        self.assertEqual(batches[0]['start_time'] + batches[1]['start_time'], expected['start_time'])
+
+    @override_settings(TIME_ENTRY_EXPORT_CHUNK_SIZE=2)
+    def test_export_columnar_binary_frames(self):
+        response = self.client.get(
+            reverse('time_entry_export_ndjson'), {'format': 'columnar-binary', 'ordering': 'start_time'}
+        )
+
+        content = b''.join(response.streaming_content)
+        first, _, position = decode_frame(content)
+        second, _, end = decode_frame(content, position)
+        self.assertEqual(end, len(content))
+        self.assertEqual(first['end_time'] + second['end_time'], self.expected_columns(self.time_entries)['end_time'])
+
+    def test_columnar_format_is_read_only(self):
+        response = self.client.post(
+            f'{self.list_url}?format=columnar', {'task': str(self.task.id)}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,250 @@
+# Python imports
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+# DRF Imports
+from rest_framework import status
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from TimeEntry import export_jobs
+from TimeEntry.export_jobs import EXPORT_ERROR_CODE_NOT_READY, claim_export, run_export
+from TimeEntry.exporting import EXPORT_COLUMNS
+from TimeEntry.models import TimeEntry, TimeEntryExport
+
+User = get_user_model()
+
+
+class TimeEntryExportJobTests(APITestCase):
+    def setUp(self):
+        self.export_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.export_root, ignore_errors=True)
+        settings_override = override_settings(TIME_ENTRY_EXPORT_ROOT=self.export_root, TIME_ENTRY_EXPORT_CHUNK_SIZE=2)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.other_user = User.objects.create_user(username='otheruser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.other_task = Task.objects.create(name='Other Task', owner=self.other_user)
+        self.start = timezone.now().replace(microsecond=0) - timedelta(days=10)
+        self.time_entries = [
+            TimeEntry.objects.create(
+                owner=self.user,
+                task=self.task,
+                start_time=self.start + timedelta(days=index),
+                end_time=self.start + timedelta(days=index, minutes=30),
+            )
+            for index in range(5)
+        ]
+        TimeEntry.objects.create(
+            owner=self.other_user, task=self.other_task, start_time=self.start, end_time=self.start + timedelta(hours=1)
+        )
+        self.url = reverse('time_entry_export_list_create')
+        self.client.force_authenticate(user=self.user)
+
+    def request_export(self, export_format='csv', **filters):
+        return self.client.post(self.url, {'format': export_format, 'filters': filters}, format='json')
+
+    def run_worker(self):
+        call_command('run_export_jobs', once=True, stdout=StringIO(), stderr=StringIO())
+
+    def read_export(self, export_id):
+        response = self.client.get(reverse('time_entry_export_download', args=[export_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return gzip.decompress(b''.join(response.streaming_content)).decode()
+
+    def test_request_export_enqueues_it(self):
+        response = self.request_export(ordering='start_time')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], TimeEntryExport.Status.PENDING)
+        self.assertIsNone(response.data['download_url'])
+        export = TimeEntryExport.objects.get(pk=response.data['id'])
+        self.assertEqual(export.owner, self.user)
+        self.assertEqual(export.filters, {'ordering': 'start_time'})
+
+    def test_identical_requests_reuse_the_export(self):
+        export_id = self.request_export(ordering='start_time').data['id']
+
+        pending = self.request_export(ordering='start_time')
+        self.run_worker()
+        completed = self.request_export(ordering='start_time')
+        other = self.request_export(ordering='end_time')
+
+        self.assertEqual(pending.status_code, status.HTTP_200_OK)
+        self.assertEqual(pending.data['id'], export_id)
+        self.assertEqual(completed.status_code, status.HTTP_200_OK)
+        self.assertEqual(completed.data['id'], export_id)
+        self.assertEqual(other.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(TimeEntryExport.objects.count(), 2)
+
+    def test_completed_export_is_not_reused_after_entries_change(self):
+        export_id = self.request_export().data['id']
+        self.run_worker()
+
+        self.client.post(reverse('time_entry_list_create'), {
+            'task': str(self.task.id),
+            'start_time': (self.start - timedelta(days=1)).isoformat(),
+            'end_time': (self.start - timedelta(days=1, minutes=-30)).isoformat(),
+        }, format='json')
+        response = self.request_export()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertNotEqual(response.data['id'], export_id)
+        # Unchanged since, so reused again.
+        self.assertEqual(self.request_export().data['id'], response.data['id'])
+
+    def test_concurrently_completed_export_is_reused(self):
+        export_id = self.request_export().data['id']
+        get_reusable_export = export_jobs.get_reusable_export
+        lookups = []
+
+        def lookup(exports):
+            lookups.append(exports)
+            if len(lookups) == 1:
+                # Looked up before the concurrent request enqueued its export...
+                return None
+            # ... which completed before the conflict was handled.
+            TimeEntryExport.objects.filter(pk=export_id).update(
+                status=TimeEntryExport.Status.COMPLETED, expires_at=timezone.now() + timedelta(hours=1)
+            )
+            return get_reusable_export(exports)
+
+        with mock.patch.object(export_jobs, 'get_reusable_export', side_effect=lookup):
+            response = self.request_export()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], export_id)
+
+    def test_other_users_do_not_reuse_the_export(self):
+        export_id = self.request_export().data['id']
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.request_export()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertNotEqual(response.data['id'], export_id)
+
+    def test_worker_writes_compressed_file(self):
+        export_id = self.request_export(ordering='start_time').data['id']
+
+        self.run_worker()
+
+        response = self.client.get(reverse('time_entry_export_detail', args=[export_id]))
+        self.assertEqual(response.data['status'], TimeEntryExport.Status.COMPLETED)
+        self.assertEqual(response.data['rows_total'], 5)
+        self.assertEqual(response.data['rows_exported'], 5)
+        self.assertTrue(response.data['download_url'].endswith(reverse('time_entry_export_download', args=[export_id])))
+        rows = list(csv.reader(io.StringIO(self.read_export(export_id))))
+        self.assertEqual(rows[0], EXPORT_COLUMNS)
+        self.assertEqual([row[0] for row in rows[1:]], [str(entry.id) for entry in self.time_entries])
+
+    def test_worker_applies_filters_and_grouping(self):
+        export_id = self.request_export(
+            'ndjson', group_by='day', start_time_after=(self.start + timedelta(days=3)).isoformat()
+        ).data['id']
+
+        self.run_worker()
+
+        lines = [json.loads(line) for line in self.read_export(export_id).splitlines()]
+        self.assertEqual([line['entries'][0]['id'] for line in lines],
+                         [str(entry.id) for entry in reversed(self.time_entries[3:])])
+
+    def test_progress_is_reported_per_chunk(self):
+        self.request_export()
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=QuerySet.update) as update:
+            run_export(claim_export('default'))
+
+        progress = [call.kwargs['rows_exported'] for call in update.call_args_list if 'rows_exported' in call.kwargs]
+        # Every `TIME_ENTRY_EXPORT_CHUNK_SIZE` rows, then at the end.
+        self.assertEqual(progress, [2, 4, 5])
+
+    def test_download_before_completion(self):
+        export_id = self.request_export().data['id']
+
+        response = self.client.get(reverse('time_entry_export_download', args=[export_id]))
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['detail'].code, EXPORT_ERROR_CODE_NOT_READY)
+
+    def test_other_users_cannot_read_the_export(self):
+        export_id = self.request_export().data['id']
+        self.run_worker()
+        self.client.force_authenticate(user=self.other_user)
+
+        detail = self.client.get(reverse('time_entry_export_detail', args=[export_id]))
+        download = self.client.get(reverse('time_entry_export_download', args=[export_id]))
+        exports = self.client.get(self.url)
+
+        self.assertEqual(detail.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(download.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(exports.data['count'], 0)
+
+    def test_rejects_invalid_filters(self):
+        for export_format, filters in [
+            ('csv', {'start_time_after': 'not-a-date'}),
+            ('csv', {'overlaps_after': self.start.isoformat(),
+                     'overlaps_before': (self.start - timedelta(days=1)).isoformat()}),
+            ('csv', {'unknown': 'value'}),
+            ('csv', {'ordering': 'owner'}),
+            ('csv', {'group_by': 'day'}),
+            ('ndjson', {'group_by': 'week'}),
+            ('xml', {}),
+        ]:
+            with self.subTest(export_format=export_format, filters=filters):
+                response = self.request_export(export_format, **filters)
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TimeEntryExport.objects.exists())
+
+    def test_expired_exports_are_deleted_with_their_file(self):
+        export_id = self.request_export().data['id']
+        self.run_worker()
+        export = TimeEntryExport.objects.get(pk=export_id)
+        path = export.file.path
+        self.assertTrue(os.path.exists(path))
+        TimeEntryExport.objects.filter(pk=export_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.run_worker()
+
+        self.assertFalse(TimeEntryExport.objects.filter(pk=export_id).exists())
+        self.assertFalse(os.path.exists(path))
+        # The expired file is not reused.
+        self.assertEqual(self.request_export().status_code, status.HTTP_202_ACCEPTED)
+
+    @override_settings(TIME_ENTRY_EXPORT_STALE_SECONDS=60)
+    def test_stale_running_export_is_claimed_again(self):
+        export_id = self.request_export().data['id']
+        self.assertEqual(str(claim_export('default').pk), export_id)
+        self.assertIsNone(claim_export('default'))
+
+        TimeEntryExport.objects.filter(pk=export_id).update(updated_at=timezone.now() - timedelta(minutes=2))
+
+        self.assertEqual(str(claim_export('default').pk), export_id)
+
+    def test_failed_export_reports_error(self):
+        export = TimeEntryExport.objects.get(pk=self.request_export().data['id'])
+        TimeEntryExport.objects.filter(pk=export.pk).update(filters={'start_time_after': 'not-a-date'})
+
+        self.run_worker()
+
+        response = self.client.get(reverse('time_entry_export_detail', args=[export.pk]))
+        self.assertEqual(response.data['status'], TimeEntryExport.Status.FAILED)
+        self.assertIn('Invalid filters', response.data['error'])
+        self.assertEqual([files for _, _, files in os.walk(self.export_root) if files], [])
@@ -0,0 +1,231 @@
+# Python imports
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+# DRF Imports
+from rest_framework import status
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from TimeEntry.importing import (
+    IMPORT_FORMAT_CSV,
+    IMPORT_FORMAT_NDJSON,
+    ImportInProgress,
+    iter_import_rows,
+    run_import,
+    start_import,
+)
+from TimeEntry.models import TimeEntry, TimeEntryImport
+from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE
+from TimeMate.Utils.test_helpers import get_app_queries, get_error_code
+
+User = get_user_model()
+
+START = datetime(2024, 1, 1, 9, tzinfo=dt_timezone.utc)
+
+
+def get_csv_lines(count, task_names=('Imported Task', 'Second Task')):
+    """
+    Return CSV lines (header first) of `count` consecutive one-hour entries, alternating between the tasks.
+    """
+    lines = ['task,start_time,end_time\r\n']
+    for index in range(count):
+        start = START + timedelta(hours=index)
+        lines.append(f'{task_names[index % len(task_names)]},{start.isoformat()},{(start + timedelta(hours=1)).isoformat()}\r\n')
+    return lines
+
+
+class RunImportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.existing_task = Task.objects.create(name='Imported Task', owner=self.user)
+
+    def test_import_creates_entries_and_missing_tasks(self):
+        """
+        Ensure that rows are imported for the owner, reusing existing tasks and creating missing ones by name.
+        """
+        time_entry_import = start_import(self.user, 'history.csv')
+
+        errors = run_import(time_entry_import, iter_import_rows(get_csv_lines(5), IMPORT_FORMAT_CSV), batch_size=2)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 5)
+        self.assertEqual(TimeEntry.objects.filter(task=self.existing_task).count(), 3)
+        self.assertEqual(Task.objects.filter(owner=self.user, name='Second Task').count(), 1)
+        time_entry_import.refresh_from_db()
+        self.assertEqual(
+            (time_entry_import.rows_processed, time_entry_import.rows_imported, time_entry_import.rows_failed),
+            (5, 5, 0)
+        )
+
+    def test_import_skips_and_reports_invalid_rows(self):
+        lines = get_csv_lines(3)
+        lines[2] = f'Imported Task,{START.isoformat()},{START.isoformat()}\r\n'
+        lines.append('X,not a date,\r\n')
+        time_entry_import = start_import(self.user, 'history.csv')
+
+        errors = run_import(time_entry_import, iter_import_rows(lines, IMPORT_FORMAT_CSV))
+
+        self.assertEqual([row_number for row_number, _ in errors], [2, 4])
+        self.assertEqual(get_error_code(errors[0][1]['non_field_errors']), VALIDATION_ERROR_CODE_INVALID_TIME_RANGE)
+        self.assertIn('start_time', errors[1][1])
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 2)
+        self.assertEqual((time_entry_import.rows_imported, time_entry_import.rows_failed), (2, 2))
+
+    def test_import_parses_ndjson(self):
+        lines = [
+            json.dumps({'task': 'Imported Task', 'start_time': START.isoformat(),
+                        'end_time': (START + timedelta(hours=1)).isoformat()}) + '\n',
+            '\n',
+            '{not json\n',
+        ]
+        time_entry_import = start_import(self.user, 'history.ndjson')
+
+        errors = run_import(time_entry_import, iter_import_rows(lines, IMPORT_FORMAT_NDJSON))
+
+        self.assertEqual([row_number for row_number, _ in errors], [2])
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 1)
+
+    def test_interrupted_import_resumes_after_checkpoint(self):
+        """
+        Ensure that batches committed before a failure are kept, and a new run resumes after them.
+        """
+        lines = get_csv_lines(6)
+        time_entry_import = start_import(self.user, 'history.csv')
+
+        def fail_on_second_batch(time_entry_import):
+            raise RuntimeError('Connection lost')
+
+        with self.assertRaises(RuntimeError):
+            run_import(time_entry_import, iter_import_rows(lines, IMPORT_FORMAT_CSV), batch_size=4,
+                       on_batch=fail_on_second_batch)
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 4)
+
+        resumed = start_import(self.user, 'history.csv')
+        self.assertEqual(resumed.rows_processed, 4)
+        run_import(resumed, iter_import_rows(lines, IMPORT_FORMAT_CSV), batch_size=4)
+
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 6)
+        self.assertEqual(resumed.rows_processed, 6)
+
+    def test_concurrent_run_of_same_import_is_rejected(self):
+        time_entry_import = start_import(self.user, 'history.csv')
+        # Another run committed a batch since this one read the checkpoint.
+        TimeEntryImport.objects.filter(pk=time_entry_import.pk).update(rows_processed=2)
+
+        with self.assertRaises(ImportInProgress):
+            run_import(time_entry_import, iter_import_rows(get_csv_lines(4), IMPORT_FORMAT_CSV))
+        self.assertFalse(TimeEntry.objects.exists())
+
+    def test_import_query_count_does_not_grow_with_rows(self):
+        """
+        Ensure that a batch costs a fixed number of queries, whatever its number of rows.
+        """
+        time_entry_import = start_import(self.user, 'history.csv')
+
+        with CaptureQueriesContext(connection) as context:
+            run_import(time_entry_import, iter_import_rows(get_csv_lines(200), IMPORT_FORMAT_CSV), batch_size=200)
+
+        queries = get_app_queries(context.captured_queries)
+        # Checkpoint lock, task lookup, task creation and its lookup, entries INSERT, checkpoint UPDATE.
+        self.assertEqual(len(queries), 6, queries)
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 200)
+
+    @override_settings(TIME_ENTRY_REJECT_OVERLAPS=True)
+    def test_import_rejects_overlaps(self):
+        TimeEntry.objects.create(task=self.existing_task, owner=self.user, start_time=START,
+                                 end_time=START + timedelta(minutes=30))
+        time_entry_import = start_import(self.user, 'history.csv')
+
+        errors = run_import(time_entry_import, iter_import_rows(get_csv_lines(3), IMPORT_FORMAT_CSV))
+
+        self.assertEqual([row_number for row_number, _ in errors], [1])
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 3)
+
+    def test_import_invalidates_cache_once(self):
+        time_entry_import = start_import(self.user, 'history.csv')
+
+        with mock.patch('TimeEntry.importing.invalidate_user_list') as invalidate_user_list:
+            run_import(time_entry_import, iter_import_rows(get_csv_lines(6), IMPORT_FORMAT_CSV), batch_size=2)
+
+        invalidate_user_list.assert_called_once_with(self.user.pk)
+
+
+class TimeEntryImportViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.url = reverse('time_entry_import')
+        self.client.force_authenticate(user=self.user)
+
+    def test_import_csv_body(self):
+        response = self.client.post(
+            f'{self.url}?source=history.csv', data=''.join(get_csv_lines(3)), content_type='text/csv'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['rows_imported'], 3)
+        self.assertEqual(response.data['source'], 'history.csv')
+        self.assertEqual(response.data['errors'], [])
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 3)
+
+    def test_import_ndjson_body_reports_errors(self):
+        body = '\n'.join([
+            json.dumps({'task': 'Imported Task', 'start_time': START.isoformat(),
+                        'end_time': (START + timedelta(hours=1)).isoformat()}),
+            json.dumps({'task': 'Imported Task'}),
+        ])
+
+        response = self.client.post(self.url, data=body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['rows_imported'], response.data['rows_failed']), (1, 1))
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+        self.assertIn('start_time', response.data['errors'][0]['errors'])
+
+    def test_repeated_upload_of_same_source_resumes(self):
+        lines = get_csv_lines(4)
+        self.client.post(f'{self.url}?source=history.csv', data=''.join(lines[:3]), content_type='text/csv')
+
+        response = self.client.post(f'{self.url}?source=history.csv', data=''.join(lines), content_type='text/csv')
+
+        self.assertEqual((response.data['rows_processed'], response.data['rows_imported']), (4, 4))
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 4)
+
+    def test_unsupported_content_type_is_rejected(self):
+        response = self.client.post(self.url, data={'task': 'Imported Task'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+
+class ImportTimeEntriesCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+
+    def test_command_imports_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'history.csv')
+            with open(path, 'w', newline='') as file:
+                file.writelines(get_csv_lines(5))
+            stdout = StringIO()
+
+            call_command('import_time_entries', path, user='testuser', batch_size=2, stdout=stdout)
+            # Running it again resumes after the last row: nothing is imported twice.
+            call_command('import_time_entries', path, user='testuser', stdout=StringIO())
+
+        self.assertIn('Imported 5 time entries from 5 rows', stdout.getvalue())
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 5)
+        self.assertEqual(TimeEntryImport.objects.get(owner=self.user).source, path)
@@ -0,0 +1,244 @@
+# Python imports
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.db.models import QuerySet
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+# DRF Imports
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+# Internal imports
+from Task.models import Task
+from Task.validators import (
+    cache_task_owner,
+    get_cached_owned_task,
+    get_task_invalid_owner_error,
+    get_task_not_found_error,
+)
+from TimeEntry.ingestion import (
+    INGEST_CONSUMER_GROUP,
+    ensure_consumer_group,
+    get_dead_letter_stream,
+    get_ingest_redis,
+    process_messages,
+    read_messages,
+)
+from TimeEntry.models import TimeEntry
+
+User = get_user_model()
+
+TEST_STREAM = 'test_time_entry_ingest'
+
+
+class TimeEntryIngestionTestMixin:
+    def setUp(self):
+        cache.clear()
+        self.redis = get_ingest_redis()
+        self.redis.delete(TEST_STREAM, f'{TEST_STREAM}:dead')
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.other_user = User.objects.create_user(username='otheruser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.other_task = Task.objects.create(name='Other Task', owner=self.other_user)
+        self.url = reverse('time_entry_ingest')
+        self.start = timezone.now().replace(microsecond=0)
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        self.redis.delete(TEST_STREAM, f'{TEST_STREAM}:dead')
+
+    def get_entries(self, count, task=None):
+        return [
+            {
+                'task': str((task or self.task).id),
+                'start_time': (self.start + timedelta(hours=index)).isoformat(),
+                'end_time': (self.start + timedelta(hours=index + 1)).isoformat(),
+            }
+            for index in range(count)
+        ]
+
+    def drain(self):
+        stdout = StringIO()
+        call_command('ingest_time_entries', once=True, block_seconds=0, stdout=stdout)
+        return stdout.getvalue()
+
+
+@override_settings(TIME_ENTRY_INGEST_ENABLED=True, TIME_ENTRY_INGEST_STREAM=TEST_STREAM)
+class TimeEntryIngestionTests(TimeEntryIngestionTestMixin, APITestCase):
+    def test_ingest_queues_entries_without_inserting(self):
+        response = self.client.post(self.url, self.get_entries(3), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(response.data['ids']), 3)
+        self.assertEqual(self.redis.xlen(TEST_STREAM), 3)
+        self.assertFalse(TimeEntry.objects.exists())
+
+    def test_ingest_accepts_single_entry(self):
+        response = self.client.post(self.url, self.get_entries(1)[0], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(response.data['ids']), 1)
+
+    def test_ingest_rejects_malformed_entries(self):
+        entries = self.get_entries(2)
+        entries[1]['end_time'] = entries[1]['start_time']
+
+        response = self.client.post(self.url, entries, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.redis.xlen(TEST_STREAM), 0)
+
+    @override_settings(TIME_ENTRY_INGEST_ENABLED=False)
+    def test_ingest_disabled(self):
+        response = self.client.post(self.url, self.get_entries(1), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(TIME_ENTRY_INGEST_MAX_BACKLOG=3)
+    def test_full_backlog_applies_backpressure(self):
+        self.client.post(self.url, self.get_entries(2), format='json')
+
+        response = self.client.post(self.url, self.get_entries(2), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.redis.xlen(TEST_STREAM), 2)
+
+    def test_worker_inserts_queued_entries_with_their_ids(self):
+        ids = self.client.post(self.url, self.get_entries(5), format='json').data['ids']
+
+        output = self.drain()
+
+        self.assertIn('Inserted 5 time entries', output)
+        self.assertEqual(set(TimeEntry.objects.filter(owner=self.user).values_list('id', flat=True)), set(ids))
+        # Acknowledged messages are deleted, so the stream's length is the backlog.
+        self.assertEqual(self.redis.xlen(TEST_STREAM), 0)
+
+    def test_worker_invalidates_cache_once_per_user_and_batch(self):
+        self.client.post(self.url, self.get_entries(5), format='json')
+
+        with mock.patch('TimeEntry.ingestion.invalidate_user_list') as invalidate_user_list:
+            self.drain()
+
+        invalidate_user_list.assert_called_once_with(self.user.pk)
+
+    def test_worker_dead_letters_entries_of_foreign_tasks(self):
+        self.client.post(self.url, self.get_entries(1) + self.get_entries(1, task=self.other_task), format='json')
+
+        self.drain()
+
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 1)
+        dead_letters = self.redis.xrange(f'{TEST_STREAM}:dead')
+        self.assertEqual(len(dead_letters), 1)
+        fields = dead_letters[0][1]
+        self.assertEqual(fields[b'task'].decode(), str(self.other_task.id))
+        self.assertEqual(json.loads(fields[b'error']), {'task': [str(get_task_invalid_owner_error().detail[0])]})
+        self.assertEqual(self.redis.xlen(TEST_STREAM), 0)
+
+    def test_redelivered_entries_are_not_inserted_twice(self):
+        """
+        Ensure that messages whose insert committed but which were not acknowledged (a worker crashed) are
+        inserted only once when another worker takes them over.
+        """
+        self.client.post(self.url, self.get_entries(3), format='json')
+        ensure_consumer_group(self.redis)
+        messages = read_messages(self.redis, 'crashed-worker', 10, None)
+        with mock.patch('TimeEntry.ingestion.acknowledge'):
+            process_messages(self.redis, messages)
+
+        with override_settings(TIME_ENTRY_INGEST_CLAIM_IDLE_SECONDS=0):
+            output = self.drain()
+
+        self.assertIn('Inserted 0 time entries', output)
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 3)
+        self.assertEqual(self.redis.xlen(TEST_STREAM), 0)
+
+    @override_settings(TIME_ENTRY_REJECT_OVERLAPS=True)
+    def test_redelivered_entries_do_not_overlap_themselves(self):
+        self.client.post(self.url, self.get_entries(2), format='json')
+        ensure_consumer_group(self.redis)
+        with mock.patch('TimeEntry.ingestion.acknowledge'):
+            process_messages(self.redis, read_messages(self.redis, 'crashed-worker', 10, None))
+
+        with override_settings(TIME_ENTRY_INGEST_CLAIM_IDLE_SECONDS=0):
+            self.drain()
+
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 2)
+        self.assertEqual(self.redis.xlen(get_dead_letter_stream()), 0)
+        self.assertEqual(self.redis.xlen(TEST_STREAM), 0)
+
+    def test_failed_batch_stays_pending_and_is_dead_lettered_after_max_deliveries(self):
+        self.client.post(self.url, self.get_entries(1), format='json')
+        ensure_consumer_group(self.redis)
+
+        with override_settings(TIME_ENTRY_INGEST_CLAIM_IDLE_SECONDS=0, TIME_ENTRY_INGEST_MAX_DELIVERIES=2):
+            with mock.patch.object(QuerySet, 'bulk_create', side_effect=DatabaseError('connection lost')):
+                result = process_messages(self.redis, read_messages(self.redis, 'worker', 10, None))
+                self.assertEqual(len(result.errors), 1)
+                self.assertEqual(self.redis.xpending(TEST_STREAM, INGEST_CONSUMER_GROUP)['pending'], 1)
+                # Second delivery, taken over by another worker, fails again.
+                process_messages(self.redis, read_messages(self.redis, 'other-worker', 10, None))
+
+            self.assertEqual(read_messages(self.redis, 'worker', 10, None), [])
+
+        self.assertEqual(self.redis.xlen(get_dead_letter_stream()), 1)
+        self.assertEqual(self.redis.xlen(TEST_STREAM), 0)
+        self.assertFalse(TimeEntry.objects.exists())
+
+    def test_lag_endpoint_reports_backlog(self):
+        self.client.post(self.url, self.get_entries(2), format='json')
+        self.client.force_authenticate(user=User.objects.create_user(username='staff', is_staff=True))
+
+        response = self.client.get(reverse('time_entry_ingest_lag'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['backlog'], 2)
+        self.assertEqual(response.data['pending'], 0)
+        self.assertEqual(response.data['dead_letters'], 0)
+        self.assertGreaterEqual(response.data['oldest_age_seconds'], 0)
+
+        self.drain()
+        self.assertEqual(self.client.get(reverse('time_entry_ingest_lag')).data['backlog'], 0)
+
+    def test_lag_endpoint_is_staff_only(self):
+        response = self.client.get(reverse('time_entry_ingest_lag'))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(TIME_ENTRY_INGEST_ENABLED=True, TIME_ENTRY_INGEST_STREAM=TEST_STREAM)
+class TimeEntryIngestionCommitTests(TimeEntryIngestionTestMixin, APITransactionTestCase):
+    """
+    Foreign keys are checked when the transaction commits, which `APITestCase` never does.
+    """
+
+    def test_task_deleted_behind_cached_owner_rejects_only_its_entries(self):
+        """
+        Ensure that an entry of a task deleted without its cached owner being dropped (e.g. on another database)
+        is dead-lettered alone, while the other entries of the batch, of any owner, are inserted.
+        """
+        deleted_task = Task.objects.create(name='Deleted Task', owner=self.user)
+        cache_task_owner(deleted_task.id, self.user.pk)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM "Task_task" WHERE id = %s', [deleted_task.id])
+        self.client.post(self.url, self.get_entries(2) + self.get_entries(1, task=deleted_task), format='json')
+        self.client.force_authenticate(user=self.other_user)
+        self.client.post(self.url, self.get_entries(1, task=self.other_task), format='json')
+
+        output = self.drain()
+
+        self.assertIn('Inserted 3 time entries, dead-lettered 1', output)
+        self.assertEqual(TimeEntry.objects.count(), 3)
+        dead_letters = self.redis.xrange(get_dead_letter_stream())
+        self.assertEqual(dead_letters[0][1][b'task'].decode(), str(deleted_task.id))
+        error = json.loads(dead_letters[0][1][b'error'])
+        self.assertEqual(error, {'task': [str(get_task_not_found_error().detail[0])]})
+        self.assertEqual(self.redis.xlen(TEST_STREAM), 0)
+        self.assertIsNone(get_cached_owned_task(deleted_task.id, self.user))
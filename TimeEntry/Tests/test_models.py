@@ -41,3 +41,33 @@ class TimeEntryModelTests(TestCase):
                 start_time=timezone.now() + timezone.timedelta(hours=1),
                 end_time=timezone.now()
             )
+
+
+    def test_duration_is_computed_by_database_on_bulk_create(self):
+        """Ensure `duration` is populated for rows inserted without calling `save()`."""
+        start_time = timezone.now()
+        TimeEntry.objects.bulk_create([
+            TimeEntry(task=self.task, owner=self.user, start_time=start_time,
+                      end_time=start_time + timezone.timedelta(minutes=minutes))
+            for minutes in (15, 30)
+        ])
+        durations = set(
+            TimeEntry.objects.exclude(pk=self.time_entry.pk).values_list('duration', flat=True)
+        )
+        self.assertEqual(durations, {timezone.timedelta(minutes=15), timezone.timedelta(minutes=30)})
+
+    def test_duration_follows_queryset_update(self):
+        """Ensure `duration` stays consistent after a bulk `QuerySet.update()` of `end_time`."""
+        TimeEntry.objects.filter(pk=self.time_entry.pk).update(
+            end_time=self.time_entry.start_time + timezone.timedelta(hours=3)
+        )
+        self.time_entry.refresh_from_db()
+        self.assertEqual(self.time_entry.duration, timezone.timedelta(hours=3))
+
+    def test_duration_is_in_sync_after_save(self):
+        """Ensure the saved instance exposes the new `duration` without a refresh."""
+        self.time_entry.end_time = self.time_entry.start_time + timezone.timedelta(minutes=45)
+        self.time_entry.save()
+        self.assertEqual(self.time_entry.duration, timezone.timedelta(minutes=45))
+        self.time_entry.refresh_from_db()
+        self.assertEqual(self.time_entry.duration, timezone.timedelta(minutes=45))
@@ -0,0 +1,127 @@
+# Python imports
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+# Django imports
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+# Internal imports
+from Task.models import Task
+from TimeEntry.filters import TimeEntryFilter
+from TimeEntry.models import TimeEntry
+from TimeEntry.partitioning import (
+    add_months,
+    default_partition_name,
+    get_existing_partitions,
+    get_partition_key,
+    month_start,
+    partition_name,
+    rebuild_table,
+)
+
+User = get_user_model()
+
+
+class TimeEntryPartitioningTests(TestCase):
+    """
+    DDL is transactional in Postgres, so each test's rebuilt table is rolled back with the test transaction.
+    """
+
+    def setUp(self):
+        # Deferred FK checks would otherwise block ALTER TABLE on tables with pending trigger events.
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.table = TimeEntry._meta.db_table
+        self.current_month = month_start(timezone.now())
+        # Start from a regular table, even when the test database was migrated with partitioning enabled.
+        if get_partition_key(self.table):
+            rebuild_table(TimeEntry)
+
+    def create_entry(self, start_time):
+        return TimeEntry.objects.create(
+            task=self.task, owner=self.user, start_time=start_time, end_time=start_time + timedelta(hours=1)
+        )
+
+    def count_rows(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {connection.ops.quote_name(table)}')
+            return cursor.fetchone()[0]
+
+    def test_rebuild_table_partitions_existing_rows_by_month(self):
+        old_month = add_months(self.current_month, -2)
+        self.create_entry(old_month + timedelta(days=3))
+        self.create_entry(self.current_month + timedelta(hours=1))
+
+        rebuild_table(TimeEntry, partition_key='start_time', months_ahead=1)
+
+        self.assertEqual(get_partition_key(self.table), 'start_time')
+        self.assertEqual(
+            get_existing_partitions(self.table),
+            {partition_name(self.table, add_months(old_month, offset)) for offset in range(4)}
+            | {default_partition_name(self.table)}
+        )
+        self.assertEqual(self.count_rows(partition_name(self.table, old_month)), 1)
+        self.assertEqual(TimeEntry.objects.count(), 2)
+
+    def test_rebuild_table_back_to_regular_table(self):
+        self.create_entry(self.current_month + timedelta(hours=1))
+        rebuild_table(TimeEntry, partition_key='end_time')
+
+        rebuild_table(TimeEntry)
+
+        self.assertIsNone(get_partition_key(self.table))
+        self.assertEqual(TimeEntry.objects.count(), 1)
+
+    def test_rebuild_table_changes_partition_key(self):
+        self.create_entry(self.current_month + timedelta(hours=1))
+        rebuild_table(TimeEntry, partition_key='start_time')
+
+        rebuild_table(TimeEntry, partition_key='end_time')
+
+        self.assertEqual(get_partition_key(self.table), 'end_time')
+        self.assertEqual(self.count_rows(partition_name(self.table, self.current_month)), 1)
+
+    def test_command_creates_future_partitions_and_moves_rows_from_default(self):
+        rebuild_table(TimeEntry, partition_key='start_time')
+        future_month = add_months(self.current_month, 2)
+        entry = self.create_entry(future_month + timedelta(days=1))
+        self.assertEqual(self.count_rows(default_partition_name(self.table)), 1)
+
+        call_command('create_time_entry_partitions', months_ahead=2, stdout=StringIO())
+
+        self.assertIn(partition_name(self.table, future_month), get_existing_partitions(self.table))
+        self.assertEqual(self.count_rows(default_partition_name(self.table)), 0)
+        self.assertEqual(self.count_rows(partition_name(self.table, future_month)), 1)
+        self.assertTrue(TimeEntry.objects.filter(pk=entry.pk).exists())
+
+
+class TimeEntryFilterPartitionPruningTests(TestCase):
+    def setUp(self):
+        self.window_start = datetime(2025, 5, 5, 14, tzinfo=dt_timezone.utc)
+        self.window_end = datetime(2025, 5, 5, 16, tzinfo=dt_timezone.utc)
+
+    def get_bounds(self, data):
+        filterset = TimeEntryFilter(data=data, queryset=TimeEntry.objects.none())
+        self.assertTrue(filterset.is_valid())
+        return filterset.get_partition_pruning_bounds()
+
+    @override_settings(TIME_ENTRY_PARTITION_KEY='')
+    def test_no_bounds_without_partitioning(self):
+        self.assertEqual(self.get_bounds({'end_time_before': self.window_end.isoformat()}), {})
+
+    @override_settings(TIME_ENTRY_PARTITION_KEY='start_time')
+    def test_end_time_upper_bound_bounds_start_time(self):
+        bounds = self.get_bounds({
+            'end_time_before': self.window_end.isoformat(),
+            'overlaps_before': self.window_start.isoformat(),
+        })
+        self.assertEqual(bounds, {'start_time__lt': self.window_start})
+
+    @override_settings(TIME_ENTRY_PARTITION_KEY='end_time')
+    def test_start_time_lower_bound_bounds_end_time(self):
+        bounds = self.get_bounds({'start_time_after': self.window_start.isoformat()})
+        self.assertEqual(bounds, {'end_time__gt': self.window_start})
@@ -12,7 +12,7 @@ from rest_framework.test import APIRequestFactory
 from TimeMate.Utils.test_helpers import get_error_code
 from Task.models import Task
 from TimeEntry.models import TimeEntry
-from TimeEntry.serializers import TimeEntryCreateSerializer, TimeEntryListSerializer
+from TimeEntry.serializers import TaskWithTimeEntriesSerializer, TimeEntryCreateSerializer, TimeEntryListSerializer
 from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE
 
 User = get_user_model()
@@ -130,3 +130,19 @@ class TimeEntryListSerializerTests(TestCase):
 
         self.assertEqual(self.time_entry.start_time, expected_start_time)
         self.assertEqual(self.time_entry.end_time, expected_end_time)
+
+
+class TaskWithTimeEntriesSerializerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.time_entry = TimeEntry.objects.create(
+            owner=self.user, task=self.task, start_time=now(), end_time=now() + timedelta(hours=1)
+        )
+        self.context = {'request': APIRequestFactory().get('/')}
+
+    def test_serialization_without_prefetch_reads_live_entries(self):
+        data = TaskWithTimeEntriesSerializer(instance=self.task, context=self.context).data
+
+        self.assertEqual([entry['id'] for entry in data['entries']], [str(self.time_entry.id)])
+        self.assertTrue(data['entries'][0]['detail_url'].endswith(f'/time-entries/{self.time_entry.id}/'))
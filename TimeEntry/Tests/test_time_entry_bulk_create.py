@@ -0,0 +1,227 @@
+# Python imports
+import uuid
+from datetime import timedelta
+from unittest import mock
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+# DRF Imports
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+# Internal imports
+from Task.models import Task
+from Task.validators import (
+    VALIDATION_ERROR_CODE_TASK_INVALID_OWNER,
+    VALIDATION_ERROR_CODE_TASK_NOT_FOUND,
+    cache_task_owner,
+    get_cached_owned_task,
+)
+from TimeEntry.models import TimeEntry
+from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE, VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY
+from TimeMate.Utils.test_helpers import get_app_queries, get_error_code
+
+User = get_user_model()
+
+
+class TimeEntryBulkCreateTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.other_user = User.objects.create_user(username='otheruser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.second_task = Task.objects.create(name='Second Task', owner=self.user)
+        self.other_task = Task.objects.create(name='Other Task', owner=self.other_user)
+        self.start = timezone.now().replace(microsecond=0)
+        self.url = reverse('time_entry_bulk')
+        self.client.force_authenticate(user=self.user)
+
+    def get_entries(self, count, task=None):
+        """
+        Return `count` consecutive one-hour entries, alternating between the user's tasks unless `task` is given.
+        """
+        return [
+            {
+                'task': str((task or (self.task, self.second_task)[index % 2]).id),
+                'start_time': (self.start + timedelta(hours=index)).isoformat(),
+                'end_time': (self.start + timedelta(hours=index + 1)).isoformat(),
+            }
+            for index in range(count)
+        ]
+
+    def test_bulk_create_time_entries(self):
+        """
+        Ensure that a valid batch is created and returned in request order, with ids and durations.
+        """
+        entries = self.get_entries(3)
+
+        response = self.client.post(self.url, entries, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual([str(item['task']) for item in response.data], [entry['task'] for entry in entries])
+        self.assertEqual(response.data[0]['duration'], '01:00:00')
+        self.assertEqual(response.data[0]['owner']['username'], self.user.username)
+        ids = {uuid.UUID(str(item['id'])) for item in response.data}
+        self.assertEqual(set(TimeEntry.objects.filter(owner=self.user).values_list('id', flat=True)), ids)
+
+    def test_bulk_create_reports_errors_per_item(self):
+        """
+        Ensure that one invalid item rejects the whole batch, with an error object per item in request order.
+        """
+        entries = self.get_entries(4)
+        entries[1]['task'] = str(self.other_task.id)
+        entries[2]['task'] = str(uuid.uuid4())
+        entries[3]['end_time'] = entries[3]['start_time']
+
+        response = self.client.post(self.url, entries, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(get_error_code(response.data[1]['task']), VALIDATION_ERROR_CODE_TASK_INVALID_OWNER)
+        self.assertEqual(get_error_code(response.data[2]['task']), VALIDATION_ERROR_CODE_TASK_NOT_FOUND)
+        self.assertEqual(get_error_code(response.data[3]['non_field_errors']), VALIDATION_ERROR_CODE_INVALID_TIME_RANGE)
+        self.assertFalse(TimeEntry.objects.exists())
+
+    @override_settings(TIME_ENTRY_BULK_MAX_SIZE=2)
+    def test_bulk_create_rejects_oversized_batch(self):
+        """
+        Ensure that a batch larger than `TIME_ENTRY_BULK_MAX_SIZE` is rejected before any item is resolved.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, self.get_entries(3), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_error_code(response.data['non_field_errors']), 'max_length')
+        self.assertEqual(get_app_queries(context.captured_queries), [])
+
+    def test_bulk_create_rejects_empty_batch_and_non_list(self):
+        """
+        Ensure that an empty list and a single object are rejected.
+        """
+        self.assertEqual(self.client.post(self.url, [], format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, self.get_entries(1)[0], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+
+        response = self.client.post(self.url, self.get_entries(1), format='json')
+
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_bulk_create_query_count(self):
+        """
+        Ensure that a batch resolves all of its tasks with one query and inserts all entries with one INSERT.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, self.get_entries(50), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        queries = get_app_queries(context.captured_queries)
+        self.assertEqual(len(queries), 2, queries)
+        self.assertIn('"Task_task"."owner_id" =', queries[0])
+        self.assertTrue(queries[1].startswith('INSERT'))
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 50)
+
+    def test_bulk_create_classifies_foreign_tasks_with_one_more_query(self):
+        """
+        Ensure that tasks which are not the user's are told apart (missing or foreign) with one more query.
+        """
+        entries = self.get_entries(10)
+        for entry in entries[5:]:
+            entry['task'] = str(self.other_task.id)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, entries, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(get_app_queries(context.captured_queries)), 2)
+
+    def test_bulk_create_invalidates_cache_once(self):
+        """
+        Ensure that the user's cached lists are dropped once per batch, not once per entry.
+        """
+        self.client.get(reverse('time_entry_list_create'))
+        self.assertTrue(list(cache.iter_keys(f'*:user={self.user.id}:*')))
+
+        with mock.patch('TimeEntry.views.invalidate_user_list') as invalidate_user_list:
+            response = self.client.post(self.url, self.get_entries(5), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        invalidate_user_list.assert_called_once_with(self.user.id)
+
+        self.client.post(self.url, self.get_entries(1, task=self.task), format='json')
+        self.assertFalse(list(cache.iter_keys(f'*:user={self.user.id}:*')))
+
+    @override_settings(TIME_ENTRY_REJECT_OVERLAPS=True)
+    def test_bulk_create_rejects_overlaps_with_one_query(self):
+        """
+        Ensure that overlaps with stored entries and within the batch are found with one query for the batch.
+        """
+        TimeEntry.objects.create(
+            task=self.task, owner=self.user, start_time=self.start, end_time=self.start + timedelta(minutes=30)
+        )
+        entries = self.get_entries(3)
+        # Overlaps the second entry of the batch.
+        entries.append({**entries[1], 'start_time': (self.start + timedelta(minutes=90)).isoformat()})
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, entries, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        overlap_code = VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY
+        self.assertEqual(get_error_code(response.data[0]['non_field_errors']), overlap_code)
+        self.assertEqual(response.data[1], {})
+        self.assertEqual(response.data[2], {})
+        self.assertEqual(get_error_code(response.data[3]['non_field_errors']), overlap_code)
+        # Task lookup, then the overlap check.
+        self.assertEqual(len(get_app_queries(context.captured_queries)), 2)
+
+    @override_settings(TIME_ENTRY_REJECT_OVERLAPS=True)
+    def test_bulk_create_accepts_adjacent_entries(self):
+        response = self.client.post(self.url, self.get_entries(3), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class TimeEntryBulkCreateCommitTests(APITransactionTestCase):
+    """
+    Foreign keys are checked when the transaction commits, which `APITestCase` never does.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.deleted_task = Task.objects.create(name='Deleted Task', owner=self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_create_with_task_deleted_behind_cached_owner(self):
+        """
+        Ensure that a batch with a task deleted without its cached owner being dropped (e.g. on another
+        database) is rejected as a whole with `task_not_found` rather than failing the INSERT.
+        """
+        for task in (self.task, self.deleted_task):
+            cache_task_owner(task.id, self.user.pk)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM "Task_task" WHERE id = %s', [self.deleted_task.id])
+        start = timezone.now().replace(microsecond=0)
+        data = [
+            {'task': str(task.id), 'start_time': (start + timedelta(hours=index)).isoformat(),
+             'end_time': (start + timedelta(hours=index, minutes=30)).isoformat()}
+            for index, task in enumerate((self.task, self.deleted_task))
+        ]
+
+        response = self.client.post(reverse('time_entry_bulk'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_error_code(response.data['task']), VALIDATION_ERROR_CODE_TASK_NOT_FOUND)
+        self.assertFalse(TimeEntry.objects.exists())
+        # The batch's cached owners are dropped: the next request asks the database.
+        self.assertIsNone(get_cached_owned_task(self.task.id, self.user))
+        self.assertIsNone(get_cached_owned_task(self.deleted_task.id, self.user))
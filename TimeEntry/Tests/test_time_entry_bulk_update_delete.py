@@ -0,0 +1,206 @@
+# Python imports
+import uuid
+from datetime import timedelta
+from unittest import mock
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+# DRF Imports
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+# Internal imports
+from Task.models import Task
+from Task.validators import (
+    VALIDATION_ERROR_CODE_TASK_INVALID_OWNER,
+    VALIDATION_ERROR_CODE_TASK_NOT_FOUND,
+    cache_task_owner,
+    get_cached_owned_task,
+)
+from TimeEntry.models import TimeEntry
+from TimeEntry.validators import VALIDATION_ERROR_CODE_BULK_FILTER_REQUIRED
+from TimeMate.Utils.test_helpers import get_app_queries, get_error_code
+
+User = get_user_model()
+
+
+class TimeEntryBulkTestMixin:
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.other_user = User.objects.create_user(username='otheruser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.new_task = Task.objects.create(name='New Task', owner=self.user)
+        self.other_task = Task.objects.create(name='Other Task', owner=self.other_user)
+        self.start = timezone.now().replace(microsecond=0) - timedelta(days=10)
+        # One entry a day for the user, and one for the other user on the same days.
+        self.time_entries = [
+            TimeEntry.objects.create(
+                task=self.task, owner=self.user,
+                start_time=self.start + timedelta(days=day), end_time=self.start + timedelta(days=day, hours=1)
+            )
+            for day in range(5)
+        ]
+        self.other_time_entry = TimeEntry.objects.create(
+            task=self.other_task, owner=self.other_user, start_time=self.start, end_time=self.start + timedelta(hours=1)
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def get_url(self, **params):
+        query = '&'.join(f'{name}={value}' for name, value in params.items())
+        return f"{reverse('time_entry_bulk')}?{query}"
+
+    def get_first_days_params(self, days):
+        """
+        Return filters matching the user's entries of the first `days` days.
+        """
+        return {'start_time_before': (self.start + timedelta(days=days - 1, minutes=1)).strftime('%Y-%m-%dT%H:%M:%SZ')}
+
+
+class TimeEntryBulkUpdateTests(TimeEntryBulkTestMixin, APITestCase):
+    def test_bulk_update_reassigns_matched_entries(self):
+        """
+        Ensure that the matched entries of the user are moved to the new task, and the count is returned.
+        """
+        response = self.client.patch(
+            self.get_url(**self.get_first_days_params(3)), {'task': str(self.new_task.id)}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'count': 3, 'dry_run': False})
+        self.assertEqual(TimeEntry.objects.filter(task=self.new_task).count(), 3)
+        self.other_time_entry.refresh_from_db()
+        self.assertEqual(self.other_time_entry.task, self.other_task)
+
+    def test_bulk_update_by_ids_and_task_name(self):
+        """
+        Ensure that the id list and the task name filter narrow down the matched entries together.
+        """
+        ids = ','.join(str(time_entry.id) for time_entry in self.time_entries[:2] + [self.other_time_entry])
+
+        response = self.client.patch(
+            self.get_url(ids=ids, task='test'), {'task': str(self.new_task.id)}, format='json'
+        )
+
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            set(TimeEntry.objects.filter(task=self.new_task).values_list('id', flat=True)),
+            {time_entry.id for time_entry in self.time_entries[:2]}
+        )
+
+    def test_bulk_update_rejects_task_of_other_user(self):
+        response = self.client.patch(
+            self.get_url(task='test'), {'task': str(self.other_task.id)}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_error_code(response.data['task']), VALIDATION_ERROR_CODE_TASK_INVALID_OWNER)
+        self.assertFalse(TimeEntry.objects.filter(task=self.other_task, owner=self.user).exists())
+
+    def test_bulk_update_dry_run_only_counts(self):
+        response = self.client.patch(
+            self.get_url(dry_run='true', task='test'), {'task': str(self.new_task.id)}, format='json'
+        )
+
+        self.assertEqual(response.data, {'count': 5, 'dry_run': True})
+        self.assertFalse(TimeEntry.objects.filter(task=self.new_task).exists())
+
+    def test_bulk_update_is_one_update_and_invalidates_once(self):
+        """
+        Ensure that the update runs as a single UPDATE (after the task lookup) and drops cached lists once.
+        """
+        url = self.get_url(task='test')
+        with mock.patch('TimeEntry.views.invalidate_user_list') as invalidate_user_list:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.patch(url, {'task': str(self.new_task.id)}, format='json')
+
+        self.assertEqual(response.data['count'], 5)
+        queries = get_app_queries(context.captured_queries)
+        self.assertEqual(len(queries), 2, queries)
+        self.assertTrue(queries[1].startswith('UPDATE'))
+        invalidate_user_list.assert_called_once_with(self.user.id)
+
+
+class TimeEntryBulkUpdateCommitTests(TimeEntryBulkTestMixin, APITransactionTestCase):
+    """
+    Foreign keys are checked when the transaction commits, which `APITestCase` never does.
+    """
+
+    def test_bulk_update_to_task_deleted_behind_cached_owner(self):
+        """
+        Ensure that moving entries to a task deleted without its cached owner being dropped (e.g. on another
+        database) is reported as not found rather than failing the UPDATE.
+        """
+        cache_task_owner(self.new_task.id, self.user.pk)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM "Task_task" WHERE id = %s', [self.new_task.id])
+        ids = ','.join(str(time_entry.id) for time_entry in self.time_entries[:2])
+
+        response = self.client.patch(self.get_url(ids=ids), {'task': str(self.new_task.id)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_error_code(response.data['task']), VALIDATION_ERROR_CODE_TASK_NOT_FOUND)
+        self.assertEqual(TimeEntry.objects.filter(task=self.task).count(), 5)
+        self.assertIsNone(get_cached_owned_task(self.new_task.id, self.user))
+
+
+class TimeEntryBulkDeleteTests(TimeEntryBulkTestMixin, APITestCase):
+    def test_bulk_delete_matched_entries(self):
+        response = self.client.delete(self.get_url(**self.get_first_days_params(2)))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'count': 2, 'dry_run': False})
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 3)
+        self.assertTrue(TimeEntry.objects.filter(pk=self.other_time_entry.pk).exists())
+
+    def test_bulk_delete_ignores_entries_of_other_users(self):
+        response = self.client.delete(self.get_url(ids=f'{self.other_time_entry.id},{uuid.uuid4()}'))
+
+        self.assertEqual(response.data['count'], 0)
+        self.assertTrue(TimeEntry.objects.filter(pk=self.other_time_entry.pk).exists())
+
+    def test_bulk_delete_requires_a_filter(self):
+        """
+        Ensure that an empty query string does not delete all of the user's entries.
+        """
+        response = self.client.delete(self.get_url(ids=''))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_error_code(response.data['non_field_errors']), VALIDATION_ERROR_CODE_BULK_FILTER_REQUIRED)
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 5)
+
+    def test_bulk_delete_rejects_invalid_filters(self):
+        response = self.client.delete(self.get_url(start_time_after='yesterday'))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 5)
+
+    def test_bulk_delete_dry_run_only_counts(self):
+        response = self.client.delete(self.get_url(dry_run='1', task='test'))
+
+        self.assertEqual(response.data, {'count': 5, 'dry_run': True})
+        self.assertEqual(TimeEntry.objects.filter(owner=self.user).count(), 5)
+
+    def test_bulk_delete_reads_ids_once_and_invalidates_cache_once(self):
+        """
+        Ensure that the entries are deleted after reading only their ids, and cached lists are dropped once.
+        """
+        self.client.get(reverse('time_entry_list_create'))
+        self.assertTrue(list(cache.iter_keys(f'*:user={self.user.id}:*')))
+
+        with CaptureQueriesContext(connection) as context, \
+                mock.patch.object(cache, 'delete_pattern', wraps=cache.delete_pattern) as delete_pattern:
+            response = self.client.delete(self.get_url(task='test'))
+
+        self.assertEqual(response.data['count'], 5)
+        queries = get_app_queries(context.captured_queries)
+        self.assertEqual(len(queries), 2, queries)
+        self.assertTrue(queries[0].startswith(f'SELECT "{TimeEntry._meta.db_table}"."id", '
+                                              f'"{TimeEntry._meta.db_table}"."owner_id" FROM'))
+        self.assertTrue(queries[1].startswith('DELETE'))
+        delete_pattern.assert_called_once_with(f'*:user={self.user.id}:*')
+        self.assertFalse(TimeEntry.objects.filter(owner=self.user, task__name='test').exists())
+        self.assertFalse(list(cache.iter_keys(f'*:user={self.user.id}:*')))
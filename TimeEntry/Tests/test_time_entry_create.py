@@ -5,15 +5,19 @@ from datetime import timedelta
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
+from django.test import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 # DRF Imports
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
 # Internal imports
-from TimeMate.Utils.test_helpers import get_error_code
+from TimeMate.Utils.test_helpers import get_app_queries, get_error_code
+from Task.validators import cache_task_owner
 from TimeEntry.models import TimeEntry
 from Task.models import Task
-from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE
-from Task.validators import VALIDATION_ERROR_CODE_TASK_INVALID_OWNER
+from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE, VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY
+from Task.validators import VALIDATION_ERROR_CODE_TASK_INVALID_OWNER, VALIDATION_ERROR_CODE_TASK_NOT_FOUND, get_cached_owned_task
 
 User = get_user_model()
 
@@ -119,3 +123,106 @@ class TimeEntryCreateTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         errors = response.data['task']
         self.assertEqual(get_error_code(errors), VALIDATION_ERROR_CODE_TASK_INVALID_OWNER)
+
+    def test_create_time_entry_query_count(self):
+        """
+        Ensure that creating a time entry resolves the owned task in one query, without loading its owner.
+        """
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'task': self.task.id,
+            'start_time': timezone.now().isoformat(),
+            'end_time': (timezone.now() + timedelta(hours=1)).isoformat(),
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, data=data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        queries = get_app_queries(context.captured_queries)
+        # Task lookup filtered by owner, then the INSERT.
+        self.assertEqual(len(queries), 2, queries)
+        self.assertIn('"Task_task"."owner_id" =', queries[0])
+        self.assertTrue(queries[1].startswith('INSERT'))
+
+    def test_create_time_entry_with_cached_task_owner_is_single_insert(self):
+        """
+        Ensure that with the task owner cached (as task signals do), creating a time entry runs only the INSERT.
+        """
+        cache_task_owner(self.task.id, self.user.pk)
+        self.client.force_authenticate(user=self.user)
+        data = {
+            'task': self.task.id,
+            'start_time': timezone.now().isoformat(),
+            'end_time': (timezone.now() + timedelta(hours=1)).isoformat(),
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, data=data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        queries = get_app_queries(context.captured_queries)
+        self.assertEqual(len(queries), 1, queries)
+        self.assertTrue(queries[0].startswith('INSERT'))
+        self.assertEqual(TimeEntry.objects.filter(task=self.task).count(), 2)
+
+    @override_settings(TIME_ENTRY_REJECT_OVERLAPS=True)
+    def test_create_overlapping_time_entry_rejected_when_enabled(self):
+        """
+        Ensure that an entry overlapping another entry of the same user is rejected in overlap-rejecting mode.
+        """
+        self.client.force_authenticate(user=self.user)
+        start_time = self.time_entry_sample_object.start_time + timedelta(minutes=30)
+        data = {
+            'task': self.task.id,
+            'start_time': start_time.isoformat(),
+            'end_time': (start_time + timedelta(hours=1)).isoformat(),
+        }
+        response = self.client.post(self.url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['non_field_errors']
+        self.assertEqual(get_error_code(errors), VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY)
+
+    def test_create_overlapping_time_entry_allowed_by_default(self):
+        """
+        Ensure that overlapping entries are accepted while overlap rejection is disabled.
+        """
+        self.client.force_authenticate(user=self.user)
+        start_time = self.time_entry_sample_object.start_time + timedelta(minutes=30)
+        data = {
+            'task': self.task.id,
+            'start_time': start_time.isoformat(),
+            'end_time': (start_time + timedelta(hours=1)).isoformat(),
+        }
+        response = self.client.post(self.url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class TimeEntryCreateCommitTests(APITransactionTestCase):
+    """
+    Foreign keys are checked when the transaction commits, which `APITestCase` never does.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.client.force_authenticate(user=self.user)
+
+    def test_create_time_entry_for_task_deleted_behind_cached_owner(self):
+        """
+        Ensure that a task deleted without its cached owner being dropped (e.g. on another database)
+        is reported as not found rather than failing the INSERT.
+        """
+        cache_task_owner(self.task.id, self.user.pk)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM "Task_task" WHERE id = %s', [self.task.id])
+        data = {
+            'task': self.task.id,
+            'start_time': timezone.now().isoformat(),
+            'end_time': (timezone.now() + timedelta(hours=1)).isoformat(),
+        }
+
+        response = self.client.post(reverse('time_entry_list_create'), data=data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_error_code(response.data['task']), VALIDATION_ERROR_CODE_TASK_NOT_FOUND)
+        self.assertFalse(TimeEntry.objects.exists())
+        self.assertIsNone(get_cached_owned_task(self.task.id, self.user))
@@ -0,0 +1,165 @@
+# Python imports
+import csv
+import io
+import json
+from datetime import timedelta
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+# DRF Imports
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from TimeEntry.exporting import EXPORT_COLUMNS
+from TimeEntry.models import TimeEntry
+
+User = get_user_model()
+
+
+class TimeEntryCsvExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.other_user = User.objects.create_user(username='otheruser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.other_task = Task.objects.create(name='Other Task', owner=self.other_user)
+        self.start = timezone.now().replace(microsecond=0) - timedelta(days=10)
+        self.time_entries = [
+            TimeEntry.objects.create(
+                owner=self.user,
+                task=self.task,
+                start_time=self.start + timedelta(days=index),
+                end_time=self.start + timedelta(days=index, minutes=30),
+            )
+            for index in range(5)
+        ]
+        TimeEntry.objects.create(
+            owner=self.other_user, task=self.other_task, start_time=self.start, end_time=self.start + timedelta(hours=1)
+        )
+        self.url = reverse('time_entry_export_csv')
+        self.client.force_authenticate(user=self.user)
+
+    def get_rows(self, response_or_chunks):
+        chunks = getattr(response_or_chunks, 'streaming_content', response_or_chunks)
+        return list(csv.reader(io.StringIO(b''.join(chunks).decode())))
+
+    def test_export_streams_all_entries_of_user(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = self.get_rows(response)
+        self.assertEqual(rows[0], EXPORT_COLUMNS)
+        # Default ordering of the list endpoint: latest end first.
+        self.assertEqual([row[0] for row in rows[1:]], [str(entry.id) for entry in reversed(self.time_entries)])
+
+    def test_export_row_format(self):
+        entry = self.time_entries[0]
+
+        row = self.get_rows(self.client.get(self.url, {'ordering': 'start_time'}))[1]
+
+        self.assertEqual(row, [
+            str(entry.id),
+            str(self.task.id),
+            self.task.name,
+            entry.start_time.isoformat().replace('+00:00', 'Z'),
+            entry.end_time.isoformat().replace('+00:00', 'Z'),
+            '1800.0',
+        ])
+
+    def test_export_applies_filters(self):
+        response = self.client.get(self.url, {'start_time_after': (self.start + timedelta(days=3)).isoformat()})
+
+        rows = self.get_rows(response)
+        self.assertEqual({row[0] for row in rows[1:]}, {str(entry.id) for entry in self.time_entries[3:]})
+
+    def test_export_rejects_invalid_filters(self):
+        response = self.client.get(self.url, {'start_time_after': 'not-a-date'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TIME_ENTRY_EXPORT_CHUNK_SIZE=2)
+    def test_export_is_sent_in_chunks(self):
+        response = self.client.get(self.url)
+
+        chunks = list(response.streaming_content)
+        # Header with the first two rows, two more rows, the last row.
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(len(self.get_rows(chunks)), 6)
+
+    def test_export_without_entries(self):
+        self.client.force_authenticate(user=User.objects.create_user(username='newuser', password='<PASSWORD>'))
+
+        rows = self.get_rows(self.client.get(self.url))
+
+        self.assertEqual(rows, [EXPORT_COLUMNS])
+
+    def test_export_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TimeEntryNdjsonExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.day = timezone.now().replace(hour=8, minute=0, second=0, microsecond=0) - timedelta(days=5)
+        # Two entries on the first day, one on the next.
+        self.time_entries = [
+            TimeEntry.objects.create(owner=self.user, task=self.task, start_time=start, end_time=start + timedelta(hours=1))
+            for start in (self.day, self.day + timedelta(hours=2), self.day + timedelta(days=1))
+        ]
+        self.token = Token.objects.create(user=self.user)
+        self.url = reverse('time_entry_export_ndjson')
+        self.client.force_authenticate(user=self.user)
+
+    def get_lines(self, chunks):
+        return [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+
+    def test_export_one_entry_per_line(self):
+        response = self.client.get(self.url, {'ordering': 'start_time'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = self.get_lines(response.streaming_content)
+        self.assertEqual([line['id'] for line in lines], [str(entry.id) for entry in self.time_entries])
+        self.assertEqual(list(lines[0]), EXPORT_COLUMNS)
+        self.assertEqual(lines[0]['duration_seconds'], 3600.0)
+
+    def test_export_grouped_by_day(self):
+        lines = self.get_lines(self.client.get(self.url, {'group_by': 'day'}).streaming_content)
+
+        self.assertEqual([line['day'] for line in lines], [
+            (self.day + timedelta(days=1)).date().isoformat(), self.day.date().isoformat()
+        ])
+        self.assertEqual([entry['id'] for entry in lines[1]['entries']],
+                         [str(self.time_entries[1].id), str(self.time_entries[0].id)])
+
+    def test_export_rejects_unknown_grouping(self):
+        response = self.client.get(self.url, {'group_by': 'week'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_export_streams_asynchronously_under_asgi(self):
+        response = await self.async_client.get(
+            self.url, {'ordering': 'start_time'}, headers={'Authorization': f'Token {self.token.key}'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        lines = self.get_lines([chunk async for chunk in response.streaming_content])
+        self.assertEqual([line['id'] for line in lines], [str(entry.id) for entry in self.time_entries])
+
+    @override_settings(TIME_ENTRY_EXPORT_CHUNK_SIZE=1)
+    async def test_async_export_flushes_every_line(self):
+        response = await self.async_client.get(self.url, headers={'Authorization': f'Token {self.token.key}'})
+
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), len(self.time_entries))
@@ -1,5 +1,6 @@
 # Python imports
 from datetime import timedelta
+from urllib.parse import urlencode
 # Django Imports
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -11,6 +12,7 @@ from rest_framework.test import APITestCase
 from TimeMate.Utils.test_helpers import get_error_code
 from TimeMate.Permissions.owner_permissions import PERMISSION_ERROR_CODE_NOT_TASK_OWNER
 from TimeEntry.models import TimeEntry
+from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE
 from Task.models import Task
 
 User = get_user_model()
@@ -409,4 +411,71 @@ class TimeEntryListViewOrderingTests(APITestCase):
         expected = sorted([self.e1, self.e2, self.e3],
                           key=lambda e: (e.end_time - e.start_time),
                           reverse=True)
-        self.assertEqual(ids, [str(e.id) for e in expected])
\ No newline at end of file
+        self.assertEqual(ids, [str(e.id) for e in expected])
+
+
+class TimeEntryOverlapFilterTests(APITestCase):
+    """
+    Tests for the `overlaps_after` / `overlaps_before` window filter.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.window_start = timezone.now().replace(hour=14, minute=0, second=0, microsecond=0)
+        self.window_end = self.window_start + timedelta(hours=2)
+
+        def create_entry(start_offset, end_offset):
+            return TimeEntry.objects.create(
+                task=self.task, owner=self.user,
+                start_time=self.window_start + start_offset,
+                end_time=self.window_start + end_offset
+            )
+
+        # 13:00 - 17:00, spans the whole window
+        self.spanning = create_entry(timedelta(hours=-1), timedelta(hours=3))
+        # 15:00 - 15:30, inside the window
+        self.inside = create_entry(timedelta(hours=1), timedelta(hours=1, minutes=30))
+        # 13:30 - 14:30, starts before the window
+        self.partial = create_entry(timedelta(minutes=-30), timedelta(minutes=30))
+        # 12:00 - 14:00, ends exactly when the window starts
+        self.adjacent = create_entry(timedelta(hours=-2), timedelta(0))
+
+        self.url = reverse('time_entry_list_create')
+        self.client.force_authenticate(user=self.user)
+
+    def _get_ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {entry['id'] for entry in response.data['results']}
+
+    def test_filter_overlaps_window_includes_spanning_entries(self):
+        ids = self._get_ids({
+            'overlaps_after': self.window_start.isoformat(),
+            'overlaps_before': self.window_end.isoformat(),
+        })
+        self.assertEqual(ids, {str(self.spanning.id), str(self.inside.id), str(self.partial.id)})
+
+    def test_filter_overlaps_with_open_end(self):
+        ids = self._get_ids({'overlaps_after': (self.window_end - timedelta(minutes=1)).isoformat()})
+        self.assertEqual(ids, {str(self.spanning.id)})
+
+    def test_filter_overlaps_rejects_inverted_window(self):
+        response = self.client.get(self.url, {
+            'overlaps_after': self.window_end.isoformat(),
+            'overlaps_before': self.window_start.isoformat(),
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['overlaps'][0].code, VALIDATION_ERROR_CODE_INVALID_TIME_RANGE)
+
+    def test_bulk_filter_rejects_inverted_window(self):
+        query = urlencode({
+            'overlaps_after': self.window_end.isoformat(),
+            'overlaps_before': self.window_start.isoformat(),
+        })
+
+        response = self.client.delete(f"{reverse('time_entry_bulk')}?{query}")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(TimeEntry.objects.count(), 4)
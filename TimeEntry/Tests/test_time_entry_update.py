@@ -3,15 +3,23 @@ from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 # DRF imports
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
 # Internal imports
-from TimeMate.Utils.test_helpers import get_error_code
+from TimeMate.Utils.test_helpers import get_app_queries, get_error_code
 from Task.models import Task
 from TimeEntry.models import TimeEntry
-from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE
-from Task.validators import VALIDATION_ERROR_CODE_TASK_INVALID_OWNER
+from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE, VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY
+from Task.validators import (
+    VALIDATION_ERROR_CODE_TASK_INVALID_OWNER,
+    VALIDATION_ERROR_CODE_TASK_NOT_FOUND,
+    cache_task_owner,
+    get_cached_owned_task,
+)
 from TimeMate.Permissions.owner_permissions import PERMISSION_ERROR_CODE_NOT_TASK_OWNER
 
 User = get_user_model()
@@ -138,3 +146,93 @@ class TimeEntryUpdateTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         error_message = response.data['task']
         self.assertEqual(get_error_code(error_message), VALIDATION_ERROR_CODE_TASK_INVALID_OWNER)
+
+    def test_partial_update_past_stored_start_time(self):
+        """
+        Ensure that moving only `end_time` before the stored `start_time` is reported by the
+        `end_time_gt_start_time` constraint as an invalid time range, not as a server error.
+        """
+        self.client.force_authenticate(user=self.user)
+        payload = {"end_time": (self.time_entry.start_time - timezone.timedelta(hours=1)).isoformat()}
+
+        response = self.client.patch(self.detail_url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_error_code(response.data['non_field_errors']), VALIDATION_ERROR_CODE_INVALID_TIME_RANGE)
+        self.time_entry.refresh_from_db()
+        self.assertGreater(self.time_entry.end_time, self.time_entry.start_time)
+
+    def test_update_time_entry_query_count(self):
+        """
+        Ensure that a PUT loads the entry, resolves the owned task in one query and updates the row.
+        """
+        self.client.force_authenticate(user=self.user)
+        payload = {
+            'task': str(self.task.id),
+            "start_time": "2025-10-01T09:00:00Z",
+            "end_time": "2025-10-01T11:00:00Z"
+        }
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.put(self.detail_url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = get_app_queries(context.captured_queries)
+        self.assertEqual(len(queries), 3, queries)
+        self.assertIn('"Task_task"."owner_id" =', queries[1])
+        # The owner is compared by ID, never loaded on its own.
+        self.assertFalse(any('FROM "auth_user"' in query for query in queries))
+        self.assertTrue(queries[2].startswith('UPDATE'))
+
+    @override_settings(TIME_ENTRY_REJECT_OVERLAPS=True)
+    def test_partial_update_into_overlap_rejected_when_enabled(self):
+        """
+        Ensure that moving only one bound of an entry onto another entry is rejected in overlap-rejecting mode.
+        """
+        TimeEntry.objects.create(
+            task=self.task,
+            owner=self.user,
+            start_time=self.time_entry.end_time + timezone.timedelta(hours=1),
+            end_time=self.time_entry.end_time + timezone.timedelta(hours=2)
+        )
+        self.client.force_authenticate(user=self.user)
+        payload = {'end_time': (self.time_entry.end_time + timezone.timedelta(hours=1, minutes=30)).isoformat()}
+
+        response = self.client.patch(self.detail_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_error_code(response.data['non_field_errors']), VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY)
+
+
+class TimeEntryUpdateCommitTests(APITransactionTestCase):
+    """
+    Foreign keys are checked when the transaction commits, which `APITestCase` never does.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user1', password='<PASSWORD>', email='<EMAIL>')
+        self.task = Task.objects.create(name='Sample Task', owner=self.user)
+        self.deleted_task = Task.objects.create(name='Deleted Task', owner=self.user)
+        self.time_entry = TimeEntry.objects.create(
+            task=self.task,
+            owner=self.user,
+            start_time=timezone.now(),
+            end_time=timezone.now() + timezone.timedelta(hours=1)
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_update_time_entry_to_task_deleted_behind_cached_owner(self):
+        """
+        Ensure that moving an entry to a task deleted without its cached owner being dropped
+        (e.g. on another database) is reported as not found rather than failing the UPDATE.
+        """
+        cache_task_owner(self.deleted_task.id, self.user.pk)
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM "Task_task" WHERE id = %s', [self.deleted_task.id])
+        url = reverse('time_entry_detail', kwargs={'pk': self.time_entry.id})
+
+        response = self.client.patch(url, {'task': self.deleted_task.id})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_error_code(response.data['task']), VALIDATION_ERROR_CODE_TASK_NOT_FOUND)
+        self.time_entry.refresh_from_db()
+        self.assertEqual(self.time_entry.task_id, self.task.id)
+        self.assertIsNone(get_cached_owned_task(self.deleted_task.id, self.user))
@@ -0,0 +1,172 @@
+# Python imports
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+# DRF Imports
+from rest_framework import status
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from TimeEntry.models import TimeEntry
+from TimeEntry.timers import (
+    TIMER_ERROR_CODE_ALREADY_RUNNING,
+    TIMER_ERROR_CODE_NOT_RUNNING,
+    get_timer_key,
+    get_timer_redis,
+    start_timer,
+)
+from TimeEntry.validators import VALIDATION_ERROR_CODE_TIMER_START_IN_FUTURE
+from TimeMate.Utils.test_helpers import get_app_queries
+
+User = get_user_model()
+
+
+class TimerTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('TimeEntry.timers.TIMER_KEY_PREFIX', 'test_time_entry_timer')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.redis = get_timer_redis()
+        self.clear_timers()
+        self.addCleanup(self.clear_timers)
+
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.other_user = User.objects.create_user(username='otheruser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.other_task = Task.objects.create(name='Other Task', owner=self.other_user)
+        self.client.force_authenticate(user=self.user)
+        self.start_url = reverse('timer_start')
+        self.stop_url = reverse('timer_stop')
+        self.url = reverse('timer')
+
+    def clear_timers(self):
+        keys = list(self.redis.scan_iter(match=get_timer_key('*')))
+        if keys:
+            self.redis.delete(*keys)
+
+    def start(self, **data):
+        return self.client.post(self.start_url, {'task': str(self.task.id), **data}, format='json')
+
+    def test_start_timer(self):
+        response = self.start()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['task'], str(self.task.id))
+        self.assertTrue(self.redis.exists(get_timer_key(self.user.pk)))
+        self.assertFalse(TimeEntry.objects.exists())
+
+    def test_only_one_timer_per_user(self):
+        self.start()
+
+        response = self.start()
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['detail'].code, TIMER_ERROR_CODE_ALREADY_RUNNING)
+
+    def test_start_rejects_other_users_task(self):
+        response = self.client.post(self.start_url, {'task': str(self.other_task.id)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(self.redis.exists(get_timer_key(self.user.pk)))
+
+    def test_start_rejects_future_start(self):
+        response = self.start(started_at=(timezone.now() + timedelta(hours=1)).isoformat())
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['started_at'][0].code, VALIDATION_ERROR_CODE_TIMER_START_IN_FUTURE)
+
+    def test_current_timer_does_not_query_database(self):
+        started_at = timezone.now() - timedelta(minutes=30)
+        self.start(started_at=started_at.isoformat())
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['task'], str(self.task.id))
+        self.assertEqual(response.data['started_at'], started_at.isoformat().replace('+00:00', 'Z'))
+        self.assertGreaterEqual(response.data['elapsed'], '00:30:00')
+        self.assertEqual(get_app_queries(context), [])
+
+    def test_current_timer_when_none_runs(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['detail'].code, TIMER_ERROR_CODE_NOT_RUNNING)
+
+    def test_change_running_timer_without_writing_entries(self):
+        other_task = Task.objects.create(name='Another Task', owner=self.user)
+        self.start()
+
+        with mock.patch('TimeMate.Signals.signals.invalidate_user_list') as invalidate_user_list:
+            response = self.client.patch(self.url, {'task': str(other_task.id)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['task'], str(other_task.id))
+        invalidate_user_list.assert_not_called()
+        self.assertFalse(TimeEntry.objects.exists())
+
+    def test_stop_saves_time_entry(self):
+        started_at = timezone.now() - timedelta(hours=1)
+        self.start(started_at=started_at.isoformat())
+
+        response = self.client.post(self.stop_url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        time_entry = TimeEntry.objects.get(owner=self.user)
+        self.assertEqual(time_entry.task, self.task)
+        self.assertEqual(time_entry.start_time, started_at)
+        self.assertFalse(self.redis.exists(get_timer_key(self.user.pk)))
+
+    def test_stop_without_timer(self):
+        response = self.client.post(self.stop_url, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_stop_keeps_timer_running(self):
+        started_at = timezone.now() - timedelta(hours=1)
+        self.start(started_at=started_at.isoformat())
+
+        response = self.client.post(self.stop_url, {'end_time': (started_at - timedelta(minutes=1)).isoformat()},
+                                    format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TimeEntry.objects.exists())
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_discard_timer(self):
+        self.start()
+
+        response = self.client.delete(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(TimeEntry.objects.exists())
+
+    def test_sweep_discards_abandoned_timers_only(self):
+        start_timer(self.user.pk, self.task.pk, timezone.now() - timedelta(hours=30))
+        start_timer(self.other_user.pk, self.other_task.pk, timezone.now() - timedelta(hours=1))
+
+        stdout = StringIO()
+        call_command('sweep_timers', older_than_hours=24, stdout=stdout)
+
+        self.assertIn('Discarded 1 abandoned timers', stdout.getvalue())
+        self.assertFalse(self.redis.exists(get_timer_key(self.user.pk)))
+        self.assertTrue(self.redis.exists(get_timer_key(self.other_user.pk)))
+        self.assertFalse(TimeEntry.objects.exists())
+
+    def test_sweep_dry_run(self):
+        start_timer(self.user.pk, self.task.pk, timezone.now() - timedelta(hours=30))
+
+        call_command('sweep_timers', older_than_hours=24, dry_run=True, stdout=StringIO())
+
+        self.assertTrue(self.redis.exists(get_timer_key(self.user.pk)))
@@ -1,13 +1,19 @@
 # Python imports
 from datetime import datetime, timedelta
 # Django imports
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
 # DRF imports
 from rest_framework.exceptions import ValidationError
 # Internal imports
 from TimeMate.Utils.test_helpers import get_error_code
-from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE
-from TimeEntry.validators import validate_start_and_end_time
+from TimeEntry.validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE, VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY
+from TimeEntry.validators import validate_start_and_end_time, validate_no_overlapping_time_entries
+from TimeEntry.models import TimeEntry
+from Task.models import Task
+
+User = get_user_model()
 
 
 class ValidateStartAndEndTimeTest(TestCase):
@@ -35,4 +41,38 @@ class ValidateStartAndEndTimeTest(TestCase):
             validate_start_and_end_time(self.start_time, self.end_time)
 
         errors = context.exception.detail
-        self.assertEqual(get_error_code(errors), VALIDATION_ERROR_CODE_INVALID_TIME_RANGE)
\ No newline at end of file
+        self.assertEqual(get_error_code(errors), VALIDATION_ERROR_CODE_INVALID_TIME_RANGE)
+
+
+class ValidateNoOverlappingTimeEntriesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.start_time = timezone.now()
+        self.end_time = self.start_time + timedelta(hours=1)
+        self.time_entry = TimeEntry.objects.create(
+            task=self.task, owner=self.user, start_time=self.start_time, end_time=self.end_time
+        )
+
+    def test_overlapping_range_raises(self):
+        with self.assertRaises(ValidationError) as context:
+            validate_no_overlapping_time_entries(
+                self.user, self.start_time + timedelta(minutes=30), self.end_time + timedelta(minutes=30)
+            )
+
+        errors = context.exception.detail
+        self.assertEqual(get_error_code(errors), VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY)
+
+    def test_adjacent_range_is_valid(self):
+        try:
+            validate_no_overlapping_time_entries(self.user, self.end_time, self.end_time + timedelta(hours=1))
+        except ValidationError:
+            self.fail("validate_no_overlapping_time_entries() raised ValidationError for an adjacent range")
+
+    def test_excluded_entry_is_ignored(self):
+        try:
+            validate_no_overlapping_time_entries(
+                self.user, self.start_time, self.end_time, exclude_pk=self.time_entry.pk
+            )
+        except ValidationError:
+            self.fail("validate_no_overlapping_time_entries() raised ValidationError for the excluded entry")
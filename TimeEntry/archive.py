@@ -0,0 +1,86 @@
+# Python imports
+from datetime import timedelta
+# Django imports
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+# Internal imports
+from .models import ArchivedTimeEntry, TimeEntry, TimeEntryDailyAggregate
+
+
+def get_archive_cutoff():
+    """
+    Return the instant before which finished time entries belong to the archive,
+    or None when archiving is disabled (`TIME_ENTRY_ARCHIVE_HORIZON_DAYS` is not set).
+    """
+    if settings.TIME_ENTRY_ARCHIVE_HORIZON_DAYS is None:
+        return None
+    return timezone.now() - timedelta(days=settings.TIME_ENTRY_ARCHIVE_HORIZON_DAYS)
+
+
+def reaches_archive(end_time_lower_bound):
+    """
+    Check whether a read bounded below by `end_time_lower_bound` may need archived entries.
+
+    Archived entries all ended before the cutoff, so only windows without a lower bound,
+    or with one older than the cutoff, have to look at the archive.
+
+    :param end_time_lower_bound: Smallest `end_time` the read can return, or None if unbounded.
+    :type end_time_lower_bound: datetime | None
+    :rtype: bool
+    """
+    cutoff = get_archive_cutoff()
+    if cutoff is None:
+        return False
+    return end_time_lower_bound is None or end_time_lower_bound < cutoff
+
+
+def archive_time_entries_batch(cutoff, batch_size):
+    """
+    Move one batch of time entries which ended before `cutoff` into the archive.
+
+    A single statement deletes the batch from the live table, inserts it into the archive and
+    adds it to the per-day aggregates, so a batch is never half-moved. Rows locked by concurrent
+    writers are skipped and picked up by a later batch.
+
+    :return: Number of archived entries per owner id.
+    :rtype: dict[int, int]
+    """
+    qn = connection.ops.quote_name
+    live_table = qn(TimeEntry._meta.db_table)
+    archive_table = qn(ArchivedTimeEntry._meta.db_table)
+    aggregate_table = qn(TimeEntryDailyAggregate._meta.db_table)
+    sql = f"""
+        WITH batch AS (
+            SELECT id FROM {live_table}
+            WHERE end_time < %(cutoff)s
+            ORDER BY end_time
+            LIMIT %(batch_size)s
+            FOR UPDATE SKIP LOCKED
+        ), moved AS (
+            DELETE FROM {live_table} entry USING batch
+            WHERE entry.id = batch.id
+            RETURNING entry.id, entry.task_id, entry.owner_id, entry.start_time, entry.end_time, entry.created_at
+        ), archived AS (
+            INSERT INTO {archive_table} (id, task_id, owner_id, start_time, end_time, created_at)
+            SELECT id, task_id, owner_id, start_time, end_time, created_at FROM moved
+            RETURNING owner_id, task_id, start_time, end_time
+        ), aggregated AS (
+            INSERT INTO {aggregate_table} AS aggregate (owner_id, task_id, day, total_duration, entry_count)
+            SELECT owner_id, task_id, (end_time AT TIME ZONE %(time_zone)s)::date,
+                   sum(end_time - start_time), count(*)
+            FROM archived
+            GROUP BY 1, 2, 3
+            ON CONFLICT (owner_id, task_id, day) DO UPDATE
+            SET total_duration = aggregate.total_duration + EXCLUDED.total_duration,
+                entry_count = aggregate.entry_count + EXCLUDED.entry_count
+        )
+        SELECT owner_id, count(*) FROM archived GROUP BY owner_id
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, {
+            'cutoff': cutoff,
+            'batch_size': batch_size,
+            'time_zone': settings.TIME_ZONE,
+        })
+        return dict(cursor.fetchall())
@@ -0,0 +1,229 @@
+# Python imports
+import json
+import struct
+import sys
+from array import array
+# Django imports
+from django.conf import settings
+from django.db.models import BigIntegerField
+from django.db.models.functions import Cast, Extract, Floor
+# DRF imports
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+
+COLUMNAR_FORMAT = 'columnar'
+COLUMNAR_BINARY_FORMAT = 'columnar-binary'
+COLUMNAR_FORMATS = [COLUMNAR_FORMAT, COLUMNAR_BINARY_FORMAT]
+COLUMNAR_MEDIA_TYPE = 'application/vnd.timemate.columnar+json'
+COLUMNAR_BINARY_MEDIA_TYPE = 'application/vnd.timemate.columnar'
+# Integer columns of a frame: name, NumPy dtype, `array` type code of the same size.
+COLUMNAR_ARRAYS = [
+    ('start_time', '<i8', 'q'),
+    ('end_time', '<i8', 'q'),
+    ('duration', '<i8', 'q'),
+    ('task', '<i4', 'i'),
+]
+FRAME_MAGIC = b'TMCOLS01'
+# Magic, then the header length and the data length as little-endian uint32.
+FRAME_PREFIX = struct.Struct(f'<{len(FRAME_MAGIC)}sII')
+FRAME_ALIGNMENT = 8
+
+
+def epoch_seconds(expression):
+    # Whole seconds, computed by the database for the whole page at once.
+    return Cast(Floor(Extract(expression, 'epoch')), BigIntegerField())
+
+
+# Read with `values_list()`, in the order `build_columns` expects; no model instance is built per row.
+COLUMNAR_FIELDS = [
+    'task_id',
+    'task__name',
+    epoch_seconds('start_time'),
+    epoch_seconds('end_time'),
+    epoch_seconds('duration'),
+]
+
+
+def build_columns(rows, task_refs=None):
+    """
+    Transpose rows of `COLUMNAR_FIELDS` values into parallel arrays.
+
+    Tasks are replaced by small integer references into a dictionary of tasks: `task[i]` is the
+    position of the i-th entry's task in `tasks`. When a batch continues earlier ones (exports),
+    `task_refs` carries the references handed out so far, and only tasks new to this batch are
+    listed, appended to the dictionary of the previous batches.
+
+    :type rows: list[tuple]
+    :param task_refs: Task id -> reference, updated in place.
+    :type task_refs: dict | None
+    :rtype: dict
+    """
+    task_refs = {} if task_refs is None else task_refs
+    known = len(task_refs)
+    task_ids, task_names, starts, ends, durations = zip(*rows) if rows else ((),) * 5
+    refs = [task_refs.setdefault(task_id, len(task_refs)) for task_id in task_ids]
+    new_task_ids = list(task_refs)[known:]
+    names = dict(zip(task_ids, task_names)) if new_task_ids else {}
+    return {
+        'start_time': list(starts),
+        'end_time': list(ends),
+        'duration': list(durations),
+        'task': refs,
+        'tasks': {
+            'id': [str(task_id) for task_id in new_task_ids],
+            'name': [names[task_id] for task_id in new_task_ids],
+        },
+    }
+
+
+def pad(length):
+    return -length % FRAME_ALIGNMENT
+
+
+def encode_frame(columns, metadata=None):
+    """
+    Encode columns (see `build_columns`) as a binary frame.
+
+    A frame is `FRAME_MAGIC`, the lengths of the header and of the data, a JSON header, and the integer
+    columns as little-endian arrays, each starting at a multiple of 8 bytes. The header lists every column's
+    `dtype`, `offset` (from the start of the data) and `length`, next to `rows`, `tasks` and `metadata`, so a
+    column loads without copying, e.g. `numpy.frombuffer(data, dtype, length, offset)`.
+
+    :type columns: dict
+    :param metadata: Extra values for the header, e.g. pagination links.
+    :rtype: bytes
+    """
+    arrays = []
+    layout = []
+    offset = 0
+    for name, dtype, typecode in COLUMNAR_ARRAYS:
+        values = array(typecode, columns[name])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        data = values.tobytes()
+        layout.append({'name': name, 'dtype': dtype, 'offset': offset, 'length': len(values)})
+        arrays.append(data + bytes(pad(len(data))))
+        offset += len(arrays[-1])
+    header = json.dumps({
+        'rows': len(columns['task']), 'columns': layout, 'tasks': columns['tasks'], 'metadata': metadata or {},
+    }, separators=(',', ':')).encode()
+    header += b' ' * pad(FRAME_PREFIX.size + len(header))
+    return FRAME_PREFIX.pack(FRAME_MAGIC, len(header), offset) + header + b''.join(arrays)
+
+
+def decode_frame(content, position=0):
+    """
+    Decode the frame starting at `position` of `content`; the reverse of `encode_frame`.
+
+    :type content: bytes
+    :return: The columns, the frame's metadata and the position of the next frame.
+    :rtype: tuple[dict, dict, int]
+    """
+    magic, header_length, data_length = FRAME_PREFIX.unpack_from(content, position)
+    if magic != FRAME_MAGIC:
+        raise ValueError('Not a columnar frame.')
+    position += FRAME_PREFIX.size
+    header = json.loads(content[position:position + header_length])
+    data = memoryview(content)[position + header_length:position + header_length + data_length]
+    columns = {'tasks': header['tasks']}
+    for column, (name, _, typecode) in zip(header['columns'], COLUMNAR_ARRAYS):
+        values = array(typecode)
+        values.frombytes(data[column['offset']:column['offset'] + column['length'] * values.itemsize])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        columns[name] = values.tolist()
+    return columns, header['metadata'], position + header_length + data_length
+
+
+class ColumnarRenderer(JSONRenderer):
+    media_type = COLUMNAR_MEDIA_TYPE
+    format = COLUMNAR_FORMAT
+
+
+class ColumnarBinaryRenderer(BaseRenderer):
+    """
+    Render columns as one frame; of a paginated page (`results` holding the columns), with the pagination
+    in the frame's metadata.
+    """
+    media_type = COLUMNAR_BINARY_MEDIA_TYPE
+    format = COLUMNAR_BINARY_FORMAT
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if 'results' not in data:
+            return encode_frame(data)
+        return encode_frame(data['results'], {key: value for key, value in data.items() if key != 'results'})
+
+
+class ColumnarExportWriter:
+    """
+    Export writer (see `TimeEntry.exporting`) of columnar batches of `chunk_size` entries: one JSON object
+    per line or, in binary, one frame after the other. Each batch lists the tasks it adds to the dictionary.
+    """
+    fields = COLUMNAR_FIELDS
+
+    def __init__(self, binary=False, chunk_size=None):
+        self.binary = binary
+        self.chunk_size = chunk_size or settings.TIME_ENTRY_EXPORT_CHUNK_SIZE
+        self.content_type = COLUMNAR_BINARY_MEDIA_TYPE if binary else COLUMNAR_MEDIA_TYPE
+        self.extension = 'columnar' if binary else 'columnar.ndjson'
+        self.rows = []
+        self.task_refs = {}
+        self.batches = 0
+
+    def write(self, row):
+        self.rows.append(row)
+        return [self.flush()] if len(self.rows) == self.chunk_size else []
+
+    def close(self):
+        # An empty export still gets one (empty) batch.
+        return [self.flush()] if self.rows or not self.batches else []
+
+    def flush(self):
+        columns = build_columns(self.rows, self.task_refs)
+        self.rows = []
+        self.batches += 1
+        if self.binary:
+            return encode_frame(columns)
+        return json.dumps(columns, separators=(',', ':')) + '\n'
+
+
+class ColumnarResponseMixin:
+    """
+    Let `GET` requests of a view ask for columnar responses, with `format=columnar` (JSON) or
+    `format=columnar-binary` (see `encode_frame`), or the matching `Accept` header.
+
+    Lists are paginated as usual, with the columns of the page (see `build_columns`) as `results`, read with
+    `values_list()` instead of going through the view's serializer. Export views build a `ColumnarExportWriter`
+    with `get_columnar_writer()`. Errors are still answered in JSON.
+    """
+    columnar_renderer_classes = [ColumnarRenderer, ColumnarBinaryRenderer]
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.request.method == 'GET':
+            renderers += [renderer() for renderer in self.columnar_renderer_classes]
+        return renderers
+
+    def is_columnar(self):
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        return getattr(renderer, 'format', None) in COLUMNAR_FORMATS
+
+    def get_columnar_writer(self):
+        return ColumnarExportWriter(binary=self.request.accepted_renderer.format == COLUMNAR_BINARY_FORMAT)
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_columnar():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*COLUMNAR_FIELDS)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(build_columns(list(queryset)))
+        return self.get_paginated_response(build_columns(page))
+
+    def handle_exception(self, exc):
+        if self.is_columnar():
+            self.request.accepted_renderer = JSONRenderer()
+            self.request.accepted_media_type = JSONRenderer.media_type
+        return super().handle_exception(exc)
@@ -0,0 +1,244 @@
+# Python imports
+import gzip
+import hashlib
+import json
+import os
+import uuid
+from datetime import timedelta
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+# DRF imports
+from rest_framework import status
+from rest_framework.exceptions import APIException
+# Internal imports
+from .archive import reaches_archive
+from .exporting import CsvExportWriter, NdjsonExportWriter, iter_export
+from .filters import TimeEntryFilter
+from .models import TimeEntry, TimeEntryExport, TimeEntryWithArchive, get_export_storage
+
+# Export job error codes
+EXPORT_ERROR_CODE_NOT_READY = "export_not_ready"
+
+EXPORT_FORMAT_CSV = 'csv'
+EXPORT_FORMAT_NDJSON = 'ndjson'
+EXPORT_FORMATS = [EXPORT_FORMAT_CSV, EXPORT_FORMAT_NDJSON]
+# Query parameters of the streamed exports which are not list filters.
+EXPORT_ORDERING_PARAMETER = 'ordering'
+EXPORT_GROUP_BY_PARAMETER = 'group_by'
+EXPORT_GROUP_BY_CHOICES = ['day']
+
+
+class ExportNotReady(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The export has not completed. Poll it until its status is "completed".'
+    default_code = EXPORT_ERROR_CODE_NOT_READY
+
+
+def get_export_filter_parameters():
+    """
+    Return the query parameters `TimeEntryFilter` reads, e.g. `start_time_after` for the `start_time` range.
+
+    :rtype: list[str]
+    """
+    form = TimeEntryFilter({}, queryset=TimeEntry.objects.none()).form
+    return [
+        f'{name}_{suffix}' if suffix else name
+        for name, field in form.fields.items()
+        for suffix in getattr(field.widget, 'suffixes', [None])
+    ]
+
+
+def get_export_data_version_cache_key(owner_id):
+    return f'time_entry_export_data_version:{owner_id}'
+
+
+def get_export_data_version(owner_id):
+    """
+    Return a token identifying the current state of the owner's entries and tasks.
+
+    The token is dropped whenever their cached lists are invalidated (see `invalidate_user_list`), and a new
+    one is handed out on the next call, so exports requested before and after a change never share a
+    fingerprint. An evicted token only costs a reuse.
+
+    :rtype: str
+    """
+    return cache.get_or_set(
+        get_export_data_version_cache_key(owner_id), uuid.uuid4().hex, settings.TIME_ENTRY_EXPORT_TTL_HOURS * 3600
+    )
+
+
+def get_export_fingerprint(export_format, filters, data_version):
+    """
+    Identify an export by its format, filters (whatever the order they were given in) and the version of
+    the owner's data (see `get_export_data_version`).
+
+    :rtype: str
+    """
+    payload = json.dumps([export_format, filters, data_version], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_reusable_export(exports):
+    """
+    :param exports: Exports of one owner and fingerprint.
+    :return: The latest pending, running or unexpired completed export, or None.
+    :rtype: TimeEntryExport | None
+    """
+    reusable = Q(status__in=[TimeEntryExport.Status.PENDING, TimeEntryExport.Status.RUNNING]) | Q(
+        status=TimeEntryExport.Status.COMPLETED, expires_at__gt=timezone.now()
+    )
+    return exports.filter(reusable).order_by('-created_at').first()
+
+
+def request_export(owner, export_format, filters):
+    """
+    Return the owner's export of `filters` in `export_format`, enqueued unless one can be reused.
+
+    A pending or running export with the same fingerprint is reused, as is a completed one whose file
+    has not expired yet, as long as the owner's entries and tasks have not changed since it was requested.
+    Failed exports are not: requesting again retries them. Two concurrent requests enqueue one export,
+    thanks to the partial unique constraint on active exports.
+
+    :param filters: Validated query parameters (see `TimeEntryExportCreateSerializer`).
+    :type filters: dict
+    :return: The export and whether it was created.
+    :rtype: tuple[TimeEntryExport, bool]
+    """
+    database = router.db_for_write(TimeEntryExport, instance=owner)
+    fingerprint = get_export_fingerprint(export_format, filters, get_export_data_version(owner.pk))
+    exports = TimeEntryExport.objects.using(database).filter(owner=owner, fingerprint=fingerprint)
+    export = get_reusable_export(exports)
+    if export is not None:
+        return export, False
+    try:
+        with transaction.atomic(using=database):
+            export = exports.create(owner=owner, format=export_format, filters=filters, fingerprint=fingerprint)
+    except IntegrityError:
+        # Enqueued by a concurrent request since the lookup above, and possibly completed since.
+        export = get_reusable_export(exports)
+        if export is None:
+            # ... or even failed already: enqueue it again.
+            return request_export(owner, export_format, filters)
+        return export, False
+    return export, True
+
+
+def build_export_queryset(export):
+    """
+    Return the time entries of `export`, filtered and ordered as the streamed export endpoints do.
+
+    :type export: TimeEntryExport
+    :rtype: django.db.models.QuerySet
+    """
+    filters = export.filters
+    filterset = TimeEntryFilter(filters, queryset=TimeEntry.objects.none())
+    # Validated on creation already; fails the export should they no longer validate.
+    if not filterset.is_valid():
+        raise ValueError(f'Invalid filters: {filterset.errors.as_json()}')
+    model = TimeEntryWithArchive if reaches_archive(filterset.get_end_time_lower_bound()) else TimeEntry
+    queryset = model.objects.using(export._state.db).filter(owner_id=export.owner_id)
+    queryset = TimeEntryFilter(filters, queryset=queryset).qs
+    if filters.get(EXPORT_GROUP_BY_PARAMETER) == 'day':
+        return queryset.order_by('-end_time')
+    if filters.get(EXPORT_ORDERING_PARAMETER):
+        return queryset.order_by(*[term.strip() for term in filters[EXPORT_ORDERING_PARAMETER].split(',')])
+    return queryset
+
+
+def get_export_writer(export):
+    """
+    :rtype: CsvExportWriter | NdjsonExportWriter
+    """
+    if export.format == EXPORT_FORMAT_CSV:
+        return CsvExportWriter()
+    return NdjsonExportWriter(group_by_day=export.filters.get(EXPORT_GROUP_BY_PARAMETER) == 'day')
+
+
+def claim_export(database):
+    """
+    Mark the oldest pending export of `database` as running and return it, or None when there is none.
+
+    Exports locked by other workers are skipped, so any number of workers can poll the same database.
+    A running export without progress for `TIME_ENTRY_EXPORT_STALE_SECONDS` is claimed again: its worker
+    has crashed.
+
+    :rtype: TimeEntryExport | None
+    """
+    stale_before = timezone.now() - timedelta(seconds=settings.TIME_ENTRY_EXPORT_STALE_SECONDS)
+    with transaction.atomic(using=database):
+        export = (TimeEntryExport.objects.using(database).
+                  select_for_update(skip_locked=True).
+                  filter(Q(status=TimeEntryExport.Status.PENDING) |
+                         Q(status=TimeEntryExport.Status.RUNNING, updated_at__lt=stale_before)).
+                  order_by('created_at').
+                  first())
+        if export is None:
+            return None
+        export.status = TimeEntryExport.Status.RUNNING
+        export.rows_exported = 0
+        export.save(update_fields=['status', 'rows_exported', 'updated_at'])
+    return export
+
+
+def run_export(export):
+    """
+    Write the entries of a claimed export to a gzip-compressed file, reporting progress as it goes.
+
+    The file is written under a temporary name and renamed once complete, so a download never sees a
+    partial file. `rows_exported` (and the `updated_at` heartbeat) are updated every
+    `TIME_ENTRY_EXPORT_CHUNK_SIZE` rows. On error, the export is marked as failed with the error message.
+
+    :type export: TimeEntryExport
+    :rtype: TimeEntryExport
+    """
+    storage = get_export_storage()
+    exports = TimeEntryExport.objects.using(export._state.db).filter(pk=export.pk)
+    writer = get_export_writer(export)
+    name = f'{export.owner_id}/{export.id}.{writer.extension}.gz'
+    path = storage.path(name)
+    temporary_path = f'{path}.{uuid.uuid4().hex}.tmp'
+
+    def on_progress(rows):
+        exports.update(rows_exported=rows, updated_at=timezone.now())
+
+    try:
+        queryset = build_export_queryset(export)
+        export.rows_total = queryset.count()
+        exports.update(rows_total=export.rows_total, updated_at=timezone.now())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(temporary_path, 'wt', encoding='utf-8', newline='') as file:
+            for part in iter_export(queryset, writer, on_progress=on_progress):
+                file.write(part)
+        os.replace(temporary_path, path)
+    except Exception as error:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        now = timezone.now()
+        exports.update(status=TimeEntryExport.Status.FAILED, error=str(error), updated_at=now,
+                       completed_at=now, expires_at=now + timedelta(hours=settings.TIME_ENTRY_EXPORT_TTL_HOURS))
+        export.refresh_from_db()
+        raise
+
+    now = timezone.now()
+    exports.update(status=TimeEntryExport.Status.COMPLETED, file=name, updated_at=now, completed_at=now,
+                   expires_at=now + timedelta(hours=settings.TIME_ENTRY_EXPORT_TTL_HOURS))
+    export.refresh_from_db()
+    return export
+
+
+def delete_expired_exports(database):
+    """
+    Delete the exports of `database` expired by now, with their files.
+
+    :return: Number of deleted exports.
+    :rtype: int
+    """
+    expired = TimeEntryExport.objects.using(database).filter(expires_at__lte=timezone.now())
+    for export in expired.exclude(file='').only('file'):
+        export.file.delete(save=False)
+    count, _ = expired.delete()
+    return count
@@ -0,0 +1,10 @@
+# Django imports
+from django.urls import path
+# Internal imports
+from .views import TimeEntryExportJobDetailView, TimeEntryExportJobDownloadView, TimeEntryExportJobListCreateView
+
+urlpatterns = [
+    path('', TimeEntryExportJobListCreateView.as_view(), name='time_entry_export_list_create'),
+    path('<uuid:pk>/', TimeEntryExportJobDetailView.as_view(), name='time_entry_export_detail'),
+    path('<uuid:pk>/download/', TimeEntryExportJobDownloadView.as_view(), name='time_entry_export_download'),
+]
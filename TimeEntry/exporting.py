@@ -0,0 +1,154 @@
+# Python imports
+import csv
+import io
+import json
+from itertools import islice
+# Django imports
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+# Header of exported files, in column order.
+EXPORT_COLUMNS = ['id', 'task_id', 'task', 'start_time', 'end_time', 'duration_seconds']
+# Fields read with `values_list()`, one per column of `EXPORT_COLUMNS`; no model instance is built per row.
+EXPORT_FIELDS = ['id', 'task_id', 'task__name', 'start_time', 'end_time', 'duration']
+
+
+def format_datetime(value):
+    # Same ISO 8601 format as the API's (DRF's `DateTimeField`), with `Z` for UTC.
+    value = value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def format_export_row(row):
+    """
+    Convert a row of `EXPORT_FIELDS` values into the values of `EXPORT_COLUMNS`.
+
+    :type row: tuple
+    :rtype: list
+    """
+    entry_id, task_id, task_name, start_time, end_time, duration = row
+    return [str(entry_id), str(task_id), task_name, format_datetime(start_time), format_datetime(end_time),
+            duration.total_seconds()]
+
+
+class CsvExportWriter:
+    """
+    Format export rows as CSV (`EXPORT_COLUMNS` header, then one line per entry), handed out
+    `chunk_size` lines at a time.
+    """
+    content_type = 'text/csv'
+    extension = 'csv'
+    fields = EXPORT_FIELDS
+
+    def __init__(self, chunk_size=None):
+        self.chunk_size = chunk_size or settings.TIME_ENTRY_EXPORT_CHUNK_SIZE
+        self.rows = 0
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, row):
+        """
+        Add a row of `EXPORT_FIELDS` values; return the parts of the output ready to be sent.
+
+        :rtype: list[str]
+        """
+        self.writer.writerow(format_export_row(row))
+        self.rows += 1
+        return [self.flush()] if self.rows % self.chunk_size == 0 else []
+
+    def close(self):
+        """
+        Return the rest of the output.
+
+        :rtype: list[str]
+        """
+        return [self.flush()]
+
+    def flush(self):
+        content = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return content
+
+
+class NdjsonExportWriter:
+    """
+    Format export rows as NDJSON: one object with the `EXPORT_COLUMNS` keys per line or, grouped by day,
+    one `{"day": ..., "entries": [...]}` object per day of `end_time` (like `TimeEntryByDayListSerializer`).
+
+    Each line is handed out as soon as it is complete. Grouping expects the rows ordered by `end_time`.
+    """
+    content_type = 'application/x-ndjson'
+    extension = 'ndjson'
+    fields = EXPORT_FIELDS
+
+    def __init__(self, group_by_day=False):
+        self.group_by_day = group_by_day
+        self.day = None
+        self.entries = []
+
+    @staticmethod
+    def format_line(value):
+        return json.dumps(value, separators=(',', ':')) + '\n'
+
+    def write(self, row):
+        entry = dict(zip(EXPORT_COLUMNS, format_export_row(row)))
+        if not self.group_by_day:
+            return [self.format_line(entry)]
+        day = entry['end_time'][:10]
+        lines = self.close() if day != self.day else []
+        self.day = day
+        self.entries.append(entry)
+        return lines
+
+    def close(self):
+        lines = [self.format_line({'day': self.day, 'entries': self.entries})] if self.entries else []
+        self.entries = []
+        return lines
+
+
+def iter_export(queryset, writer, chunk_size=None, on_progress=None):
+    """
+    Yield the export of the time entries of `queryset`, in its order, formatted by `writer`
+    from rows of its `fields`.
+
+    Rows are fetched `chunk_size` at a time from a server-side cursor (unless disabled for a transaction-mode
+    pooler), so memory use does not depend on how many entries are exported.
+
+    :param queryset: Filtered and ordered time entries (live ones, or live and archived ones).
+    :type queryset: django.db.models.QuerySet
+    :type writer: CsvExportWriter | NdjsonExportWriter | TimeEntry.columnar.ColumnarExportWriter
+    :param chunk_size: Rows per fetch; `TIME_ENTRY_EXPORT_CHUNK_SIZE` by default.
+    :param on_progress: Called with the number of rows exported so far after each chunk, and at the end.
+    :rtype: Iterator[str]
+    """
+    chunk_size = chunk_size or settings.TIME_ENTRY_EXPORT_CHUNK_SIZE
+    exported = 0
+    for exported, row in enumerate(queryset.values_list(*writer.fields).iterator(chunk_size=chunk_size), start=1):
+        yield from writer.write(row)
+        if on_progress is not None and exported % chunk_size == 0:
+            on_progress(exported)
+    yield from writer.close()
+    if on_progress is not None:
+        on_progress(exported)
+
+
+async def aiter_export(queryset, writer, chunk_size=None):
+    """
+    Asynchronous version of `iter_export`, for responses served under ASGI.
+
+    Each chunk is fetched with one `sync_to_async` call, and every part is yielded as soon as the writer
+    completes it, for the server's event loop to send. While the client reads, no thread is held.
+
+    :rtype: AsyncIterator[str]
+    """
+    chunk_size = chunk_size or settings.TIME_ENTRY_EXPORT_CHUNK_SIZE
+    # As `aiterator()` does, but it would run the query of a `values_list()` queryset in the event loop.
+    rows = await sync_to_async(queryset.values_list(*writer.fields).iterator)(chunk_size=chunk_size)
+    while chunk := await sync_to_async(list)(islice(rows, chunk_size)):
+        for row in chunk:
+            for part in writer.write(row):
+                yield part
+    for part in writer.close():
+        yield part
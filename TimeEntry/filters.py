@@ -1,7 +1,105 @@
 # Django imports
 import django_filters
+from django import forms
+from django.conf import settings
+from django.contrib.postgres.fields.ranges import DateTimeTZRange
+from django_filters.fields import IsoDateTimeRangeField
+# Internal imports
+from .validators import VALIDATION_ERROR_CODE_INVALID_TIME_RANGE
+
+# Fields time entries can be sorted by (`ordering=`), in lists and exports.
+TIME_ENTRY_ORDERING_FIELDS = ['start_time', 'end_time', 'task__name', 'duration']
+
+
+class TimeWindowField(IsoDateTimeRangeField):
+    """
+    Datetime range whose bounds, when both are given, must not be inverted; Postgres refuses to build
+    such a range.
+    """
+
+    def compress(self, data_list):
+        value = super().compress(data_list)
+        if value and value.start is not None and value.stop is not None and value.start > value.stop:
+            raise forms.ValidationError(
+                f'Window end {value.stop} must not be before window start {value.start}.',
+                code=VALIDATION_ERROR_CODE_INVALID_TIME_RANGE,
+            )
+        return value
+
+
+class TimeWindowFilter(django_filters.IsoDateTimeFromToRangeFilter):
+    field_class = TimeWindowField
+
 
 class TimeEntryFilter(django_filters.FilterSet):
     start_time = django_filters.IsoDateTimeFromToRangeFilter()
     end_time  = django_filters.IsoDateTimeFromToRangeFilter()
-    task = django_filters.CharFilter(field_name='task__name', lookup_expr='icontains')
\ No newline at end of file
+    task = django_filters.CharFilter(field_name='task__name', lookup_expr='icontains')
+    # Entries whose `[start_time, end_time)` intersects the given window, including entries spanning it.
+    overlaps = TimeWindowFilter(field_name='time_range', method='filter_overlaps')
+
+    def filter_overlaps(self, queryset, name, value):
+        if not value or (value.start is None and value.stop is None):
+            return queryset
+        # A missing bound is treated as infinite, so `overlaps_after` alone means "still running after".
+        return queryset.filter(**{f'{name}__overlap': DateTimeTZRange(value.start, value.stop)})
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return queryset.filter(**self.get_partition_pruning_bounds())
+
+    def get_partition_pruning_bounds(self):
+        """
+        Translate filters on the other time column into bounds on the partition key.
+
+        Postgres only prunes partitions on predicates against the partition key itself. Since
+        `end_time > start_time` always holds, an upper bound on `end_time` (or on the `overlaps`
+        window) is also an upper bound on `start_time`, and a lower bound on `start_time` (or on
+        the window) is also a lower bound on `end_time`. The added predicates never change results.
+
+        :return: Extra lookups on the partition key; empty when partitioning is disabled.
+        :rtype: dict
+        """
+        data = self.form.cleaned_data
+        if settings.TIME_ENTRY_PARTITION_KEY == 'start_time':
+            stops = [value.stop for value in (data.get('end_time'), data.get('overlaps')) if value and value.stop]
+            return {'start_time__lt': min(stops)} if stops else {}
+        if settings.TIME_ENTRY_PARTITION_KEY == 'end_time':
+            starts = [value.start for value in (data.get('start_time'), data.get('overlaps')) if value and value.start]
+            return {'end_time__gt': max(starts)} if starts else {}
+        return {}
+
+    def get_end_time_lower_bound(self):
+        """
+        Return the smallest `end_time` an entry matching the filters can have, or None when unbounded.
+
+        Used to decide whether a list has to read the archive of old entries. Since `end_time > start_time`,
+        lower bounds on `start_time` and on the `overlaps` window bound `end_time` as well.
+        """
+        data = self.form.cleaned_data
+        starts = [
+            value.start for value in (data.get('start_time'), data.get('end_time'), data.get('overlaps'))
+            if value and value.start
+        ]
+        return max(starts) if starts else None
+
+
+class UUIDInFilter(django_filters.BaseInFilter, django_filters.UUIDFilter):
+    pass
+
+
+class TimeEntryBulkFilter(TimeEntryFilter):
+    """
+    `TimeEntryFilter` plus an explicit list of IDs (`ids=<uuid>,<uuid>`): selects the entries
+    `PATCH` and `DELETE /time-entries/bulk/` act on. All given filters must match.
+    """
+    ids = UUIDInFilter(field_name='id')
+
+    def has_filters(self):
+        """
+        Whether any filter was given, so that an empty query string never selects all of a user's entries.
+        """
+        return any(
+            value.start is not None or value.stop is not None if isinstance(value, slice) else value not in (None, '', [])
+            for value in self.form.cleaned_data.values()
+        )
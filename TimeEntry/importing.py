@@ -0,0 +1,184 @@
+# Python imports
+import csv
+import json
+from itertools import islice
+# Django imports
+from django.conf import settings
+from django.db import router, transaction
+# DRF imports
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.settings import api_settings
+# Internal imports
+from Task.models import Task
+from TimeMate.Signals.signals import invalidate_user_list
+from .models import TimeEntry, TimeEntryImport
+from .serializers import TimeEntryImportRowSerializer
+from .validators import find_overlapping_time_ranges, get_overlapping_time_entry_error
+
+# Import error codes
+IMPORT_ERROR_CODE_IMPORT_IN_PROGRESS = "import_in_progress"
+IMPORT_ERROR_CODE_INVALID_JSON = "invalid_json"
+
+IMPORT_FORMAT_CSV = 'csv'
+IMPORT_FORMAT_NDJSON = 'ndjson'
+IMPORT_FORMATS = [IMPORT_FORMAT_CSV, IMPORT_FORMAT_NDJSON]
+# Rejected rows reported in detail; later ones are only counted, so a bad file cannot exhaust memory.
+MAX_REPORTED_ERRORS = 100
+# Task name -> id map kept across batches; cleared when full, so memory use does not grow with the input.
+TASK_NAME_CACHE_SIZE = 10000
+
+
+class ImportInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Another import of this source is running. Retry once it has finished to resume it.'
+    default_code = IMPORT_ERROR_CODE_IMPORT_IN_PROGRESS
+
+
+def iter_import_rows(lines, import_format):
+    """
+    Parse lines of CSV (with a `task,start_time,end_time` header) or NDJSON into rows, lazily.
+
+    Lines which are not valid JSON are yielded as a `ValidationError`, so they count as rejected rows
+    and row numbers stay aligned with the input. Blank NDJSON lines are skipped.
+
+    :param lines: Text lines, e.g. an open file or a decoded request stream.
+    :type lines: Iterable[str]
+    :param import_format: One of `IMPORT_FORMATS`.
+    :rtype: Iterator[dict | ValidationError]
+    """
+    if import_format == IMPORT_FORMAT_CSV:
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ['Invalid JSON.']}, code=IMPORT_ERROR_CODE_INVALID_JSON)
+
+
+def start_import(owner, source):
+    """
+    Return the owner's import of `source`, created on first use; its checkpoint tells where to resume.
+
+    :rtype: TimeEntryImport
+    """
+    database = router.db_for_write(TimeEntryImport, instance=owner)
+    time_entry_import, _ = TimeEntryImport.objects.using(database).get_or_create(owner=owner, source=source)
+    return time_entry_import
+
+
+def get_or_create_task_ids(owner, names, database):
+    """
+    Return `{name: task id}` of the owner's tasks with the given names, creating the missing ones.
+
+    One query when all tasks exist, three otherwise. Tasks created concurrently under the same name
+    are picked up instead of failing on the unique constraint.
+
+    :type names: set[str]
+    :rtype: dict[str, UUID]
+    """
+    tasks = Task.objects.using(database).filter(owner=owner)
+    task_ids = dict(tasks.filter(name__in=names).values_list('name', 'id'))
+    missing = names - task_ids.keys()
+    if missing:
+        Task.objects.using(database).bulk_create(
+            [Task(owner=owner, name=name) for name in sorted(missing)], ignore_conflicts=True
+        )
+        task_ids.update(tasks.filter(name__in=missing).values_list('name', 'id'))
+    return task_ids
+
+
+def run_import(time_entry_import, rows, batch_size=None, on_batch=None):
+    """
+    Import time entries of the import's owner from `rows`, resuming after its checkpoint.
+
+    The first `rows_processed` rows, committed by an earlier run of the same import, are skipped. Then, per
+    batch of `batch_size` rows: the rows are validated, their tasks are resolved by name (and created if
+    missing) with one to three queries, and a single transaction inserts the valid entries with `bulk_create`
+    and advances the checkpoint. Invalid rows are counted and skipped, not inserted. Rows are read lazily,
+    so memory use does not depend on the size of the input. The owner's cached lists are invalidated once.
+
+    :param time_entry_import: Import returned by `start_import`; updated with the progress.
+    :type time_entry_import: TimeEntryImport
+    :param rows: Rows as yielded by `iter_import_rows`, from the start of the input.
+    :type rows: Iterable[dict | ValidationError]
+    :param batch_size: Rows per transaction; `TIME_ENTRY_IMPORT_BATCH_SIZE` by default.
+    :param on_batch: Called with the import after each committed batch.
+    :return: `(row number, errors)` of rejected rows, the first `MAX_REPORTED_ERRORS` of this run.
+    :rtype: list[tuple[int, dict | list]]
+    :raises ImportInProgress: If another run of the same import advanced the checkpoint meanwhile.
+    """
+    batch_size = batch_size or settings.TIME_ENTRY_IMPORT_BATCH_SIZE
+    owner = time_entry_import.owner
+    database = time_entry_import._state.db
+    row_number = time_entry_import.rows_processed
+    rows = islice(rows, row_number, None)
+    # Bound once and reused for every row; instantiating a serializer per row would dominate the import.
+    row_serializer = TimeEntryImportRowSerializer()
+    task_ids = {}
+    errors = []
+    imported_before = time_entry_import.rows_imported
+
+    try:
+        while batch := list(islice(rows, batch_size)):
+            batch_start = row_number
+            valid_rows = []
+            rejected_rows = []
+            for row in batch:
+                row_number += 1
+                try:
+                    if isinstance(row, ValidationError):
+                        raise row
+                    valid_rows.append((row_number, row_serializer.run_validation(row)))
+                except ValidationError as error:
+                    rejected_rows.append((row_number, error.detail))
+
+            if settings.TIME_ENTRY_REJECT_OVERLAPS and valid_rows:
+                time_ranges = [(attrs['start_time'], attrs['end_time']) for _, attrs in valid_rows]
+                overlapping = find_overlapping_time_ranges(owner, time_ranges, database)
+                rejected_rows += [
+                    (number, {api_settings.NON_FIELD_ERRORS_KEY: get_overlapping_time_entry_error(*time_ranges[index]).detail})
+                    for index, (number, _) in enumerate(valid_rows) if index in overlapping
+                ]
+                valid_rows = [valid_row for index, valid_row in enumerate(valid_rows) if index not in overlapping]
+
+            with transaction.atomic(using=database):
+                checkpoint = TimeEntryImport.objects.using(database).select_for_update().get(pk=time_entry_import.pk)
+                if checkpoint.rows_processed != batch_start:
+                    raise ImportInProgress()
+
+                names = {attrs['task'] for _, attrs in valid_rows}
+                if len(task_ids) + len(names - task_ids.keys()) > TASK_NAME_CACHE_SIZE:
+                    task_ids.clear()
+                if names - task_ids.keys():
+                    task_ids.update(get_or_create_task_ids(owner, names - task_ids.keys(), database))
+                TimeEntry.objects.using(database).bulk_create([
+                    TimeEntry(
+                        owner=owner,
+                        task_id=task_ids[attrs['task']],
+                        start_time=attrs['start_time'],
+                        end_time=attrs['end_time'],
+                    )
+                    for _, attrs in valid_rows
+                ])
+
+                checkpoint.rows_processed = row_number
+                checkpoint.rows_imported += len(valid_rows)
+                checkpoint.rows_failed += len(rejected_rows)
+                checkpoint.save(update_fields=['rows_processed', 'rows_imported', 'rows_failed', 'updated_at'])
+
+            time_entry_import.rows_processed = checkpoint.rows_processed
+            time_entry_import.rows_imported = checkpoint.rows_imported
+            time_entry_import.rows_failed = checkpoint.rows_failed
+            time_entry_import.updated_at = checkpoint.updated_at
+            errors += sorted(rejected_rows)[:MAX_REPORTED_ERRORS - len(errors)]
+            if on_batch is not None:
+                on_batch(time_entry_import)
+    finally:
+        # `bulk_create` sends no `post_save`; committed batches must not be hidden by cached lists.
+        if time_entry_import.rows_imported > imported_before:
+            invalidate_user_list(owner.pk)
+    return errors
@@ -0,0 +1,347 @@
+# Python imports
+import json
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, IntegrityError, router, transaction
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+# DRF imports
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.settings import api_settings
+# Internal imports
+from Task.models import Task
+from Task.validators import (
+    cache_task_owner,
+    forget_task_owners,
+    get_task_invalid_owner_error,
+    get_task_not_found_error,
+    get_task_owner_cache_key,
+)
+from TimeMate.Signals.signals import invalidate_user_list
+from TimeMate.Utils.mixins import get_violated_constraint
+from TimeMate.Utils.sharding import ShardMoveInProgress
+from .models import TimeEntry
+from .serializers import TIME_ENTRY_TASK_FOREIGN_KEY, TimeEntryIngestSerializer
+from .validators import find_overlapping_time_ranges, get_overlapping_time_entry_error
+
+# Ingestion error codes
+INGEST_ERROR_CODE_BACKLOG_FULL = "ingest_backlog_full"
+
+INGEST_CONSUMER_GROUP = 'time_entry_ingest_workers'
+# Seconds producers are asked to wait (`Retry-After`) when the backlog is full.
+INGEST_RETRY_AFTER_SECONDS = 5
+
+
+class IngestionBacklogFull(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many time entries are waiting to be ingested. Retry later.'
+    default_code = INGEST_ERROR_CODE_BACKLOG_FULL
+    # Sent as `Retry-After` by DRF's exception handler.
+    wait = INGEST_RETRY_AFTER_SECONDS
+
+
+@dataclass
+class IngestionResult:
+    """
+    Outcome of `process_messages` for one batch.
+
+    :param inserted: Entries inserted, not counting those already inserted by an earlier, unacknowledged delivery.
+    :param dead_lettered: Messages moved to the dead-letter stream.
+    :param errors: Database errors of groups left pending, to be retried once claimable.
+    """
+    inserted: int = 0
+    dead_lettered: int = 0
+    errors: list = field(default_factory=list)
+
+
+def get_dead_letter_stream():
+    return f'{settings.TIME_ENTRY_INGEST_STREAM}:dead'
+
+
+def get_ingest_redis():
+    return get_redis_connection('default')
+
+
+def enqueue_time_entries(owner_id, entries):
+    """
+    Append entries of a user to the ingestion stream, without touching the database.
+
+    The backlog limit is checked before appending, so concurrent producers may overshoot it by a request.
+
+    :param owner_id: ID of the user owning the entries.
+    :param entries: Validated data of `TimeEntryIngestSerializer`.
+    :type entries: list[dict]
+    :return: IDs the entries will have once inserted.
+    :rtype: list[UUID]
+    :raises IngestionBacklogFull: If the backlog would exceed `TIME_ENTRY_INGEST_MAX_BACKLOG`.
+    """
+    redis = get_ingest_redis()
+    if redis.xlen(settings.TIME_ENTRY_INGEST_STREAM) + len(entries) > settings.TIME_ENTRY_INGEST_MAX_BACKLOG:
+        raise IngestionBacklogFull()
+
+    ids = [uuid.uuid4() for _ in entries]
+    with redis.pipeline(transaction=False) as pipeline:
+        for entry_id, entry in zip(ids, entries):
+            pipeline.xadd(settings.TIME_ENTRY_INGEST_STREAM, {
+                'id': str(entry_id),
+                'owner_id': owner_id,
+                'task': str(entry['task']),
+                'start_time': entry['start_time'].isoformat(),
+                'end_time': entry['end_time'].isoformat(),
+            })
+        pipeline.execute()
+    return ids
+
+
+def ensure_consumer_group(redis):
+    try:
+        redis.xgroup_create(settings.TIME_ENTRY_INGEST_STREAM, INGEST_CONSUMER_GROUP, id='0', mkstream=True)
+    except ResponseError as error:
+        if 'BUSYGROUP' not in str(error):
+            raise
+
+
+def read_messages(redis, consumer, count, block_ms):
+    """
+    Return up to `count` messages for `consumer`: first those abandoned by other workers for
+    `TIME_ENTRY_INGEST_CLAIM_IDLE_SECONDS`, then new ones, waiting up to `block_ms` for them.
+
+    Abandoned messages already delivered `TIME_ENTRY_INGEST_MAX_DELIVERIES` times are dead-lettered instead,
+    so a message which keeps failing cannot block the queue.
+
+    :rtype: list[tuple[bytes, dict[bytes, bytes]]]
+    """
+    stream = settings.TIME_ENTRY_INGEST_STREAM
+    idle_ms = settings.TIME_ENTRY_INGEST_CLAIM_IDLE_SECONDS * 1000
+    exhausted = [
+        pending['message_id']
+        for pending in redis.xpending_range(stream, INGEST_CONSUMER_GROUP, '-', '+', count, idle=idle_ms)
+        if pending['times_delivered'] >= settings.TIME_ENTRY_INGEST_MAX_DELIVERIES
+    ]
+    if exhausted:
+        dead_letter(redis, [
+            (message_id, decode_fields(raw_fields), 'Not inserted after the maximum number of deliveries.')
+            for message_id in exhausted
+            for _, raw_fields in redis.xrange(stream, message_id, message_id)
+        ])
+        acknowledge(redis, exhausted)
+
+    # Entries deleted while pending come back without fields.
+    claimed = [message for message in redis.xautoclaim(stream, INGEST_CONSUMER_GROUP, consumer, idle_ms,
+                                                       count=count)[1] if message[1]]
+    if claimed:
+        return claimed
+    # `BLOCK 0` would wait forever; no `BLOCK` returns at once.
+    response = redis.xreadgroup(INGEST_CONSUMER_GROUP, consumer, {stream: '>'}, count=count, block=block_ms or None)
+    return response[0][1] if response else []
+
+
+def decode_fields(raw_fields):
+    return {key.decode(): value.decode() for key, value in raw_fields.items()}
+
+
+def dead_letter(redis, rejected):
+    """
+    Keep rejected messages, with the reason, in the dead-letter stream for inspection.
+
+    :param rejected: `(message id, fields, error)` of the messages.
+    """
+    if not rejected:
+        return
+    with redis.pipeline(transaction=False) as pipeline:
+        for message_id, fields, error in rejected:
+            pipeline.xadd(get_dead_letter_stream(), {
+                **fields,
+                'message_id': message_id,
+                # Validation errors as JSON (`ErrorDetail` is a `str`), anything else as its message.
+                'error': json.dumps(error) if isinstance(error, (dict, list)) else str(error),
+            })
+        pipeline.execute()
+
+
+def acknowledge(redis, message_ids):
+    # Deleted as well, so the stream's length is the backlog.
+    redis.xack(settings.TIME_ENTRY_INGEST_STREAM, INGEST_CONSUMER_GROUP, *message_ids)
+    redis.xdel(settings.TIME_ENTRY_INGEST_STREAM, *message_ids)
+
+
+def get_task_owners(task_ids, database):
+    """
+    Return `{task id: owner id}` of the existing tasks, from the task owner cache and at most one query.
+    """
+    cached = cache.get_many([get_task_owner_cache_key(task_id) for task_id in task_ids])
+    task_owners = {
+        task_id: cached[get_task_owner_cache_key(task_id)]
+        for task_id in task_ids if get_task_owner_cache_key(task_id) in cached
+    }
+    missing = task_ids - task_owners.keys()
+    if missing:
+        for task_id, owner_id in Task.objects.using(database).filter(id__in=missing).values_list('id', 'owner_id'):
+            cache_task_owner(task_id, owner_id)
+            task_owners[task_id] = owner_id
+    return task_owners
+
+
+def check_messages(messages_per_owner, task_owners, database):
+    """
+    Split messages of one database into accepted and rejected ones: their tasks must exist and belong to
+    their owners (see `get_task_owners`) and, when enabled, their entries must not overlap others of the owner.
+
+    :param messages_per_owner: `{owner id: [(message id, fields, entry)]}`.
+    :return: Accepted messages per owner, like `messages_per_owner`, and `(message id, fields, error)`
+        of the rejected ones.
+    :rtype: tuple[dict, list]
+    """
+    accepted = {}
+    rejected = []
+    for owner_id, owner_messages in messages_per_owner.items():
+        owned = []
+        for message_id, fields, entry in owner_messages:
+            if entry.task_id not in task_owners:
+                rejected.append((message_id, fields, {'task': get_task_not_found_error().detail}))
+            elif task_owners[entry.task_id] != owner_id:
+                rejected.append((message_id, fields, {'task': get_task_invalid_owner_error().detail}))
+            else:
+                owned.append((message_id, fields, entry))
+        if settings.TIME_ENTRY_REJECT_OVERLAPS and owned:
+            time_ranges = [(entry.start_time, entry.end_time) for _, _, entry in owned]
+            # A redelivered message may have been inserted already; its own row is not an overlap.
+            overlapping = find_overlapping_time_ranges(
+                owner_id, time_ranges, database, exclude_ids=[entry.id for _, _, entry in owned]
+            )
+            rejected += [
+                (message_id, fields,
+                 {api_settings.NON_FIELD_ERRORS_KEY: get_overlapping_time_entry_error(*time_ranges[index]).detail})
+                for index, (message_id, fields, _) in enumerate(owned) if index in overlapping
+            ]
+            owned = [message for index, message in enumerate(owned) if index not in overlapping]
+        accepted[owner_id] = owned
+    return accepted, rejected
+
+
+def insert_time_entries(accepted, database):
+    """
+    Insert the entries of accepted messages (see `check_messages`) with one `bulk_create` in a transaction,
+    except those already inserted by an earlier delivery which was not acknowledged in time.
+
+    :return: Number of entries inserted.
+    :rtype: int
+    """
+    entries = [entry for owned in accepted.values() for _, _, entry in owned]
+    with transaction.atomic(using=database):
+        ids = [entry.id for entry in entries]
+        inserted_before = set(TimeEntry.objects.using(database).filter(id__in=ids).values_list('id', flat=True))
+        entries = [entry for entry in entries if entry.id not in inserted_before]
+        # Conflicts are entries inserted meanwhile by a worker which took over the same messages.
+        TimeEntry.objects.using(database).bulk_create(entries, ignore_conflicts=True)
+    return len(entries)
+
+
+def process_messages(redis, messages):
+    """
+    Insert a batch of messages read from the ingestion stream.
+
+    Messages are validated again, including what the producer could not check without queries: task
+    ownership (one lookup per database) and, when enabled, overlaps (one query per owner). Rejected messages
+    go to the dead-letter stream. Valid entries are inserted with one `bulk_create` per database, ignoring
+    entries already inserted by an earlier delivery, and each owner's cached lists are invalidated once.
+    When the insert fails on the foreign key of a task deleted behind its cached owner, the batch's tasks are
+    checked again in the database and the entries of the remaining tasks inserted. Handled messages are
+    acknowledged; those of a database which failed stay pending and are retried.
+
+    :rtype: IngestionResult
+    """
+    result = IngestionResult()
+    row_serializer = TimeEntryIngestSerializer()
+    rejected = []
+    # database -> owner id -> [(message id, fields, entry)]
+    pending = defaultdict(lambda: defaultdict(list))
+
+    for message_id, raw_fields in messages:
+        fields = decode_fields(raw_fields)
+        try:
+            attrs = row_serializer.run_validation(fields)
+            entry = TimeEntry(
+                id=uuid.UUID(fields['id']),
+                owner_id=int(fields['owner_id']),
+                task_id=attrs['task'],
+                start_time=attrs['start_time'],
+                end_time=attrs['end_time'],
+            )
+        except (ValidationError, KeyError, ValueError) as error:
+            rejected.append((message_id, fields, getattr(error, 'detail', error)))
+            continue
+        try:
+            database = router.db_for_write(TimeEntry, instance=entry)
+        except ShardMoveInProgress:
+            # Left pending; retried once the owner's move has finished.
+            continue
+        pending[database][entry.owner_id].append((message_id, fields, entry))
+
+    handled = []
+    for database, messages_per_owner in pending.items():
+        task_ids = {entry.task_id for owner_messages in messages_per_owner.values() for _, _, entry in owner_messages}
+        accepted, database_rejected = check_messages(messages_per_owner, get_task_owners(task_ids, database), database)
+        try:
+            try:
+                inserted = insert_time_entries(accepted, database)
+            except IntegrityError as error:
+                if get_violated_constraint(error) != TIME_ENTRY_TASK_FOREIGN_KEY:
+                    raise
+                # A task was deleted behind its cached owner: without checking the tasks in the database,
+                # every delivery of the batch would fail the same way.
+                forget_task_owners(task_ids)
+                accepted, database_rejected = check_messages(
+                    messages_per_owner, get_task_owners(task_ids, database), database
+                )
+                inserted = insert_time_entries(accepted, database)
+        except DatabaseError as error:
+            # Left pending and retried; rejections of this database are final all the same.
+            rejected += database_rejected
+            result.errors.append(error)
+            continue
+        rejected += database_rejected
+        result.inserted += inserted
+        handled += [message_id for owned in accepted.values() for message_id, _, _ in owned]
+        for owner_id, owned in accepted.items():
+            if owned:
+                invalidate_user_list(owner_id)
+
+    dead_letter(redis, rejected)
+    result.dead_lettered = len(rejected)
+    handled += [message_id for message_id, _, _ in rejected]
+    if handled:
+        acknowledge(redis, handled)
+    return result
+
+
+def get_ingestion_lag():
+    """
+    Return the state of the ingestion queue: its backlog, the age of its oldest entry and its dead letters.
+
+    :rtype: dict
+    """
+    redis = get_ingest_redis()
+    stream = settings.TIME_ENTRY_INGEST_STREAM
+    try:
+        pending = redis.xpending(stream, INGEST_CONSUMER_GROUP)['pending']
+    except ResponseError:
+        # No worker has created the consumer group yet.
+        pending = 0
+    oldest = redis.xrange(stream, count=1)
+    # Stream IDs start with the millisecond timestamp of the append.
+    oldest_age = time.time() - int(oldest[0][0].split(b'-')[0]) / 1000 if oldest else 0
+    return {
+        'enabled': settings.TIME_ENTRY_INGEST_ENABLED,
+        'backlog': redis.xlen(stream),
+        'max_backlog': settings.TIME_ENTRY_INGEST_MAX_BACKLOG,
+        'pending': pending,
+        'oldest_age_seconds': round(max(oldest_age, 0), 3),
+        'dead_letters': redis.xlen(get_dead_letter_stream()),
+    }
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:10
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Replace the Python-computed `duration` column with a Postgres stored generated column.
+
+    Django cannot alter a regular field into a GeneratedField, so the column (and its index) is
+    dropped and re-added. Postgres computes `end_time - start_time` for every existing row while
+    adding a stored generated column, which takes care of the backfill.
+    """
+
+    dependencies = [
+        ('TimeEntry', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='timeentry',
+            name='TimeEntry_t_duratio_379a7b_idx',
+        ),
+        migrations.RemoveField(
+            model_name='timeentry',
+            name='duration',
+        ),
+        migrations.AddField(
+            model_name='timeentry',
+            name='duration',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('end_time'), '-', models.F('start_time')), output_field=models.DurationField()),
+        ),
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['duration'], name='TimeEntry_t_duratio_379a7b_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:16
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Task', '0001_initial'),
+        ('TimeEntry', '0002_timeentry_generated_duration'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeentry',
+            name='time_range',
+            field=models.GeneratedField(db_persist=True, expression=models.Func(models.F('start_time'), django.db.models.functions.comparison.Greatest(models.F('end_time'), models.F('start_time')), function='TSTZRANGE', output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()), output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+        ),
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['time_range'], name='time_entry_time_range_gist'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:02
+
+from django.conf import settings
+from django.db import migrations
+
+from TimeEntry.partitioning import get_partition_key, get_partition_key_setting, rebuild_table
+
+
+def partition_time_entries(apps, schema_editor):
+    """
+    Rebuild the table as a monthly range-partitioned table when `TIME_ENTRY_PARTITION_KEY` is set.
+    """
+    partition_key = get_partition_key_setting()
+    if partition_key is None:
+        return
+    TimeEntry = apps.get_model('TimeEntry', 'TimeEntry')
+    rebuild_table(
+        TimeEntry,
+        partition_key=partition_key,
+        months_ahead=settings.TIME_ENTRY_PARTITION_MONTHS_AHEAD,
+        connection=schema_editor.connection,
+    )
+
+
+def unpartition_time_entries(apps, schema_editor):
+    TimeEntry = apps.get_model('TimeEntry', 'TimeEntry')
+    if get_partition_key(TimeEntry._meta.db_table, schema_editor.connection) is None:
+        return
+    rebuild_table(TimeEntry, connection=schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """
+    Optional declarative range partitioning of the time entries table by month.
+
+    Partitioning is decided when the migration is applied. To switch an existing database,
+    migrate back to `0003_timeentry_time_range`, change `TIME_ENTRY_PARTITION_KEY` and migrate again.
+    """
+
+    dependencies = [
+        ('TimeEntry', '0003_timeentry_time_range'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_time_entries, unpartition_time_entries),
+    ]
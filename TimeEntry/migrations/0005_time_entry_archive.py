@@ -0,0 +1,78 @@
+# Generated by Django 5.1.6 on 2026-10-19 08:39
+
+import django.contrib.postgres.fields.ranges
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+TIME_ENTRY_WITH_ARCHIVE_VIEW_SQL = """
+    CREATE VIEW "TimeEntry_timeentry_with_archive" AS
+    SELECT id, task_id, owner_id, start_time, end_time, duration, time_range, created_at
+    FROM "TimeEntry_timeentry"
+    UNION ALL
+    SELECT id, task_id, owner_id, start_time, end_time,
+           end_time - start_time, tstzrange(start_time, end_time), created_at
+    FROM "TimeEntry_archivedtimeentry"
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Task', '0001_initial'),
+        ('TimeEntry', '0004_timeentry_partitioning'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeEntryWithArchive',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('duration', models.DurationField()),
+                ('time_range', django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'TimeEntry_timeentry_with_archive',
+                'ordering': ['-end_time'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTimeEntry',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('created_at', models.DateTimeField()),
+                ('owner', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_time_entries', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_time_entries', to='Task.task')),
+            ],
+            options={
+                'verbose_name_plural': 'Archived time entries',
+                'indexes': [models.Index(fields=['owner', 'end_time'], name='TimeEntry_a_owner_i_6c441a_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TimeEntryDailyAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('total_duration', models.DurationField()),
+                ('entry_count', models.PositiveIntegerField()),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_entry_daily_aggregates', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_entry_daily_aggregates', to='Task.task')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'task', 'day'), name='unique_daily_aggregate_per_owner_task')],
+            },
+        ),
+        migrations.RunSQL(
+            TIME_ENTRY_WITH_ARCHIVE_VIEW_SQL,
+            'DROP VIEW "TimeEntry_timeentry_with_archive"',
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:05
+
+from django.db import migrations
+
+# Columns can only be appended by `CREATE OR REPLACE VIEW`.
+TIME_ENTRY_WITH_ARCHIVE_VIEW_SQL = """
+    CREATE OR REPLACE VIEW "TimeEntry_timeentry_with_archive" AS
+    SELECT id, task_id, owner_id, start_time, end_time, duration, time_range, created_at, FALSE AS archived
+    FROM "TimeEntry_timeentry"
+    UNION ALL
+    SELECT id, task_id, owner_id, start_time, end_time,
+           end_time - start_time, tstzrange(start_time, end_time), created_at, TRUE
+    FROM "TimeEntry_archivedtimeentry"
+"""
+
+PREVIOUS_TIME_ENTRY_WITH_ARCHIVE_VIEW_SQL = """
+    DROP VIEW "TimeEntry_timeentry_with_archive";
+    CREATE VIEW "TimeEntry_timeentry_with_archive" AS
+    SELECT id, task_id, owner_id, start_time, end_time, duration, time_range, created_at
+    FROM "TimeEntry_timeentry"
+    UNION ALL
+    SELECT id, task_id, owner_id, start_time, end_time,
+           end_time - start_time, tstzrange(start_time, end_time), created_at
+    FROM "TimeEntry_archivedtimeentry"
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('TimeEntry', '0007_time_entry_export'),
+    ]
+
+    operations = [
+        migrations.RunSQL(TIME_ENTRY_WITH_ARCHIVE_VIEW_SQL, PREVIOUS_TIME_ENTRY_WITH_ARCHIVE_VIEW_SQL),
+    ]
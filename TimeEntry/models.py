@@ -1,8 +1,14 @@
 # Python imports
+import os
 import uuid
 # Django imports
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GistIndex
 # Internal imports
 from Task.models import Task
 
@@ -15,7 +21,22 @@ class TimeEntry(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='time_entries')
     start_time = models.DateTimeField()
     end_time = models.DateTimeField()
-    duration = models.DurationField(editable=False)
+    duration = models.GeneratedField(
+        expression=models.F('end_time') - models.F('start_time'),
+        output_field=models.DurationField(),
+        db_persist=True,
+    )
+    # `[start_time, end_time)` as a `tstzrange`, so window and overlap queries can use a single GiST index.
+    # `GREATEST` keeps the expression valid for inverted ranges, leaving their rejection to `end_time_gt_start_time`.
+    time_range = models.GeneratedField(
+        expression=models.Func(
+            models.F('start_time'), Greatest(models.F('end_time'), models.F('start_time')),
+            function='TSTZRANGE',
+            output_field=DateTimeRangeField(),
+        ),
+        output_field=DateTimeRangeField(),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -35,14 +56,179 @@ class TimeEntry(models.Model):
             models.Index(fields=['start_time']),
             models.Index(fields=['end_time']),
             models.Index(fields=['duration']),
+            GistIndex(fields=['time_range'], name='time_entry_time_range_gist'),
         ]
 
         ordering = ['-end_time']
 
     def save(self, *args, **kwargs):
-        # Calculate the duration by subtracting start_time from end_time
-        self.duration = self.end_time - self.start_time
+        # `duration` is computed by the database; Postgres returns it on INSERT but not on UPDATE,
+        # so mirror the expression in memory to keep the saved instance in sync without a refresh query.
         super().save(*args, **kwargs)
+        self.duration = self.end_time - self.start_time
+
+    def __str__(self):
+        return f"TimeEntry for {self.task.name} ({self.start_time} - {self.end_time})"
+
+
+class ArchivedTimeEntry(models.Model):
+    """
+    Compact cold storage for time entries older than `TIME_ENTRY_ARCHIVE_HORIZON_DAYS`.
+
+    Only raw columns are kept; `duration` and `time_range` are derived on read, and a single
+    `(owner, end_time)` index replaces the set of indexes of the live table.
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='archived_time_entries')
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_time_entries', db_index=False)
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Archived time entries"
+        indexes = [
+            models.Index(fields=['owner', 'end_time']),
+        ]
+
+    def __str__(self):
+        return f"ArchivedTimeEntry {self.id} ({self.start_time} - {self.end_time})"
+
+
+class TimeEntryDailyAggregate(models.Model):
+    """
+    Per owner, task and day (of `end_time`) totals of archived time entries.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='time_entry_daily_aggregates')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='time_entry_daily_aggregates')
+    day = models.DateField()
+    total_duration = models.DurationField()
+    entry_count = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'task', 'day'], name='unique_daily_aggregate_per_owner_task'),
+        ]
+        ordering = ['-day']
+
+    def __str__(self):
+        return f"{self.day}: {self.total_duration} ({self.entry_count} entries)"
+
+
+class TimeEntryWithArchive(models.Model):
+    """
+    Read-only view over live and archived time entries (`UNION ALL`), used by list endpoints
+    when the requested window reaches past the archive horizon.
+    """
+    id = models.UUIDField(primary_key=True)
+    task = models.ForeignKey(
+        Task, on_delete=models.DO_NOTHING, db_constraint=False, related_name='time_entries_with_archive'
+    )
+    owner = models.ForeignKey(User, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    duration = models.DurationField()
+    time_range = DateTimeRangeField()
+    created_at = models.DateTimeField()
+    # Archived entries are read-only and have no detail endpoint.
+    archived = models.BooleanField()
+
+    class Meta:
+        managed = False
+        db_table = 'TimeEntry_timeentry_with_archive'
+        ordering = ['-end_time']
 
     def __str__(self):
         return f"TimeEntry for {self.task.name} ({self.start_time} - {self.end_time})"
+
+
+class TimeEntryImport(models.Model):
+    """
+    Progress checkpoint of a streamed import of time entries (see `TimeEntry.importing`).
+
+    `rows_processed` is advanced in the same transaction as each inserted batch, so an interrupted
+    import of the same `source` resumes right after the last committed row.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='time_entry_imports')
+    # Name the client or the command gives the input, e.g. the imported file's name.
+    source = models.CharField(max_length=255)
+    rows_processed = models.PositiveBigIntegerField(default=0)
+    rows_imported = models.PositiveBigIntegerField(default=0)
+    rows_failed = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'source'], name='unique_time_entry_import_source_per_owner'),
+        ]
+
+    def __str__(self):
+        return f"TimeEntryImport {self.source} ({self.rows_processed} rows processed)"
+
+
+class TimeEntryExportStorage(FileSystemStorage):
+    """
+    Local storage of export files, below `TIME_ENTRY_EXPORT_ROOT`; read on every use, so it can be overridden.
+    """
+    @property
+    def base_location(self):
+        return settings.TIME_ENTRY_EXPORT_ROOT
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+
+def get_export_storage():
+    # A callable keeps the storage's location out of migrations.
+    return TimeEntryExportStorage()
+
+
+class TimeEntryExport(models.Model):
+    """
+    Background export of time entries (see `TimeEntry.export_jobs`), written by `run_export_jobs` to a
+    gzip-compressed file kept until `expires_at`.
+
+    `fingerprint` identifies the format, the filters and the version of the owner's data, so an identical
+    request reuses a pending, running or unexpired completed export instead of starting another one.
+    """
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        RUNNING = 'running'
+        COMPLETED = 'completed'
+        FAILED = 'failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='time_entry_exports')
+    format = models.CharField(max_length=10)
+    # Query parameters of the streamed export endpoints: list filters, `ordering` and `group_by`.
+    filters = models.JSONField(default=dict)
+    fingerprint = models.CharField(max_length=64)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    rows_total = models.PositiveBigIntegerField(null=True)
+    rows_exported = models.PositiveBigIntegerField(default=0)
+    file = models.FileField(storage=get_export_storage, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Also the worker's heartbeat: advanced with the progress, so exports of a crashed worker are resumed.
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True)
+    expires_at = models.DateTimeField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['owner', 'fingerprint'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='unique_active_time_entry_export_per_owner',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"TimeEntryExport {self.format} ({self.status})"
@@ -0,0 +1,243 @@
+# Python imports
+from datetime import datetime, timezone as dt_timezone
+# Django imports
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection as default_connection
+
+PARTITION_KEYS = ('start_time', 'end_time')
+
+
+def get_partition_key_setting():
+    """
+    Return the configured partition key (`start_time` / `end_time`) or None when partitioning is disabled.
+
+    :raises ImproperlyConfigured: If `TIME_ENTRY_PARTITION_KEY` holds an unsupported value.
+    """
+    key = settings.TIME_ENTRY_PARTITION_KEY or None
+    if key is not None and key not in PARTITION_KEYS:
+        raise ImproperlyConfigured(
+            f"TIME_ENTRY_PARTITION_KEY must be one of {PARTITION_KEYS} or empty, got: {key}"
+        )
+    return key
+
+
+def month_start(value):
+    """
+    Return the first instant (UTC) of the month containing `value`.
+    """
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value, months):
+    """
+    Shift a month start by the given number of months.
+    """
+    month_index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=month_index // 12, month=month_index % 12 + 1)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y_%m}'
+
+
+def default_partition_name(table):
+    return f'{table}_default'
+
+
+def get_partition_key(table, connection=default_connection):
+    """
+    Return the column the table is range-partitioned by, or None for a regular table.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT a.attname
+            FROM pg_partitioned_table pt
+            JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+            WHERE pt.partrelid = to_regclass(%s)
+            """,
+            [connection.ops.quote_name(table)]
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def get_existing_partitions(table, connection=default_connection):
+    """
+    Return names of all partitions attached to the table.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [connection.ops.quote_name(table)]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def rebuild_table(model, partition_key=None, months_ahead=0, connection=default_connection):
+    """
+    Rebuild the model's table either as a monthly range-partitioned table or as a regular table.
+
+    The current table is renamed, a new table with the same columns, constraints and indexes is
+    created under the original name, rows are copied over and the old table is dropped. Views
+    reading from the table are recreated on top of the new one.
+
+    The primary key of a partitioned table must contain the partition key, so it becomes
+    `(id, <partition_key>)`; Django keeps treating `id` as the primary key.
+
+    :param model: Model whose table is rebuilt (a historical model inside migrations).
+    :param partition_key: `start_time`, `end_time` or None to rebuild as a regular table.
+    :param months_ahead: Number of future monthly partitions created beyond the current month.
+    """
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    old_table = f'{table}_old'
+    pk_name = f'{table}_pkey'
+    columns = get_insertable_columns(table, connection)
+
+    with connection.cursor() as cursor:
+        # Definitions still reference the original table name, which the rebuilt table takes over.
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s",
+            [table]
+        )
+        indexes = [(name, definition) for name, definition in cursor.fetchall() if name != pk_name]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype IN ('c', 'f')",
+            [qn(table)]
+        )
+        constraints = cursor.fetchall()
+        # Views (e.g. the live + archive view) are bound to the old table; drop and recreate them around the rebuild.
+        cursor.execute(
+            """
+            SELECT DISTINCT r.ev_class::regclass::text, pg_get_viewdef(r.ev_class)
+            FROM pg_depend d
+            JOIN pg_rewrite r ON r.oid = d.objid
+            WHERE d.classid = 'pg_rewrite'::regclass AND d.refobjid = to_regclass(%s) AND r.ev_class <> d.refobjid
+            """,
+            [qn(table)]
+        )
+        views = cursor.fetchall()
+        for view, _ in views:
+            cursor.execute(f'DROP VIEW {view}')
+
+        # Partitions of a partitioned source keep their names; move them aside for the new partitions.
+        for partition in get_existing_partitions(table, connection):
+            cursor.execute(f'ALTER TABLE {qn(partition)} RENAME TO {qn(partition + "_old")}')
+        cursor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old_table)}')
+        cursor.execute(f'ALTER TABLE {qn(old_table)} RENAME CONSTRAINT {qn(pk_name)} TO {qn(old_table + "_pkey")}')
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {qn(name)}')
+
+        partition_clause = f' PARTITION BY RANGE ({qn(partition_key)})' if partition_key else ''
+        cursor.execute(
+            f'CREATE TABLE {qn(table)} (LIKE {qn(old_table)} INCLUDING DEFAULTS INCLUDING GENERATED)'
+            f'{partition_clause}'
+        )
+        pk_columns = f'{qn("id")}, {qn(partition_key)}' if partition_key else qn('id')
+        cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(pk_name)} PRIMARY KEY ({pk_columns})')
+        for name, definition in constraints:
+            cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}')
+        for _, definition in indexes:
+            cursor.execute(definition)
+
+        if partition_key:
+            cursor.execute(f'SELECT min({qn(partition_key)}) FROM {qn(old_table)}')
+            oldest = cursor.fetchone()[0]
+            now = datetime.now(dt_timezone.utc)
+            create_month_partitions(
+                table,
+                month_start(oldest or now),
+                add_months(month_start(now), months_ahead),
+                connection=connection,
+            )
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {qn(default_partition_name(table))} PARTITION OF {qn(table)} DEFAULT'
+            )
+
+        cursor.execute(f'INSERT INTO {qn(table)} ({columns}) SELECT {columns} FROM {qn(old_table)}')
+        cursor.execute(f'DROP TABLE {qn(old_table)}')
+        for view, definition in views:
+            cursor.execute(f'CREATE VIEW {view} AS {definition}')
+
+
+def get_oldest_default_partition_row(table, connection=default_connection):
+    """
+    Return the smallest partition key value stored in the default partition, or None when it is empty.
+    """
+    qn = connection.ops.quote_name
+    default_partition = default_partition_name(table)
+    if default_partition not in get_existing_partitions(table, connection):
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT min({qn(get_partition_key(table, connection))}) FROM {qn(default_partition)}')
+        return cursor.fetchone()[0]
+
+
+def get_insertable_columns(table, connection=default_connection):
+    """
+    Return quoted, comma-separated names of the table's non-generated columns.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT attname FROM pg_attribute
+            WHERE attrelid = to_regclass(%s) AND attnum > 0 AND NOT attisdropped AND attgenerated = ''
+            ORDER BY attnum
+            """,
+            [connection.ops.quote_name(table)]
+        )
+        return ', '.join(connection.ops.quote_name(row[0]) for row in cursor.fetchall())
+
+
+def create_month_partitions(table, first_month, last_month, connection=default_connection):
+    """
+    Create monthly partitions for every month between `first_month` and `last_month` (inclusive).
+
+    Existing partitions are skipped. Rows which already landed in the default partition for a
+    new month are moved into it, because Postgres refuses to create a partition for a range
+    still present in the default one.
+
+    :return: Names of the created partitions.
+    :rtype: list[str]
+    """
+    qn = connection.ops.quote_name
+    partition_key = qn(get_partition_key(table, connection))
+    existing = get_existing_partitions(table, connection)
+    default_partition = default_partition_name(table)
+    has_default = default_partition in existing
+    columns = get_insertable_columns(table, connection)
+    created = []
+
+    month = first_month
+    with connection.cursor() as cursor:
+        while month <= last_month:
+            next_month = add_months(month, 1)
+            name = partition_name(table, month)
+            if name not in existing:
+                # DDL cannot take bound parameters; the bounds are formatted from datetimes, never from user input.
+                bounds = f"FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+                moved = qn(f'{name}_moved')
+                if has_default:
+                    cursor.execute(f'CREATE TEMPORARY TABLE {moved} AS SELECT {columns} FROM {qn(table)} WITH NO DATA')
+                    cursor.execute(
+                        f'WITH moved_rows AS (DELETE FROM {qn(default_partition)} '
+                        f'WHERE {partition_key} >= %s AND {partition_key} < %s RETURNING {columns}) '
+                        f'INSERT INTO {moved} SELECT * FROM moved_rows',
+                        [month, next_month]
+                    )
+                cursor.execute(f'CREATE TABLE {qn(name)} PARTITION OF {qn(table)} FOR VALUES {bounds}')
+                if has_default:
+                    cursor.execute(f'INSERT INTO {qn(table)} ({columns}) SELECT * FROM {moved}')
+                    cursor.execute(f'DROP TABLE {moved}')
+                created.append(name)
+            month = next_month
+    return created
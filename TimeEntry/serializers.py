@@ -1,26 +1,84 @@
 # Python imports
 from collections import OrderedDict
+# Django imports
+from django.conf import settings
+from django.db import router
+from django.urls import reverse
 # DRF imports
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 # Internal imports
-from .models import TimeEntry
+from .export_jobs import (
+    EXPORT_FORMAT_NDJSON,
+    EXPORT_FORMATS,
+    EXPORT_GROUP_BY_CHOICES,
+    EXPORT_GROUP_BY_PARAMETER,
+    EXPORT_ORDERING_PARAMETER,
+    get_export_filter_parameters,
+)
+from .filters import TIME_ENTRY_ORDERING_FIELDS, TimeEntryFilter
+from .models import TimeEntry, TimeEntryExport, TimeEntryImport
 from Task.models import Task
-from Task.serializers import TaskListSerializer
-from TimeMate.Utils.mixins import OwnerRepresentationMixin
-from .validators import validate_start_and_end_time
-from Task.validators import validate_task_ownership
+from Task.serializers import OwnedTaskField, TaskListSerializer
+from Task.validators import get_deleted_task_error, prefetch_owned_tasks
+from TimeMate.Utils.mixins import (
+    ConstraintViolationMixin,
+    OwnerRepresentationMixin,
+    get_foreign_key_constraint_name,
+    translate_constraint_violations,
+)
+from .validators import (
+    find_overlapping_time_ranges,
+    get_invalid_time_range_error,
+    get_overlapping_time_entry_error,
+    validate_no_overlapping_time_entries,
+    validate_start_and_end_time,
+    validate_timer_start,
+)
+
+
+TIME_ENTRY_TASK_FOREIGN_KEY = get_foreign_key_constraint_name(TimeEntry, 'task')
+
+
+class TimeEntryUrlField(serializers.HyperlinkedIdentityField):
+    """
+    Link to the entry's detail endpoint, or None for archived entries (read through `TimeEntryWithArchive`),
+    which have none.
+    """
+    # Flag of archived rows, on models which have it; read by the projection and the compiled serializers.
+    archived_field = 'archived'
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('view_name', 'time_entry_detail')
+        kwargs.setdefault('allow_null', True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if getattr(value, self.archived_field, False):
+            return None
+        return super().to_representation(value)
 
 
 class TimeEntryBaseSerializer(serializers.ModelSerializer):
-    detail_url = serializers.HyperlinkedIdentityField(read_only=True, view_name='time_entry_detail')
+    # `duration` is a database-generated column, which DRF does not map to a serializer field on its own.
+    duration = serializers.DurationField(read_only=True)
+    detail_url = TimeEntryUrlField()
 
     class Meta:
         model = TimeEntry
         fields = ['id', 'start_time', 'end_time', 'duration', 'detail_url']
 
 
-class TimeEntryCreateSerializer(OwnerRepresentationMixin, serializers.ModelSerializer):
+class TimeEntryCreateSerializer(ConstraintViolationMixin, OwnerRepresentationMixin, serializers.ModelSerializer):
     owner = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    task = OwnedTaskField()
+    constraint_errors = {
+        'end_time_gt_start_time': api_settings.NON_FIELD_ERRORS_KEY,
+        # A task resolved from a cached owner (see `get_cached_owned_task`) may have been deleted since.
+        TIME_ENTRY_TASK_FOREIGN_KEY: 'task',
+    }
+    # Disabled where overlaps are checked for many entries at once (see `TimeEntryBulkCreateListSerializer`).
+    check_overlaps_per_entry = True
 
     class Meta:
         model = TimeEntry
@@ -35,10 +93,214 @@ class TimeEntryCreateSerializer(OwnerRepresentationMixin, serializers.ModelSeria
         # Calling custom validator
         if start_time and end_time:
             validate_start_and_end_time(start_time, end_time)
+            if settings.TIME_ENTRY_REJECT_OVERLAPS and self.check_overlaps_per_entry:
+                validate_no_overlapping_time_entries(data['owner'], start_time, end_time)
+        return data
+
+    def get_constraint_error(self, constraint, validated_data):
+        if constraint == TIME_ENTRY_TASK_FOREIGN_KEY:
+            return get_deleted_task_error([validated_data['task'].pk])
+        return get_invalid_time_range_error(validated_data['start_time'], validated_data['end_time'])
+
+
+class TimeEntryBulkCreateListSerializer(serializers.ListSerializer):
+    """
+    Validate and create a batch of time entries of the request user.
+
+    The tasks of all items are resolved before the items are validated (see `prefetch_owned_tasks`),
+    overlaps are checked with one query for the whole batch, and the entries are inserted with one
+    `bulk_create` in a transaction. A single invalid item rejects the batch; errors are listed per item,
+    in request order, with `{}` for valid items, except for a task deleted behind its cached owner, which
+    is only found by the insert and reported under `task` for the whole batch.
+    """
+
+    def to_internal_value(self, data):
+        request = self.context['request']
+        # Oversized batches are rejected by `super()` without resolving anything.
+        if isinstance(data, list) and (self.max_length is None or len(data) <= self.max_length):
+            task_values = [item.get('task') for item in data if isinstance(item, dict)]
+            prefetch_owned_tasks(task_values, request.user, request)
+        validated_data = super().to_internal_value(data)
+
+        if settings.TIME_ENTRY_REJECT_OVERLAPS:
+            time_ranges = [(attrs['start_time'], attrs['end_time']) for attrs in validated_data]
+            overlapping = find_overlapping_time_ranges(request.user, time_ranges)
+            if overlapping:
+                raise serializers.ValidationError([
+                    {api_settings.NON_FIELD_ERRORS_KEY: get_overlapping_time_entry_error(*time_ranges[index]).detail}
+                    if index in overlapping else {}
+                    for index in range(len(time_ranges))
+                ])
+        return validated_data
+
+    def create(self, validated_data):
+        time_entries = [TimeEntry(**attrs) for attrs in validated_data]
+        database = router.db_for_write(TimeEntry, instance=time_entries[0])
+        task_ids = {time_entry.task_id for time_entry in time_entries}
+        # `bulk_create` sends no `post_save`; the caller invalidates the owner's cached lists once.
+        with translate_constraint_violations(
+            database, {TIME_ENTRY_TASK_FOREIGN_KEY: 'task'}, lambda constraint: get_deleted_task_error(task_ids)
+        ):
+            return TimeEntry.objects.using(database).bulk_create(time_entries)
+
+
+class TimeEntryBulkCreateSerializer(TimeEntryCreateSerializer):
+    # `duration` is returned by Postgres on INSERT, also for `bulk_create`.
+    duration = serializers.DurationField(read_only=True)
+    check_overlaps_per_entry = False
+
+    class Meta(TimeEntryCreateSerializer.Meta):
+        fields = ['id', 'owner', 'task', 'start_time', 'end_time', 'duration']
+        list_serializer_class = TimeEntryBulkCreateListSerializer
+
+
+class TimeEntryBulkUpdateSerializer(serializers.Serializer):
+    """
+    Changes `PATCH /time-entries/bulk/` applies to every matched entry with one `UPDATE`.
+
+    Only the task can be changed for many entries at once; setting their times to the same values would not make sense.
+    """
+    task = OwnedTaskField()
+
+    def update_time_entries(self, time_entries, database):
+        """
+        Apply the validated changes to `time_entries` with one `UPDATE` on `database`.
+
+        :return: Number of updated entries.
+        :rtype: int
+        :raises serializers.ValidationError: The task was deleted behind its cached owner (`task_not_found`).
+        """
+        task_ids = [self.validated_data['task'].pk]
+        with translate_constraint_violations(
+            database, {TIME_ENTRY_TASK_FOREIGN_KEY: 'task'}, lambda constraint: get_deleted_task_error(task_ids)
+        ):
+            return time_entries.using(database).update(**self.validated_data)
+
+
+class TimeEntryBulkResultSerializerForSchema(serializers.Serializer):
+    count = serializers.IntegerField(help_text="Number of matched entries, updated or deleted unless `dry_run`.")
+    dry_run = serializers.BooleanField()
+
+
+class TimeEntryImportRowSerializer(serializers.Serializer):
+    """
+    One row of a streamed import (see `TimeEntry.importing`); the task is given by name and created if missing.
+    """
+    task = serializers.CharField(min_length=2, max_length=Task._meta.get_field('name').max_length)
+    start_time = serializers.DateTimeField()
+    end_time = serializers.DateTimeField()
+
+    def validate(self, data):
+        validate_start_and_end_time(data['start_time'], data['end_time'])
+        return data
+
+
+class TimeEntryImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TimeEntryImport
+        fields = ['id', 'source', 'rows_processed', 'rows_imported', 'rows_failed', 'created_at', 'updated_at']
+
+
+class TimeEntryExportSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField(help_text="Where to get the file once the export has completed.")
+
+    class Meta:
+        model = TimeEntryExport
+        fields = ['id', 'format', 'filters', 'status', 'rows_total', 'rows_exported', 'error', 'download_url',
+                  'created_at', 'completed_at', 'expires_at']
+
+    def get_download_url(self, obj) -> str | None:
+        if obj.status != TimeEntryExport.Status.COMPLETED:
+            return None
+        return self.context['request'].build_absolute_uri(reverse('time_entry_export_download', args=[obj.pk]))
+
+
+class TimeEntryExportCreateSerializer(serializers.Serializer):
+    """
+    Input of a background export (see `TimeEntry.export_jobs`).
+
+    `filters` takes the query parameters of the streamed export endpoints: the list filters, `ordering`
+    and, for NDJSON, `group_by`. Unlike there, unknown parameters and ordering fields are rejected, so
+    that a typo cannot silently export every entry.
+    """
+    format = serializers.ChoiceField(choices=EXPORT_FORMATS)
+    filters = serializers.DictField(child=serializers.CharField(), default=dict)
+
+    def validate_filters(self, value):
+        allowed = {*get_export_filter_parameters(), EXPORT_ORDERING_PARAMETER, EXPORT_GROUP_BY_PARAMETER}
+        unknown = sorted(set(value) - allowed)
+        if unknown:
+            raise serializers.ValidationError(f'Unknown filters: {", ".join(unknown)}.')
+        filterset = TimeEntryFilter(value, queryset=TimeEntry.objects.none())
+        if not filterset.is_valid():
+            raise serializers.ValidationError(filterset.errors)
+        if EXPORT_ORDERING_PARAMETER in value:
+            terms = [term.strip() for term in value[EXPORT_ORDERING_PARAMETER].split(',')]
+            if any(term.removeprefix('-') not in TIME_ENTRY_ORDERING_FIELDS for term in terms):
+                raise serializers.ValidationError(
+                    {EXPORT_ORDERING_PARAMETER: [f'Must be a list of: {", ".join(TIME_ENTRY_ORDERING_FIELDS)}.']}
+                )
+        if value.get(EXPORT_GROUP_BY_PARAMETER, EXPORT_GROUP_BY_CHOICES[0]) not in EXPORT_GROUP_BY_CHOICES:
+            raise serializers.ValidationError(
+                {EXPORT_GROUP_BY_PARAMETER: [f'Must be one of: {", ".join(EXPORT_GROUP_BY_CHOICES)}.']}
+            )
+        return value
+
+    def validate(self, data):
+        if EXPORT_GROUP_BY_PARAMETER in data['filters'] and data['format'] != EXPORT_FORMAT_NDJSON:
+            raise serializers.ValidationError(
+                {'filters': {EXPORT_GROUP_BY_PARAMETER: ['Only NDJSON exports can be grouped.']}}
+            )
         return data
 
-    def validate_task(self, value):
-        return validate_task_ownership(value, self.context['request'].user)
+
+class TimeEntryIngestSerializer(serializers.Serializer):
+    """
+    Shape of an entry sent to the write-behind ingestion queue (see `TimeEntry.ingestion`).
+
+    Validated without any query; task ownership and overlaps are checked by the worker inserting the entry.
+    """
+    task = serializers.UUIDField()
+    start_time = serializers.DateTimeField()
+    end_time = serializers.DateTimeField()
+
+    def validate(self, data):
+        validate_start_and_end_time(data['start_time'], data['end_time'])
+        return data
+
+
+class TimeEntryIngestResultSerializerForSchema(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), help_text="IDs the entries get once inserted.")
+
+
+class TimeEntryIngestLagSerializerForSchema(serializers.Serializer):
+    enabled = serializers.BooleanField()
+    backlog = serializers.IntegerField(help_text="Entries waiting in the stream, including those being inserted.")
+    max_backlog = serializers.IntegerField()
+    pending = serializers.IntegerField(help_text="Entries taken by a worker but not inserted yet.")
+    oldest_age_seconds = serializers.FloatField(help_text="Age of the oldest waiting entry.")
+    dead_letters = serializers.IntegerField(help_text="Entries rejected by workers, kept in the dead-letter stream.")
+
+
+class TimerSerializer(serializers.Serializer):
+    """
+    Running timer of a user (see `TimeEntry.timers`), kept in Redis until it is stopped.
+    """
+    task = serializers.UUIDField()
+    started_at = serializers.DateTimeField()
+    elapsed = serializers.DurationField()
+
+
+class TimerStartSerializer(serializers.Serializer):
+    """
+    Input of starting or changing a timer; `started_at` defaults to now on start.
+    """
+    task = OwnedTaskField()
+    started_at = serializers.DateTimeField(required=False, validators=[validate_timer_start])
+
+
+class TimerStopSerializer(serializers.Serializer):
+    end_time = serializers.DateTimeField(required=False, help_text="End of the saved time entry; now by default.")
 
 
 class TimeEntryListSerializer(TimeEntryBaseSerializer):
@@ -50,13 +312,22 @@ class TimeEntryListSerializer(TimeEntryBaseSerializer):
 
 class TimeEntryDetailSerializer(OwnerRepresentationMixin, serializers.ModelSerializer):
     task = TaskListSerializer(read_only=True)
+    duration = serializers.DurationField(read_only=True)
 
     class Meta(TimeEntryBaseSerializer.Meta):
         fields = ['id', 'task', 'start_time', 'end_time', 'duration', 'owner', 'created_at']
 
 
-class TimeEntryUpdateSerializer(serializers.ModelSerializer):
+class TimeEntryUpdateSerializer(ConstraintViolationMixin, serializers.ModelSerializer):
     owner = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    task = OwnedTaskField()
+    constraint_errors = {
+        # Also catches a partial update moving one bound past the stored other one.
+        'end_time_gt_start_time': api_settings.NON_FIELD_ERRORS_KEY,
+        # A task resolved from a cached owner (see `get_cached_owned_task`) may have been deleted since.
+        TIME_ENTRY_TASK_FOREIGN_KEY: 'task',
+    }
+    duration = serializers.DurationField(read_only=True)
 
     class Meta:
         model = TimeEntry
@@ -70,16 +341,38 @@ class TimeEntryUpdateSerializer(serializers.ModelSerializer):
         # Calling custom validator
         if start_time and end_time:
             validate_start_and_end_time(start_time, end_time)
+        if settings.TIME_ENTRY_REJECT_OVERLAPS and self.instance:
+            # Partial updates may change only one bound, so fall back to the stored value for the other.
+            start_time = start_time or self.instance.start_time
+            end_time = end_time or self.instance.end_time
+            validate_start_and_end_time(start_time, end_time)
+            validate_no_overlapping_time_entries(
+                self.instance.owner_id, start_time, end_time, exclude_pk=self.instance.pk
+            )
         return data
 
-    def validate_task(self, value):
-        return validate_task_ownership(value, self.context['request'].user)
+    def get_constraint_error(self, constraint, validated_data):
+        if constraint == TIME_ENTRY_TASK_FOREIGN_KEY:
+            return get_deleted_task_error([validated_data['task'].pk])
+        # `update()` has already applied the new values, so the instance holds the rejected range.
+        return get_invalid_time_range_error(self.instance.start_time, self.instance.end_time)
+
+
+class TaskTimeEntriesListSerializer(serializers.ListSerializer):
+    """
+    A task's entries: those prefetched into `prefetched_time_entries` when the view set it up (live entries
+    only, or live and archived ones), otherwise the task's live entries.
+    """
+
+    def get_attribute(self, instance):
+        prefetched = getattr(instance, 'prefetched_time_entries', None)
+        return prefetched if prefetched is not None else super().get_attribute(instance)
 
 
 class TaskWithTimeEntriesSerializer(serializers.ModelSerializer):
-    entries = TimeEntryBaseSerializer(
+    entries = TaskTimeEntriesListSerializer(
+        child=TimeEntryBaseSerializer(),
         source='time_entries',
-        many=True,
         read_only=True
     )
     detail_url = serializers.HyperlinkedIdentityField(
@@ -3,12 +3,24 @@ from drf_spectacular.extensions import OpenApiFilterExtension
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiTypes
 # Internal imports
 from .serializers import (
+    TimeEntryBulkCreateSerializer,
+    TimeEntryBulkResultSerializerForSchema,
+    TimeEntryBulkUpdateSerializer,
+    TimeEntryExportCreateSerializer,
+    TimeEntryExportSerializer,
+    TimeEntryImportSerializer,
+    TimeEntryIngestLagSerializerForSchema,
+    TimeEntryIngestResultSerializerForSchema,
+    TimeEntryIngestSerializer,
     TimeEntryCreateSerializer,
     TimeEntryListSerializer,
     TimeEntryDetailSerializer,
     TimeEntryUpdateSerializer,
     TaskWithTimeEntriesSerializer,
-    GroupedTimeEntriesSerializerForSchema
+    GroupedTimeEntriesSerializerForSchema,
+    TimerSerializer,
+    TimerStartSerializer,
+    TimerStopSerializer,
 )
 
 # Filter extension for TimeEntryFilter
@@ -42,6 +54,18 @@ TIME_ENTRY_FILTER_PARAMS = [
         required=False,
         type=OpenApiTypes.DATETIME,
     ),
+    OpenApiParameter(
+        name="overlaps_after",
+        description="Include entries still running after this ISO8601 timestamp (window start)",
+        required=False,
+        type=OpenApiTypes.DATETIME,
+    ),
+    OpenApiParameter(
+        name="overlaps_before",
+        description="Include entries started before this ISO8601 timestamp (window end)",
+        required=False,
+        type=OpenApiTypes.DATETIME,
+    ),
     OpenApiParameter(
         name="task",
         description="Filter by task name (case-insensitive substring)",
@@ -60,13 +84,31 @@ TIME_ENTRY_ORDERING_PARAM = OpenApiParameter(
     type=OpenApiTypes.STR,
 )
 
+TIME_ENTRY_BULK_FILTER_PARAMS = TIME_ENTRY_FILTER_PARAMS + [
+    OpenApiParameter(
+        name="ids",
+        description="Comma-separated IDs of the entries to include",
+        required=False,
+        type=OpenApiTypes.STR,
+    ),
+    OpenApiParameter(
+        name="dry_run",
+        description="Only count the matched entries, without changing them",
+        required=False,
+        type=OpenApiTypes.BOOL,
+    ),
+]
+
 # Schemas
 TIME_ENTRY_LIST_CREATE_SCHEMA = extend_schema_view(
     get=extend_schema(
         summary="List all time entries",
         description=(
             "Returns a paginated list of TimeEntry objects belonging to the current user.\n"
-            "Supports filtering by start/end times and task name."
+            "Supports filtering by start/end times and task name.\n"
+            "With `format=columnar`, `results` holds parallel arrays instead: `start_time`, `end_time` (epoch "
+            "seconds), `duration` (seconds) and `task` (index into `tasks`, a dictionary of the page's task `id`s "
+            "and `name`s). `format=columnar-binary` sends the same columns as little-endian integer arrays."
         ),
         parameters=TIME_ENTRY_FILTER_PARAMS + [TIME_ENTRY_ORDERING_PARAM],
         responses={200: TimeEntryListSerializer(many=True)},
@@ -82,6 +124,191 @@ TIME_ENTRY_LIST_CREATE_SCHEMA = extend_schema_view(
     ),
 )
 
+TIME_ENTRY_BULK_SCHEMA = extend_schema_view(
+    post=extend_schema(
+        summary="Create many time entries",
+        description=(
+            "Creates a list of TimeEntry objects for the current user in one transaction, up to "
+            "`TIME_ENTRY_BULK_MAX_SIZE` per request.\n"
+            "If any entry is invalid, nothing is created and HTTP 400 returns one error object per entry, "
+            "in request order (`{}` for valid entries)."
+        ),
+        request=TimeEntryBulkCreateSerializer(many=True),
+        responses={201: TimeEntryBulkCreateSerializer(many=True)},
+    ),
+    patch=extend_schema(
+        summary="Update many time entries",
+        description=(
+            "Moves all time entries of the current user matching the filters (at least one is required) "
+            "to another task with a single update, and returns how many were matched."
+        ),
+        parameters=TIME_ENTRY_BULK_FILTER_PARAMS,
+        request=TimeEntryBulkUpdateSerializer,
+        responses={200: TimeEntryBulkResultSerializerForSchema},
+    ),
+    delete=extend_schema(
+        summary="Delete many time entries",
+        description=(
+            "Deletes all time entries of the current user matching the filters (at least one is required) "
+            "and returns how many were matched."
+        ),
+        parameters=TIME_ENTRY_BULK_FILTER_PARAMS,
+        responses={200: TimeEntryBulkResultSerializerForSchema},
+    ),
+)
+
+TIME_ENTRY_EXPORT_CSV_SCHEMA = extend_schema_view(
+    get=extend_schema(
+        operation_id="time_entries_export_csv",
+        summary="Export time entries as CSV",
+        description=(
+            "Streams every TimeEntry of the current user matching the filters, unpaginated, as CSV with the columns "
+            "`id`, `task_id`, `task`, `start_time`, `end_time`, `duration_seconds`.\n"
+            "Accepts the filtering and ordering parameters of the list endpoint."
+        ),
+        parameters=TIME_ENTRY_FILTER_PARAMS + [TIME_ENTRY_ORDERING_PARAM],
+        responses={(200, 'text/csv'): OpenApiTypes.STR},
+    ),
+)
+
+TIME_ENTRY_EXPORT_NDJSON_SCHEMA = extend_schema_view(
+    get=extend_schema(
+        operation_id="time_entries_export_ndjson",
+        summary="Export time entries as NDJSON",
+        description=(
+            "Streams every TimeEntry of the current user matching the filters, unpaginated, as one JSON object per "
+            "line, with the columns of the CSV export as keys. With `group_by=day`, each line is instead a "
+            "`{\"day\": ..., \"entries\": [...]}` object per day of `end_time`, latest day first.\n"
+            "Accepts the filtering and ordering parameters of the list endpoint."
+        ),
+        parameters=TIME_ENTRY_FILTER_PARAMS + [
+            TIME_ENTRY_ORDERING_PARAM,
+            OpenApiParameter(
+                name="group_by",
+                description="`day` to group entries by the day of their `end_time`; ignores `ordering`.",
+                required=False,
+                type=OpenApiTypes.STR,
+                enum=['day'],
+            ),
+        ],
+        responses={(200, 'application/x-ndjson'): OpenApiTypes.STR},
+    ),
+)
+
+TIME_ENTRY_EXPORT_JOB_LIST_CREATE_SCHEMA = extend_schema_view(
+    get=extend_schema(
+        summary="List background exports",
+        description="Returns the current user's exports, latest first, until they expire.",
+        responses={200: TimeEntryExportSerializer(many=True)},
+    ),
+    post=extend_schema(
+        summary="Request a background export",
+        description=(
+            "Enqueues an export of the current user's time entries matching `filters` (the query parameters of "
+            "`export.csv` / `export.ndjson`) and answers HTTP 202. Workers (`run_export_jobs`) write it to a "
+            "gzip-compressed file; poll the export until its status is `completed`, then download it.\n"
+            "An identical request while the export is pending, running or still downloadable answers HTTP 200 "
+            "with that export instead of starting another one."
+        ),
+        request=TimeEntryExportCreateSerializer,
+        responses={200: TimeEntryExportSerializer, 202: TimeEntryExportSerializer},
+    ),
+)
+
+TIME_ENTRY_EXPORT_JOB_DETAIL_SCHEMA = extend_schema(
+    summary="Retrieve a background export",
+    description="Returns the status and progress (`rows_exported` of `rows_total`) of an export.",
+    responses={200: TimeEntryExportSerializer},
+)
+
+TIME_ENTRY_EXPORT_JOB_DOWNLOAD_SCHEMA = extend_schema(
+    summary="Download a background export",
+    description="Returns the gzip-compressed file of a completed export; HTTP 409 until it has completed.",
+    responses={(200, 'application/gzip'): OpenApiTypes.BINARY},
+)
+
+TIME_ENTRY_IMPORT_SCHEMA = extend_schema(
+    summary="Import time entries from CSV or NDJSON",
+    description=(
+        "Streams the request body (`text/csv` with a `task,start_time,end_time` header, or `application/x-ndjson` "
+        "with one such object per line) into time entries of the current user. Tasks are referenced by name and "
+        "created when missing. Invalid rows are skipped and reported in `errors` (the first 100).\n"
+        "Rows are committed in batches; sending the same `source` again resumes after the last committed row."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="source",
+            description="Name of the imported input, used to resume an interrupted import",
+            required=False,
+            type=OpenApiTypes.STR,
+        ),
+    ],
+    request={
+        'text/csv': OpenApiTypes.STR,
+        'application/x-ndjson': OpenApiTypes.STR,
+    },
+    responses={201: TimeEntryImportSerializer},
+)
+
+TIME_ENTRY_INGEST_SCHEMA = extend_schema(
+    summary="Queue time entries for asynchronous insertion",
+    description=(
+        "Available when `TIME_ENTRY_INGEST_ENABLED` is set. Accepts one entry or a list of entries (`task` ID, "
+        "`start_time`, `end_time`), checks only their shape and answers HTTP 202 with the IDs they will have.\n"
+        "Workers insert them shortly after; entries they reject (e.g. another user's task) are kept in a "
+        "dead-letter stream. While the backlog is full, HTTP 503 with `Retry-After` is returned."
+    ),
+    request=TimeEntryIngestSerializer(many=True),
+    responses={202: TimeEntryIngestResultSerializerForSchema},
+)
+
+TIME_ENTRY_INGEST_LAG_SCHEMA = extend_schema(
+    summary="Check the ingestion backlog",
+    description=(
+        "Returns how many queued entries (of all users) wait to be inserted, and for how long the oldest has "
+        "waited. Staff users only."
+    ),
+    responses={200: TimeEntryIngestLagSerializerForSchema},
+)
+
+TIMER_SCHEMA = extend_schema_view(
+    get=extend_schema(
+        summary="Retrieve the running timer",
+        description="Returns the task, start and elapsed time of the running timer, or HTTP 404 if none runs.",
+        responses={200: TimerSerializer},
+    ),
+    patch=extend_schema(
+        summary="Change the running timer",
+        description="Changes the task or the start of the running timer. Nothing is saved until it is stopped.",
+        request=TimerStartSerializer,
+        responses={200: TimerSerializer},
+    ),
+    delete=extend_schema(
+        summary="Discard the running timer",
+        description="Removes the running timer without saving a time entry. Returns HTTP 204 on success.",
+    ),
+)
+
+TIMER_START_SCHEMA = extend_schema(
+    summary="Start a timer",
+    description=(
+        "Starts a timer on one of the user's tasks, now or at `started_at`. "
+        "A user has at most one running timer; HTTP 409 is returned while one runs."
+    ),
+    request=TimerStartSerializer,
+    responses={201: TimerSerializer},
+)
+
+TIMER_STOP_SCHEMA = extend_schema(
+    summary="Stop the running timer",
+    description=(
+        "Saves the running timer as a time entry ending now or at `end_time`, validated as any new entry, "
+        "and returns it. If the entry is invalid, the timer keeps running."
+    ),
+    request=TimerStopSerializer,
+    responses={201: TimeEntryCreateSerializer},
+)
+
 TIME_ENTRY_DETAIL_SCHEMA = extend_schema_view(
     get=extend_schema(
         summary="Retrieve a time entry",
@@ -0,0 +1,172 @@
+# Python imports
+from datetime import datetime
+from uuid import UUID
+# Django imports
+from django_redis import get_redis_connection
+# DRF imports
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# Timer error codes
+TIMER_ERROR_CODE_ALREADY_RUNNING = "timer_already_running"
+TIMER_ERROR_CODE_NOT_RUNNING = "timer_not_running"
+
+TIMER_KEY_PREFIX = 'time_entry_timer'
+
+# Redis scripts, so that checking and changing a user's timer cannot interleave with another request.
+# Starts a timer unless one is running.
+START_TIMER_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then return 0 end
+redis.call('HSET', KEYS[1], unpack(ARGV))
+return 1
+"""
+# Changes the running timer, if any, and returns it.
+UPDATE_TIMER_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return {} end
+redis.call('HSET', KEYS[1], unpack(ARGV))
+return redis.call('HGETALL', KEYS[1])
+"""
+# Removes the running timer, if any, and returns it; of two concurrent stops, only one gets the timer.
+POP_TIMER_SCRIPT = """
+local timer = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return timer
+"""
+# Removes the timer only if it is still the one started at ARGV[1].
+DISCARD_TIMER_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'started_at') ~= ARGV[1] then return 0 end
+return redis.call('DEL', KEYS[1])
+"""
+
+
+class TimerAlreadyRunning(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'A timer is already running. Stop it before starting another one.'
+    default_code = TIMER_ERROR_CODE_ALREADY_RUNNING
+
+
+class TimerNotRunning(APIException):
+    status_code = status.HTTP_404_NOT_FOUND
+    default_detail = 'No timer is running.'
+    default_code = TIMER_ERROR_CODE_NOT_RUNNING
+
+
+def get_timer_redis():
+    return get_redis_connection('default')
+
+
+def get_timer_key(user_id):
+    return f'{TIMER_KEY_PREFIX}:{user_id}'
+
+
+def encode_timer(timer):
+    """
+    Flatten timer fields into the `field, value, ...` arguments of the scripts.
+    """
+    encoded = []
+    if 'task' in timer:
+        encoded += ['task', str(timer['task'])]
+    if 'started_at' in timer:
+        encoded += ['started_at', timer['started_at'].isoformat()]
+    return encoded
+
+
+def decode_timer(raw):
+    """
+    Build a timer from a Redis hash, given as a dict or as the flat list returned by scripts.
+
+    :return: `{'task': UUID, 'started_at': datetime}`, or None if no timer is running.
+    :rtype: dict | None
+    """
+    if not raw:
+        return None
+    if isinstance(raw, list):
+        raw = dict(zip(raw[::2], raw[1::2]))
+    return {
+        'task': UUID(raw[b'task'].decode()),
+        'started_at': datetime.fromisoformat(raw[b'started_at'].decode()),
+    }
+
+
+def get_running_timer(user_id):
+    """
+    Return the user's running timer, read from Redis only.
+
+    :rtype: dict
+    :raises TimerNotRunning: If the user has no running timer.
+    """
+    timer = decode_timer(get_timer_redis().hgetall(get_timer_key(user_id)))
+    if timer is None:
+        raise TimerNotRunning()
+    return timer
+
+
+def start_timer(user_id, task_id, started_at):
+    """
+    Start a timer for the user; a user has at most one running timer.
+
+    :raises TimerAlreadyRunning: If the user already has a running timer.
+    """
+    timer = {'task': task_id, 'started_at': started_at}
+    if not get_timer_redis().eval(START_TIMER_SCRIPT, 1, get_timer_key(user_id), *encode_timer(timer)):
+        raise TimerAlreadyRunning()
+    return timer
+
+
+def update_timer(user_id, changes):
+    """
+    Change the task or the start of the user's running timer, without touching the database.
+
+    :param changes: Some of `task` and `started_at`.
+    :type changes: dict
+    :return: The updated timer.
+    :raises TimerNotRunning: If the user has no running timer.
+    """
+    if not changes:
+        return get_running_timer(user_id)
+    timer = decode_timer(get_timer_redis().eval(UPDATE_TIMER_SCRIPT, 1, get_timer_key(user_id), *encode_timer(changes)))
+    if timer is None:
+        raise TimerNotRunning()
+    return timer
+
+
+def pop_timer(user_id):
+    """
+    Remove the user's running timer and return it, e.g. to save it as a time entry.
+
+    :raises TimerNotRunning: If the user has no running timer.
+    """
+    timer = decode_timer(get_timer_redis().eval(POP_TIMER_SCRIPT, 1, get_timer_key(user_id)))
+    if timer is None:
+        raise TimerNotRunning()
+    return timer
+
+
+def restore_timer(user_id, timer):
+    """
+    Put back a timer returned by `pop_timer` which could not be saved, unless another one was started since.
+    """
+    get_timer_redis().eval(START_TIMER_SCRIPT, 1, get_timer_key(user_id), *encode_timer(timer))
+
+
+def sweep_abandoned_timers(started_before, dry_run=False):
+    """
+    Discard the running timers started before `started_before`.
+
+    Keys are scanned incrementally, so Redis is not blocked however many timers run. A timer stopped or
+    restarted while the sweep runs is left alone.
+
+    :type started_before: datetime
+    :param dry_run: Only report the timers which would be discarded.
+    :return: `(user id, timer)` of the discarded timers.
+    :rtype: list[tuple[int, dict]]
+    """
+    redis = get_timer_redis()
+    swept = []
+    for key in redis.scan_iter(match=get_timer_key('*'), count=1000):
+        timer = decode_timer(redis.hgetall(key))
+        if timer is None or timer['started_at'] >= started_before:
+            continue
+        if dry_run or redis.eval(DISCARD_TIMER_SCRIPT, 1, key, timer['started_at'].isoformat()):
+            swept.append((int(key.decode().rsplit(':', 1)[1]), timer))
+    return swept
@@ -3,6 +3,15 @@ from django.urls import path, include
 # Internal imports
 from .views import (
     TimeEntryListCreateView,
+    TimeEntryBulkView,
+    TimeEntryCsvExportView,
+    TimeEntryNdjsonExportView,
+    TimeEntryImportView,
+    TimeEntryIngestView,
+    TimeEntryIngestLagView,
+    TimerView,
+    TimerStartView,
+    TimerStopView,
     TimeEntryDetailView,
     TimeEntriesByTaskListView,
     TimeEntryByDateListView,
@@ -10,6 +19,15 @@ from .views import (
 
 urlpatterns = [
     path('', TimeEntryListCreateView.as_view(), name='time_entry_list_create'),
+    path('bulk/', TimeEntryBulkView.as_view(), name='time_entry_bulk'),
+    path('export.csv', TimeEntryCsvExportView.as_view(), name='time_entry_export_csv'),
+    path('export.ndjson', TimeEntryNdjsonExportView.as_view(), name='time_entry_export_ndjson'),
+    path('import/', TimeEntryImportView.as_view(), name='time_entry_import'),
+    path('ingest/', TimeEntryIngestView.as_view(), name='time_entry_ingest'),
+    path('ingest/lag/', TimeEntryIngestLagView.as_view(), name='time_entry_ingest_lag'),
+    path('timer/', TimerView.as_view(), name='timer'),
+    path('timer/start/', TimerStartView.as_view(), name='timer_start'),
+    path('timer/stop/', TimerStopView.as_view(), name='timer_stop'),
     path('<uuid:pk>/', TimeEntryDetailView.as_view(), name='time_entry_detail'),
     path('sorted-by-task-name/', TimeEntriesByTaskListView.as_view(), name='time_entry_sorted_by_task_name'),
     path('sorted-by-date/', TimeEntryByDateListView.as_view(), name='time_entry_sorted_by_date'),
@@ -1,7 +1,20 @@
 # Validators error codes
 VALIDATION_ERROR_CODE_INVALID_TIME_RANGE = "invalid_time_range"
+VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY = "overlapping_time_entry"
+VALIDATION_ERROR_CODE_BULK_FILTER_REQUIRED = "bulk_filter_required"
+VALIDATION_ERROR_CODE_TIMER_START_IN_FUTURE = "timer_start_in_future"
+# Python imports
+from functools import reduce
+from operator import or_
+# Django imports
+from django.contrib.postgres.fields.ranges import DateTimeTZRange
+from django.db.models import Q
+from django.utils import timezone
 # Drf imports
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+# Internal imports
+from .models import TimeEntry
 
 
 def validate_start_and_end_time(start_time, end_time):
@@ -9,7 +22,115 @@ def validate_start_and_end_time(start_time, end_time):
     Check if end_time is greater than start_time
     """
     if end_time < start_time or end_time == start_time:
+        raise get_invalid_time_range_error(start_time, end_time)
+
+
+def get_invalid_time_range_error(start_time, end_time):
+    """
+    Build the error reported for an entry not ending after it starts,
+    whether found by `validate_start_and_end_time` or by the `end_time_gt_start_time` constraint.
+    """
+    return ValidationError(
+        f"End time {end_time}, must be greater than start time {start_time}",
+        code=VALIDATION_ERROR_CODE_INVALID_TIME_RANGE
+    )
+
+
+def validate_no_overlapping_time_entries(owner, start_time, end_time, exclude_pk=None):
+    """
+    Check that the owner has no other time entry overlapping `[start_time, end_time)`.
+
+    Runs a single `&&` query against the GiST-indexed `time_range` column. Adjacent
+    entries (one ending exactly when the next starts) do not overlap.
+
+    :param owner: The user (or user id) who owns the time entry.
+    :type owner: User | int
+    :param start_time: Start of the checked range.
+    :type start_time: datetime
+    :param end_time: End of the checked range.
+    :type end_time: datetime
+    :param exclude_pk: Primary key of the entry being updated, excluded from the check.
+    :type exclude_pk: UUID | None
+    :raises ValidationError: If an overlapping entry exists.
+    """
+    overlapping = TimeEntry.objects.filter(
+        owner=owner,
+        time_range__overlap=DateTimeTZRange(start_time, end_time)
+    )
+    if exclude_pk is not None:
+        overlapping = overlapping.exclude(pk=exclude_pk)
+    if overlapping.exists():
+        raise get_overlapping_time_entry_error(start_time, end_time)
+
+
+def get_overlapping_time_entry_error(start_time, end_time):
+    return ValidationError(
+        f"Time range {start_time} - {end_time} overlaps another time entry",
+        code=VALIDATION_ERROR_CODE_OVERLAPPING_TIME_ENTRY
+    )
+
+
+def find_overlapping_time_ranges(owner, time_ranges, database=None, exclude_ids=()):
+    """
+    Batch version of `validate_no_overlapping_time_entries`: find which of many new ranges overlap
+    an existing entry of the owner or another range of the batch (of two such ranges, the later starting one).
+
+    Runs a single query, fetching only the owner's entries which overlap one of the ranges.
+
+    :param owner: The user (or user id) who owns the new time entries.
+    :type owner: User | int
+    :param time_ranges: `(start_time, end_time)` of the new entries.
+    :type time_ranges: list[tuple[datetime, datetime]]
+    :param database: Alias to query, e.g. the owner's shard outside of a request; routed as usual by default.
+    :param exclude_ids: Ids of stored entries to ignore, e.g. the new entries themselves when a batch
+        may already have been inserted by an earlier attempt.
+    :type exclude_ids: Iterable[UUID]
+    :return: Indexes of the overlapping ranges in `time_ranges`.
+    :rtype: set[int]
+    """
+    if not time_ranges:
+        return set()
+    existing = list(
+        TimeEntry.objects.using(database).filter(owner=owner).filter(
+            reduce(or_, (Q(time_range__overlap=DateTimeTZRange(start, end)) for start, end in time_ranges))
+        ).exclude(id__in=list(exclude_ids)).values_list('start_time', 'end_time')
+    )
+    overlapping = {
+        index for index, (start, end) in enumerate(time_ranges)
+        if any(start < existing_end and existing_start < end for existing_start, existing_end in existing)
+    }
+    # Within the batch: sweeping the ranges by start, one overlaps an earlier one if it starts before
+    # the latest end seen so far. Adjacent ranges do not overlap, as in the database check.
+    latest_end = None
+    for index in sorted(range(len(time_ranges)), key=lambda index: time_ranges[index]):
+        start, end = time_ranges[index]
+        if latest_end is not None and start < latest_end:
+            overlapping.add(index)
+        latest_end = end if latest_end is None else max(latest_end, end)
+    return overlapping
+
+
+def validate_bulk_filters(filterset):
+    """
+    Check that a bulk update or delete is restricted by at least one filter.
+
+    :param filterset: Validated filters of the request.
+    :type filterset: TimeEntryBulkFilter
+    :raises ValidationError: If no filter was given.
+    """
+    if not filterset.has_filters():
+        raise ValidationError(
+            {api_settings.NON_FIELD_ERRORS_KEY: ["At least one filter or a list of ids is required"]},
+            code=VALIDATION_ERROR_CODE_BULK_FILTER_REQUIRED
+        )
+
+
+def validate_timer_start(started_at):
+    """
+    Check that a timer does not start in the future, which would make it impossible to stop.
+    """
+    if started_at > timezone.now():
         raise ValidationError(
-            f"End time {end_time}, must be greater than start time {start_time}",
-            code=VALIDATION_ERROR_CODE_INVALID_TIME_RANGE
+            f"Timer cannot start in the future ({started_at})",
+            code=VALIDATION_ERROR_CODE_TIMER_START_IN_FUTURE
         )
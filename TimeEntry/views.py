@@ -1,44 +1,110 @@
+# Python imports
+import codecs
+import uuid
 # Django imports
+from django.conf import settings
+from django.db import router
 from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
+from django.core.handlers.asgi import ASGIRequest
 from django.db.models.functions import TruncDate
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
 # DRF imports
 from rest_framework.filters import OrderingFilter
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.exceptions import NotFound, UnsupportedMediaType, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 # Internal imports
 from Task.models import Task
-from .models import TimeEntry
+from .archive import reaches_archive
+from .columnar import ColumnarResponseMixin
+from .export_jobs import ExportNotReady, request_export
+from .exporting import CsvExportWriter, NdjsonExportWriter, aiter_export, iter_export
+from .ingestion import enqueue_time_entries, get_ingestion_lag
+from .importing import IMPORT_FORMAT_CSV, IMPORT_FORMAT_NDJSON, iter_import_rows, run_import, start_import
+from .models import TimeEntry, TimeEntryExport, TimeEntryWithArchive
+from .timers import get_running_timer, pop_timer, restore_timer, start_timer, update_timer
 from .serializers import (
+    TimeEntryBulkCreateSerializer,
+    TimeEntryBulkUpdateSerializer,
     TimeEntryCreateSerializer,
+    TimeEntryExportCreateSerializer,
+    TimeEntryExportSerializer,
+    TimeEntryImportSerializer,
+    TimeEntryIngestLagSerializerForSchema,
+    TimeEntryIngestSerializer,
     TimeEntryListSerializer,
     TimeEntryDetailSerializer,
     TimeEntryUpdateSerializer,
     TaskWithTimeEntriesSerializer,
     TimeEntryByDaySerializer,
+    TimerSerializer,
+    TimerStartSerializer,
+    TimerStopSerializer,
 )
 from TimeMate.Utils.pagination import DefaultPagination
-from .filters import TimeEntryFilter
+from .filters import TIME_ENTRY_ORDERING_FIELDS, TimeEntryBulkFilter, TimeEntryFilter
+from .validators import validate_bulk_filters
 from TimeMate.Permissions.owner_permissions import IsObjectOwner
+from TimeMate.Signals.signals import batched_list_invalidation, invalidate_user_list
 from TimeMate.Utils.view_helpers import swagger_safe_queryset
-from TimeMate.Utils.mixins import CacheListMixin
+from TimeMate.Utils.mixins import (
+    CacheListMixin,
+    CompiledListMixin,
+    IdempotencyMixin,
+    OwnedObjectMixin,
+    QuerysetProjectionMixin,
+)
+from TimeMate.Utils.projection import project_queryset
 from .time_entry_spectacular_extensions import (
     TIME_ENTRY_LIST_CREATE_SCHEMA,
+    TIME_ENTRY_BULK_SCHEMA,
+    TIME_ENTRY_EXPORT_CSV_SCHEMA,
+    TIME_ENTRY_EXPORT_NDJSON_SCHEMA,
+    TIME_ENTRY_EXPORT_JOB_LIST_CREATE_SCHEMA,
+    TIME_ENTRY_EXPORT_JOB_DETAIL_SCHEMA,
+    TIME_ENTRY_EXPORT_JOB_DOWNLOAD_SCHEMA,
+    TIME_ENTRY_IMPORT_SCHEMA,
+    TIME_ENTRY_INGEST_SCHEMA,
+    TIME_ENTRY_INGEST_LAG_SCHEMA,
+    TIMER_SCHEMA,
+    TIMER_START_SCHEMA,
+    TIMER_STOP_SCHEMA,
     TIME_ENTRY_DETAIL_SCHEMA,
     TASK_WITH_ENTRIES_SCHEMA,
     TIME_ENTRY_BY_DATE_SCHEMA,
 )
 
 
-class TimeEntryBaseView(generics.GenericAPIView):
+class TimeEntryBaseView(QuerysetProjectionMixin, generics.GenericAPIView):
     queryset = TimeEntry.objects.none()
     pagination_class = DefaultPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = TimeEntryFilter
-    ordering_fields = ['start_time', 'end_time', 'task__name', 'duration']
+    ordering_fields = TIME_ENTRY_ORDERING_FIELDS
+
+    def get_time_entry_model(self):
+        """
+        Return the model list queries read from: live entries only, or live and archived entries.
+
+        The archive is only read when the requested window may reach entries older than the archive horizon.
+        """
+        end_time_lower_bound = None
+        if self.filterset_class is not None:
+            filterset = self.filterset_class(self.request.query_params, queryset=TimeEntry.objects.none())
+            # Invalid filters are rejected by the filter backend; the model does not matter then.
+            if not filterset.is_valid():
+                return TimeEntry
+            end_time_lower_bound = filterset.get_end_time_lower_bound()
+        return TimeEntryWithArchive if reaches_archive(end_time_lower_bound) else TimeEntry
 
 
 @TIME_ENTRY_LIST_CREATE_SCHEMA
-class TimeEntryListCreateView(CacheListMixin, TimeEntryBaseView, generics.ListCreateAPIView):
+class TimeEntryListCreateView(IdempotencyMixin, CacheListMixin, ColumnarResponseMixin, CompiledListMixin,
+                              TimeEntryBaseView, generics.ListCreateAPIView):
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return TimeEntryCreateSerializer
@@ -46,11 +112,338 @@ class TimeEntryListCreateView(CacheListMixin, TimeEntryBaseView, generics.ListCr
 
     @swagger_safe_queryset
     def get_queryset(self):
-        return TimeEntry.objects.filter(owner=self.request.user).select_related('task', 'owner', 'task__owner')
+        return (self.get_time_entry_model().objects.
+                filter(owner=self.request.user).
+                select_related('task', 'owner', 'task__owner'))
+
+
+@TIME_ENTRY_BULK_SCHEMA
+class TimeEntryBulkView(IdempotencyMixin, generics.GenericAPIView):
+    """
+    Batch operations on time entries of the request user.
+
+    `POST` creates a list of entries (see `TimeEntryBulkCreateListSerializer`). `PATCH` and `DELETE` act on
+    the entries matched by `TimeEntryBulkFilter`, scoped to the owner (`PATCH` with a single `UPDATE`), and
+    return the number of affected entries; with `dry_run=true` they only count them. Archived entries are
+    never changed. The owner's cached lists are invalidated once per request, not once per entry.
+    """
+    permission_classes = [IsAuthenticated]
+    filterset_class = TimeEntryBulkFilter
+    idempotent_methods = ('POST', 'PATCH', 'DELETE')
+
+    def get_serializer_class(self):
+        if self.request.method == 'PATCH':
+            return TimeEntryBulkUpdateSerializer
+        return TimeEntryBulkCreateSerializer
+
+    def get_queryset(self):
+        return TimeEntry.objects.filter(owner_id=self.request.user.id)
+
+    def get_matched_time_entries(self):
+        filterset = self.filterset_class(self.request.query_params, queryset=self.get_queryset(), request=self.request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        validate_bulk_filters(filterset)
+        return filterset.qs
+
+    def is_dry_run(self):
+        return self.request.query_params.get('dry_run', '').lower() in ('1', 'true')
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(
+            data=request.data, many=True, allow_empty=False, max_length=settings.TIME_ENTRY_BULK_MAX_SIZE
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        # Once for the whole batch, instead of once per entry as `post_save` would.
+        invalidate_user_list(request.user.id)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        time_entries = self.get_matched_time_entries()
+        if self.is_dry_run():
+            return Response({'count': time_entries.count(), 'dry_run': True})
+
+        database = router.db_for_write(TimeEntry, instance=request.user)
+        count = serializer.update_time_entries(time_entries, database)
+        if count:
+            invalidate_user_list(request.user.id)
+        return Response({'count': count, 'dry_run': False})
+
+    def delete(self, request, *args, **kwargs):
+        time_entries = self.get_matched_time_entries()
+        if self.is_dry_run():
+            return Response({'count': time_entries.count(), 'dry_run': True})
+
+        # `post_delete` is sent per entry, so only the columns its receivers read are loaded, and the cached
+        # lists they invalidate are invalidated once for the whole request.
+        database = router.db_for_write(TimeEntry, instance=request.user)
+        with batched_list_invalidation():
+            count, _ = time_entries.using(database).only('id', 'owner_id').delete()
+        return Response({'count': count, 'dry_run': False})
+
+
+class TimeEntryExportBaseView(ColumnarResponseMixin, TimeEntryBaseView):
+    """
+    Stream all time entries of the request user matching the list filters (see `TimeEntry.exporting`).
+
+    Unpaginated: rows are read from a server-side cursor while the response is sent, so neither the
+    number of requests nor memory use grows with the size of the export. Under ASGI the body is an
+    asynchronous generator consumed by the server's event loop; only the preparation of the query
+    (authentication, filters) runs in a worker thread. With `format=columnar` / `columnar-binary`, entries are
+    sent as columnar batches instead (see `TimeEntry.columnar`).
+
+    Subclasses set `writer_class`, the export writer built with `get_writer_kwargs()` for each request.
+    """
+    serializer_class = TimeEntryListSerializer
+    pagination_class = None
+    permission_classes = [IsAuthenticated]
+    writer_class = None
+
+    def get_writer_kwargs(self):
+        return {}
+
+    def get_writer(self):
+        return self.writer_class(**self.get_writer_kwargs())
+
+    @swagger_safe_queryset
+    def get_queryset(self):
+        return self.get_time_entry_model().objects.filter(owner=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        writer = self.get_columnar_writer() if self.is_columnar() else self.get_writer()
+        queryset = self.filter_queryset(self.get_queryset())
+        # Rows are read after the view has returned, when the request's routing (replica, shard) is gone.
+        queryset = queryset.using(queryset.db)
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_export(queryset, writer)
+        else:
+            content = iter_export(queryset, writer)
+        response = StreamingHttpResponse(content, content_type=writer.content_type)
+        response['Content-Disposition'] = f'attachment; filename="time-entries.{writer.extension}"'
+        return response
+
+
+@TIME_ENTRY_EXPORT_CSV_SCHEMA
+class TimeEntryCsvExportView(TimeEntryExportBaseView):
+    writer_class = CsvExportWriter
+
+
+@TIME_ENTRY_EXPORT_NDJSON_SCHEMA
+class TimeEntryNdjsonExportView(TimeEntryExportBaseView):
+    writer_class = NdjsonExportWriter
+    group_by_choices = ['day']
+
+    def get_writer_kwargs(self):
+        group_by = self.request.query_params.get('group_by')
+        if group_by is not None and group_by not in self.group_by_choices:
+            raise ValidationError({'group_by': [f'Must be one of: {", ".join(self.group_by_choices)}.']})
+        return {'group_by_day': group_by == 'day'}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Days are only grouped when their entries are adjacent; latest day first, like `sorted-by-date`.
+        if self.request.query_params.get('group_by') == 'day':
+            queryset = queryset.order_by('-end_time')
+        return queryset
+
+
+@TIME_ENTRY_EXPORT_JOB_LIST_CREATE_SCHEMA
+class TimeEntryExportJobListCreateView(IdempotencyMixin, generics.ListCreateAPIView):
+    """
+    Background exports of the request user (see `TimeEntry.export_jobs`), for exports too large to be
+    streamed within a request. Requesting an export someone is already waiting for reuses it.
+    """
+    queryset = TimeEntryExport.objects.none()
+    permission_classes = [IsAuthenticated]
+    pagination_class = DefaultPagination
+
+    def get_serializer_class(self):
+        if self.request.method == 'POST':
+            return TimeEntryExportCreateSerializer
+        return TimeEntryExportSerializer
+
+    def get_queryset(self):
+        return TimeEntryExport.objects.filter(owner_id=self.request.user.id).order_by('-created_at')
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        export, created = request_export(
+            request.user, serializer.validated_data['format'], serializer.validated_data['filters']
+        )
+        data = TimeEntryExportSerializer(export, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK)
+
+
+@TIME_ENTRY_EXPORT_JOB_DETAIL_SCHEMA
+class TimeEntryExportJobDetailView(OwnedObjectMixin, generics.RetrieveAPIView):
+    serializer_class = TimeEntryExportSerializer
+    permission_classes = [IsAuthenticated, IsObjectOwner]
+
+    def get_queryset(self):
+        return TimeEntryExport.objects.filter(pk=self.kwargs.get('pk'), owner_id=self.request.user.id)
+
+
+@TIME_ENTRY_EXPORT_JOB_DOWNLOAD_SCHEMA
+class TimeEntryExportJobDownloadView(TimeEntryExportJobDetailView):
+    def get(self, request, *args, **kwargs):
+        export = self.get_object()
+        if export.status != TimeEntryExport.Status.COMPLETED:
+            raise ExportNotReady()
+        return FileResponse(export.file.open('rb'), as_attachment=True, filename=f'time-entries.{export.format}.gz',
+                            content_type='application/gzip')
+
+
+@TIME_ENTRY_IMPORT_SCHEMA
+class TimeEntryImportView(generics.GenericAPIView):
+    """
+    Stream a CSV or NDJSON request body of time entries of the request user into the database
+    (see `TimeEntry.importing.run_import`).
+
+    The body is read line by line, never as a whole. Repeating an interrupted upload with the same
+    `source` resumes it after the last committed row.
+    """
+    serializer_class = TimeEntryImportSerializer
+    permission_classes = [IsAuthenticated]
+    content_type_formats = {
+        'text/csv': IMPORT_FORMAT_CSV,
+        'application/x-ndjson': IMPORT_FORMAT_NDJSON,
+        'application/jsonl': IMPORT_FORMAT_NDJSON,
+    }
+
+    def post(self, request, *args, **kwargs):
+        media_type = request.content_type.split(';')[0].strip()
+        import_format = self.content_type_formats.get(media_type)
+        if import_format is None:
+            raise UnsupportedMediaType(media_type)
+        source = request.query_params.get('source') or str(uuid.uuid4())
+        max_length = self.serializer_class.Meta.model._meta.get_field('source').max_length
+        if len(source) > max_length:
+            raise ValidationError({'source': [f'Ensure this field has no more than {max_length} characters.']})
+
+        time_entry_import = start_import(request.user, source)
+        lines = codecs.iterdecode(request.stream or [], 'utf-8-sig')
+        try:
+            errors = run_import(time_entry_import, iter_import_rows(lines, import_format))
+        except UnicodeDecodeError:
+            raise ValidationError({'detail': ['The request body is not valid UTF-8.']})
+
+        data = self.get_serializer(time_entry_import).data
+        data['errors'] = [{'row': row_number, 'errors': detail} for row_number, detail in errors]
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+@TIME_ENTRY_INGEST_SCHEMA
+class TimeEntryIngestView(IdempotencyMixin, generics.GenericAPIView):
+    """
+    Queue time entries of the request user for asynchronous insertion (see `TimeEntry.ingestion`).
+
+    Only the shape of the entries is validated here, without queries; the request is answered with 202
+    and the IDs the entries will have. Workers (`ingest_time_entries`) check the rest and insert them.
+    """
+    serializer_class = TimeEntryIngestSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if not settings.TIME_ENTRY_INGEST_ENABLED:
+            raise NotFound('Asynchronous ingestion is disabled.')
+        many = isinstance(request.data, list)
+        list_kwargs = {'allow_empty': False, 'max_length': settings.TIME_ENTRY_BULK_MAX_SIZE} if many else {}
+        serializer = self.get_serializer(data=request.data, many=many, **list_kwargs)
+        serializer.is_valid(raise_exception=True)
+
+        entries = serializer.validated_data if many else [serializer.validated_data]
+        ids = enqueue_time_entries(request.user.pk, entries)
+        return Response({'ids': ids}, status=status.HTTP_202_ACCEPTED)
+
+
+@TIME_ENTRY_INGEST_LAG_SCHEMA
+class TimeEntryIngestLagView(generics.GenericAPIView):
+    # Figures of the whole queue, not of the request user's entries: for operators only.
+    serializer_class = TimeEntryIngestLagSerializerForSchema
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_ingestion_lag())
+
+
+class TimerBaseView(generics.GenericAPIView):
+    serializer_class = TimerSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_timer_response(self, timer, status_code=status.HTTP_200_OK):
+        timer = {**timer, 'elapsed': timezone.now() - timer['started_at']}
+        return Response(TimerSerializer(timer).data, status=status_code)
+
+
+@TIMER_SCHEMA
+class TimerView(TimerBaseView):
+    """
+    Read, change or discard the running timer of the request user (see `TimeEntry.timers`).
+
+    The timer lives in Redis: reading it never queries the database, and changing it writes nothing
+    until it is stopped.
+    """
+    def get(self, request, *args, **kwargs):
+        return self.get_timer_response(get_running_timer(request.user.pk))
+
+    def patch(self, request, *args, **kwargs):
+        serializer = TimerStartSerializer(data=request.data, partial=True, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        changes = dict(serializer.validated_data)
+        if 'task' in changes:
+            changes['task'] = changes['task'].pk
+        return self.get_timer_response(update_timer(request.user.pk, changes))
+
+    def delete(self, request, *args, **kwargs):
+        pop_timer(request.user.pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@TIMER_START_SCHEMA
+class TimerStartView(IdempotencyMixin, TimerBaseView):
+    def post(self, request, *args, **kwargs):
+        serializer = TimerStartSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        timer = start_timer(
+            request.user.pk,
+            serializer.validated_data['task'].pk,
+            serializer.validated_data.get('started_at', timezone.now())
+        )
+        return self.get_timer_response(timer, status.HTTP_201_CREATED)
+
+
+@TIMER_STOP_SCHEMA
+class TimerStopView(IdempotencyMixin, TimerBaseView):
+    """
+    Stop the running timer of the request user and save it as a time entry, validated as any created entry.
+
+    A timer which fails validation (e.g. its task was deleted meanwhile) keeps running, so it can be fixed.
+    """
+    def post(self, request, *args, **kwargs):
+        serializer = TimerStopSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        end_time = serializer.validated_data.get('end_time', timezone.now())
+
+        timer = pop_timer(request.user.pk)
+        time_entry_serializer = TimeEntryCreateSerializer(
+            data={'task': timer['task'], 'start_time': timer['started_at'], 'end_time': end_time},
+            context=self.get_serializer_context()
+        )
+        try:
+            time_entry_serializer.is_valid(raise_exception=True)
+            time_entry_serializer.save()
+        except Exception:
+            restore_timer(request.user.pk, timer)
+            raise
+        return Response(time_entry_serializer.data, status=status.HTTP_201_CREATED)
 
 
 @TIME_ENTRY_DETAIL_SCHEMA
-class TimeEntryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TimeEntryDetailView(OwnedObjectMixin, QuerysetProjectionMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsObjectOwner]
 
     def get_serializer_class(self):
@@ -60,7 +453,8 @@ class TimeEntryDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self):
         pk = self.kwargs.get("pk")
-        return TimeEntry.objects.filter(pk=pk).select_related('task', 'owner')
+        # Reads join what the serializer renders (see `QuerysetProjectionMixin`); writes need no relation.
+        return TimeEntry.objects.filter(pk=pk, owner_id=self.request.user.id)
 
 
 @TASK_WITH_ENTRIES_SCHEMA
@@ -73,10 +467,17 @@ class TimeEntriesByTaskListView(CacheListMixin, TimeEntryBaseView, generics.List
     def get_queryset(self):
         task_qs = Task.objects.filter(owner=self.request.user).select_related('owner')
 
-        time_entries_qs = TimeEntry.objects.order_by('task__name')
+        time_entry_model = self.get_time_entry_model()
+        # Prefetched entries are not covered by the view's projection; `task` is needed to attach them to tasks.
+        time_entries_qs = project_queryset(
+            time_entry_model.objects.order_by('task__name'),
+            self.get_serializer_class()().fields['entries'].child,
+            extra_fields=['task'],
+        )
+        lookup = 'time_entries_with_archive' if time_entry_model is TimeEntryWithArchive else 'time_entries'
 
         return task_qs.prefetch_related(
-            Prefetch('time_entries', queryset=time_entries_qs)
+            Prefetch(lookup, queryset=time_entries_qs, to_attr='prefetched_time_entries')
         )
 
 
@@ -87,7 +488,7 @@ class TimeEntryByDateListView(CacheListMixin, TimeEntryBaseView, generics.ListAP
 
     @swagger_safe_queryset
     def get_queryset(self):
-        return (TimeEntry.objects.filter(owner=self.request.user).
+        return (self.get_time_entry_model().objects.filter(owner=self.request.user).
                 annotate(day=TruncDate('end_time')).
                 order_by('-day', '-end_time').
                 select_related('task', 'owner', 'task__owner'))
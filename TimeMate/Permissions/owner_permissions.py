@@ -7,7 +7,8 @@ from rest_framework.exceptions import PermissionDenied
 
 class IsObjectOwner(BasePermission):
     def has_object_permission(self, request, view, obj):
-        if obj.owner != request.user:
+        # Compare the foreign key column, so the owner row is never loaded.
+        if obj.owner_id != request.user.id:
             raise PermissionDenied(
                 detail="You do not have permission to access this task",
                 code=PERMISSION_ERROR_CODE_NOT_TASK_OWNER
@@ -1,20 +1,137 @@
+# Python imports
+from contextlib import contextmanager
+from contextvars import ContextVar
 # Django imports
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django.core.cache import cache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.backends.signals import connection_created
+# DRF imports
+from rest_framework.authtoken.models import Token
 # Internal imports
+from TimeEntry.export_jobs import get_export_data_version_cache_key
 from TimeEntry.models import TimeEntry
 from Task.models import Task
+from Task.validators import cache_task_owner, get_task_owner_cache_key
+from TimeMate.Utils.authentication import invalidate_cached_token
+from TimeMate.Utils.sharding import (
+    choose_shard_for_new_user,
+    copy_user_to_shard,
+    get_owner_shard,
+    get_shard_cache_key,
+    set_owner_shard,
+)
+
+User = get_user_model()
+
+# Users whose cached lists are invalidated when the enclosing `batched_list_invalidation()` block exits.
+_pending_list_invalidations = ContextVar('pending_list_invalidations', default=None)
 
 
 def invalidate_user_list(user_id):
+    pending = _pending_list_invalidations.get()
+    if pending is not None:
+        pending.add(user_id)
+        return
     pattern = f"*:user={user_id}:*"
     cache.delete_pattern(pattern)
+    # Completed exports of the previous data are not reused (see `request_export`).
+    cache.delete(get_export_data_version_cache_key(user_id))
+
+
+@contextmanager
+def batched_list_invalidation():
+    """
+    Invalidate the cached lists of each affected user once, when the block exits, instead of once per
+    object saved or deleted inside it (e.g. by the `post_delete` signals of a queryset `delete()`).
+    """
+    pending = set()
+    token = _pending_list_invalidations.set(pending)
+    try:
+        yield
+    finally:
+        _pending_list_invalidations.reset(token)
+        for user_id in pending:
+            invalidate_user_list(user_id)
 
 @receiver([post_save, post_delete], sender=TimeEntry)
 def on_time_entry_change(sender, instance, **kwargs):
-    invalidate_user_list(instance.owner.id)
+    invalidate_user_list(instance.owner_id)
 
 @receiver([post_save, post_delete], sender=Task)
 def on_task_change(sender, instance, **kwargs):
-    invalidate_user_list(instance.owner.id)
+    invalidate_user_list(instance.owner_id)
+
+@receiver(post_save, sender=Task)
+def on_task_save(sender, instance, using, **kwargs):
+    # Only publish the owner once the task is committed; a rolled back task must not pass ownership checks.
+    task_id, owner_id = instance.pk, instance.owner_id
+    transaction.on_commit(lambda: cache_task_owner(task_id, owner_id), using=using)
+
+@receiver(post_delete, sender=Task)
+def on_task_delete(sender, instance, using, **kwargs):
+    # Drop the entry now and again on commit, in case a concurrent check re-cached it from the uncommitted state.
+    key = get_task_owner_cache_key(instance.pk)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key), using=using)
+
+
+def invalidate_cached_tokens(keys, using):
+    # Now and again on commit, in case a concurrent request re-cached them from the committed, older state.
+    keys = list(keys)
+
+    def invalidate():
+        for key in keys:
+            invalidate_cached_token(key)
+    invalidate()
+    transaction.on_commit(invalidate, using=using)
+
+@receiver([post_save, post_delete], sender=Token)
+def on_token_change(sender, instance, using, **kwargs):
+    # Deleted or rotated (a new key is a new row; the old one is deleted).
+    invalidate_cached_tokens([instance.key], using)
+
+@receiver(post_save, sender=User)
+def on_user_change_invalidate_tokens(sender, instance, created, using, **kwargs):
+    # Deactivation (or any other change) must reach cached authentications right away.
+    if created or using != DEFAULT_DB_ALIAS:
+        return
+    invalidate_cached_tokens(Token.objects.filter(user_id=instance.pk).values_list('key', flat=True), using)
+
+
+@receiver(post_save, sender=User)
+def on_user_save(sender, instance, created, using, **kwargs):
+    """
+    Assign new users to a shard and keep each user's copy in their shard up to date.
+    """
+    if not settings.DATABASE_SHARDS or using != DEFAULT_DB_ALIAS:
+        return
+    if created:
+        set_owner_shard(instance.pk, choose_shard_for_new_user(instance))
+    copy_user_to_shard(instance, get_owner_shard(instance.pk)[0])
+
+@receiver(pre_delete, sender=User)
+def on_user_pre_delete(sender, instance, using, **kwargs):
+    # The shard map entry is deleted along with the user, so remember the shard first.
+    if settings.DATABASE_SHARDS and using == DEFAULT_DB_ALIAS:
+        instance._shard_database = get_owner_shard(instance.pk)[0]
+
+@receiver(post_delete, sender=User)
+def on_user_delete(sender, instance, using, **kwargs):
+    """
+    Delete the user's copy in their shard, along with their tasks and time entries stored there.
+    """
+    database = getattr(instance, '_shard_database', DEFAULT_DB_ALIAS)
+    if database != DEFAULT_DB_ALIAS:
+        User._base_manager.using(database).filter(pk=instance.pk).delete()
+    if settings.DATABASE_SHARDS and using == DEFAULT_DB_ALIAS:
+        cache.delete(get_shard_cache_key(instance.pk))
+
+@receiver(connection_created)
+def on_connection_created(sender, connection, **kwargs):
+    # Bound the number of statements psycopg keeps prepared per connection (least recently used are deallocated).
+    if connection.vendor == 'postgresql' and settings.POSTGRES_SERVER_SIDE_BINDING:
+        connection.connection.prepared_max = settings.POSTGRES_PREPARED_MAX
@@ -0,0 +1,103 @@
+# Django imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+# DRF imports
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from TimeMate.Utils import authentication
+from TimeMate.Utils.authentication import get_token_cache_key
+from TimeMate.Utils.test_helpers import get_app_queries
+
+User = get_user_model()
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        authentication._local_tokens.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.token = Token.objects.create(user=self.user)
+        Task.objects.create(name='Test Task', owner=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = reverse('task_list_create')
+        # Served from `CacheListMixin` once warmed up.
+        self.cached_url = reverse('time_entry_list_create')
+
+    def get_app_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return get_app_queries(context.captured_queries)
+
+    def test_cached_list_response_needs_no_queries(self):
+        self.client.get(self.cached_url)
+
+        self.assertEqual(self.get_app_queries(self.cached_url), [])
+
+    def test_shared_cache_serves_other_processes(self):
+        self.client.get(self.cached_url)
+        # A process which has not seen the token yet.
+        authentication._local_tokens.clear()
+
+        self.assertEqual(self.get_app_queries(self.cached_url), [])
+        self.assertIsNotNone(cache.get(get_token_cache_key(self.token.key)))
+
+    def test_request_user_is_the_token_owner(self):
+        self.client.get(self.url)
+
+        response = self.client.post(self.url, {'name': 'Another Task'})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['owner']['username'], self.user.username)
+        self.assertTrue(Task.objects.filter(name='Another Task', owner=self.user).exists())
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(self.url)
+
+        self.token.delete()
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rotated_token_is_rejected(self):
+        self.client.get(self.url)
+
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {new_token.key}')
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(self.url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_drops_credentials_cached_before_commit(self):
+        self.client.get(self.url)
+        credentials = cache.get(get_token_cache_key(self.token.key))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+            # A concurrent request, still seeing the committed active user, caches it again.
+            cache.set(get_token_cache_key(self.token.key), credentials)
+            authentication._set_local(self.token.key, credentials)
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
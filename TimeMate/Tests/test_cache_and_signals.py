@@ -1,17 +1,19 @@
 # Python imports
 from datetime import timedelta
+from unittest.mock import MagicMock
 # Django imports
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 from django.core.cache import cache
+from django.test import TestCase, override_settings
 # Drf imports
 from rest_framework import status
 from rest_framework.test import APITestCase
 # Internal imports
 from TimeEntry.models import TimeEntry
 from Task.models import Task
-from TimeMate.Signals.signals import invalidate_user_list
+from TimeMate.Signals.signals import invalidate_user_list, on_connection_created
 
 User = get_user_model()
 
@@ -193,8 +195,8 @@ class CacheAndSignalTests(APITestCase):
             'end_time': (timezone.now() + timedelta(hours=1)).isoformat(),
         }
         self.client.post(self.time_entry_list_url, data=data)
-        # cache invalidated
-        keys_after = list(cache.iter_keys('*'))
+        # cache invalidated (the task owner entry cached by the ownership check is not a list)
+        keys_after = list(cache.iter_keys('*:user=*'))
         self.assertFalse(keys_after)
         self.assertFalse(any(f'user={self.user.id}' in k for k in keys_after))
         response_2 = self.client.get(self.time_entry_by_task_url)
@@ -256,8 +258,8 @@ class CacheAndSignalTests(APITestCase):
         }
         create_resp = self.client.post(self.time_entry_list_url, new_entry_data)
         self.assertEqual(create_resp.status_code, status.HTTP_201_CREATED)
-        # cache should be cleared
-        self.assertFalse(list(cache.iter_keys('*')))
+        # list cache should be cleared
+        self.assertFalse(list(cache.iter_keys('*:user=*')))
         # second GET: new cache and count increased
         resp2 = self.client.get(self.time_entry_by_date_url)
         self.assertEqual(len(resp2.data['results']), initial_count + 1)
@@ -351,3 +353,22 @@ class CacheAndSignalTests(APITestCase):
         remaining = list(cache.iter_keys('*'))
         self.assertFalse(any(f'user={self.user.id}' in k for k in remaining))
         self.assertTrue(any('user=999' in k for k in remaining))
+
+
+class ConnectionCreatedSignalTests(TestCase):
+    @override_settings(POSTGRES_SERVER_SIDE_BINDING=True, POSTGRES_PREPARED_MAX=7)
+    def test_prepared_statement_cache_is_bounded(self):
+        db_connection = MagicMock(vendor='postgresql')
+
+        on_connection_created(sender=None, connection=db_connection)
+
+        self.assertEqual(db_connection.connection.prepared_max, 7)
+
+    @override_settings(POSTGRES_SERVER_SIDE_BINDING=False)
+    def test_connection_untouched_without_server_side_binding(self):
+        db_connection = MagicMock(vendor='postgresql')
+        db_connection.connection.prepared_max = 100
+
+        on_connection_created(sender=None, connection=db_connection)
+
+        self.assertEqual(db_connection.connection.prepared_max, 100)
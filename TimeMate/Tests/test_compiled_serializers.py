@@ -0,0 +1,146 @@
+# Python imports
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+# Django imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+# DRF imports
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework.request import Request
+# Internal imports
+from Task.models import Task
+from Task.serializers import TaskDetailSerializer, TaskListSerializer
+from TimeEntry.models import TimeEntry
+from TimeEntry.serializers import (
+    TaskWithTimeEntriesSerializer,
+    TimeEntryByDaySerializer,
+    TimeEntryDetailSerializer,
+    TimeEntryListSerializer,
+)
+from TimeMate.Utils.compiled_serializers import compile_serializer
+from TimeMate.Utils.test_helpers import get_app_queries
+
+User = get_user_model()
+
+
+class CompiledSerializerParityTests(APITestCase):
+    """
+    Compiled serializers must render exactly what the serializers they replace render.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.client.force_authenticate(user=self.user)
+        self.tasks = [
+            Task.objects.create(name='Plain task', owner=self.user),
+            Task.objects.create(name='Zadanie "ąę" / <html> & ☃', description='Unicode', owner=self.user),
+        ]
+        now = timezone.now()
+        # Whole seconds, microseconds, entries spanning days and crossing a daylight saving change.
+        starts = [
+            now.replace(microsecond=0) - timedelta(days=1),
+            now - timedelta(days=3, microseconds=123457),
+            now - timedelta(days=200, hours=5),
+            datetime(2024, 3, 31, 0, 30, tzinfo=dt_timezone.utc),
+        ]
+        durations = [timedelta(hours=1), timedelta(days=2, seconds=7), timedelta(microseconds=1), timedelta(hours=3)]
+        for index, (start, duration) in enumerate(zip(starts, durations)):
+            TimeEntry.objects.create(
+                owner=self.user, task=self.tasks[index % 2], start_time=start, end_time=start + duration
+            )
+
+    def render_both(self, serializer_class, queryset, path='/'):
+        request = Request(APIRequestFactory().get(path))
+        context = {'request': request, 'format': None, 'view': None}
+        compiled = compile_serializer(serializer_class, queryset.model)
+        expected = JSONRenderer().render(serializer_class(queryset, many=True, context=context).data)
+        actual = JSONRenderer().render(compiled.render(queryset.values_list(*compiled.lookups), context))
+        return expected, actual
+
+    def get_list_responses(self, url, params=None):
+        responses = []
+        for enabled in (False, True):
+            cache.clear()
+            with override_settings(COMPILED_LIST_SERIALIZERS=enabled):
+                responses.append(self.client.get(url, params))
+        return responses
+
+    def test_time_entry_list_serializer(self):
+        expected, actual = self.render_both(TimeEntryListSerializer, TimeEntry.objects.filter(owner=self.user))
+
+        self.assertEqual(actual, expected)
+
+    def test_task_list_serializer(self):
+        expected, actual = self.render_both(TaskListSerializer, Task.objects.filter(owner=self.user))
+
+        self.assertEqual(actual, expected)
+
+    def test_hyperlinks_keep_format_override(self):
+        expected, actual = self.render_both(
+            TimeEntryListSerializer, TimeEntry.objects.filter(owner=self.user), path='/?format=json'
+        )
+
+        self.assertIn(b'?format=json', actual)
+        self.assertEqual(actual, expected)
+
+    @override_settings(TIME_ZONE='Europe/Warsaw')
+    def test_datetimes_in_other_time_zone(self):
+        expected, actual = self.render_both(TimeEntryListSerializer, TimeEntry.objects.filter(owner=self.user))
+
+        self.assertIn(b'+02:00', actual)
+        self.assertEqual(actual, expected)
+
+    def test_time_entry_list_endpoint(self):
+        params = {'ordering': 'task__name,start_time', 'page_size': 3, 'page': 1}
+
+        regular, compiled = self.get_list_responses(reverse('time_entry_list_create'), params)
+
+        self.assertEqual(compiled.status_code, 200)
+        self.assertEqual(compiled.content, regular.content)
+
+    @override_settings(TIME_ENTRY_ARCHIVE_HORIZON_DAYS=30)
+    def test_time_entry_list_endpoint_reading_archive(self):
+        call_command('archive_time_entries', stdout=StringIO())
+
+        regular, compiled = self.get_list_responses(reverse('time_entry_list_create'))
+
+        results = compiled.json()['results']
+        self.assertEqual(len(results), 4)
+        # Archived entries have no detail endpoint.
+        self.assertEqual(sum(entry['detail_url'] is None for entry in results), 2)
+        self.assertEqual(compiled.content, regular.content)
+
+    def test_task_list_endpoint(self):
+        regular, compiled = self.get_list_responses(reverse('task_list_create'), {'ordering': 'name'})
+
+        self.assertEqual(compiled.content, regular.content)
+
+    def test_empty_page(self):
+        regular, compiled = self.get_list_responses(reverse('time_entry_list_create'), {'task': 'missing'})
+
+        self.assertEqual(compiled.content, regular.content)
+
+    def test_list_reads_rows_in_one_query(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('time_entry_list_create'))
+
+        # The count, then the page with its tasks joined in.
+        self.assertEqual(len(get_app_queries(context)), 2)
+
+    def test_unsupported_serializers_are_not_compiled(self):
+        for serializer_class, model in [
+            (TimeEntryDetailSerializer, TimeEntry),  # Overrides `to_representation()`.
+            (TaskDetailSerializer, Task),
+            (TaskWithTimeEntriesSerializer, Task),  # To-many relation.
+            (TimeEntryByDaySerializer, TimeEntry),  # Rendered by its own list serializer.
+        ]:
+            with self.subTest(serializer_class=serializer_class.__name__):
+                self.assertIsNone(compile_serializer(serializer_class, model))
@@ -0,0 +1,99 @@
+# Python imports
+from unittest.mock import patch
+# Django imports
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+# 3rd-party imports
+from silk.models import Request
+# Internal imports
+from TimeEntry.models import TimeEntry
+from TimeMate.Utils.db_routers import (
+    PrimaryReplicaRouter,
+    get_replica_lag,
+    start_request_routing,
+    stop_request_routing,
+)
+from TimeMate.Utils.middleware import ReplicaRoutingMiddleware
+
+REPLICA = 'replica_0'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+@patch('TimeMate.Utils.db_routers.get_replica_lag', return_value=0)
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    """
+    Runs outside a test transaction; reads inside an open transaction are always kept on the primary.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+        self.auth = {'HTTP_AUTHORIZATION': 'Token abc'}
+
+    def route(self, request, write=False):
+        """
+        Run the request through the middleware and return the database a read in the view is routed to.
+        """
+        routed = {}
+
+        def view(request):
+            if write:
+                self.router.db_for_write(TimeEntry)
+            routed['read'] = self.router.db_for_read(TimeEntry)
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(request)
+        return routed['read']
+
+    def test_reads_outside_requests_are_not_routed(self, _):
+        self.assertIsNone(self.router.db_for_read(TimeEntry))
+
+    def test_safe_request_reads_from_replica(self, _):
+        self.assertEqual(self.route(self.factory.get('/time-entries/', **self.auth)), REPLICA)
+
+    def test_unsafe_request_reads_from_primary(self, _):
+        self.assertEqual(self.route(self.factory.post('/time-entries/', **self.auth)), 'default')
+
+    def test_client_is_pinned_to_primary_after_write(self, _):
+        self.route(self.factory.post('/time-entries/', **self.auth), write=True)
+
+        self.assertEqual(self.route(self.factory.get('/time-entries/', **self.auth)), 'default')
+        self.assertEqual(
+            self.route(self.factory.get('/time-entries/', HTTP_AUTHORIZATION='Token other')), REPLICA
+        )
+
+    @override_settings(DATABASE_REPLICA_PIN_SECONDS=0)
+    def test_pin_expires(self, _):
+        self.route(self.factory.post('/time-entries/', **self.auth), write=True)
+
+        self.assertEqual(self.route(self.factory.get('/time-entries/', **self.auth)), REPLICA)
+
+    def test_reads_after_write_in_same_request_use_primary(self, _):
+        self.assertEqual(self.route(self.factory.get('/time-entries/', **self.auth), write=True), 'default')
+
+    def test_lagging_replica_is_skipped(self, mocked_lag):
+        mocked_lag.return_value = 30
+        self.assertEqual(self.route(self.factory.get('/time-entries/', **self.auth)), 'default')
+
+    def test_primary_only_apps_stay_on_primary(self, _):
+        token = start_request_routing(use_replica=True)
+        try:
+            self.assertEqual(self.router.db_for_read(Request), 'default')
+        finally:
+            stop_request_routing(token)
+
+    def test_reads_inside_transaction_use_primary(self, _):
+        with patch('TimeMate.Utils.db_routers.connections') as mocked_connections:
+            mocked_connections.__getitem__.return_value.in_atomic_block = True
+            self.assertEqual(self.route(self.factory.get('/time-entries/', **self.auth)), 'default')
+
+    def test_migrations_are_not_applied_to_replicas(self, _):
+        self.assertFalse(self.router.allow_migrate(REPLICA, 'TimeEntry'))
+        self.assertIsNone(self.router.allow_migrate('default', 'TimeEntry'))
+
+
+class ReplicaLagTests(TestCase):
+    def test_primary_reports_no_lag(self):
+        self.assertEqual(get_replica_lag('default'), 0)
@@ -0,0 +1,118 @@
+# Python imports
+from datetime import timedelta
+# Django imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+# DRF imports
+from rest_framework import status
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from TimeEntry.models import TimeEntry
+from TimeMate.Signals.signals import invalidate_user_list
+from TimeMate.Utils.mixins import (
+    IDEMPOTENCY_ERROR_CODE_IN_PROGRESS,
+    IDEMPOTENCY_ERROR_CODE_KEY_REUSED,
+    get_idempotency_cache_key,
+)
+
+User = get_user_model()
+
+
+class IdempotencyMixinTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.other_user = User.objects.create_user(username='otheruser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('time_entry_list_create')
+        self.data = {
+            'task': str(self.task.id),
+            'start_time': timezone.now().isoformat(),
+            'end_time': (timezone.now() + timedelta(hours=1)).isoformat(),
+        }
+
+    def post(self, url, data, key='retry-1'):
+        return self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response_without_creating_again(self):
+        first = self.post(self.url, self.data)
+
+        retry = self.post(self.url, self.data)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(TimeEntry.objects.count(), 1)
+
+    def test_requests_without_key_are_not_deduplicated(self):
+        self.client.post(self.url, self.data, format='json')
+        self.client.post(self.url, self.data, format='json')
+
+        self.assertEqual(TimeEntry.objects.count(), 2)
+
+    def test_client_errors_are_replayed(self):
+        """
+        Ensure that a rejected request is answered the same on retry, without validating it again.
+        """
+        url = reverse('task_list_create')
+        first = self.post(url, {'name': 'Test Task'})
+        # Would now pass validation, but the retry must see the original outcome.
+        self.task.delete()
+
+        retry = self.post(url, {'name': 'Test Task'})
+
+        self.assertEqual(first.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(retry.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(retry.json(), first.json())
+        self.assertFalse(Task.objects.exists())
+
+    def test_key_reused_for_different_request_is_rejected(self):
+        self.post(self.url, self.data)
+
+        response = self.post(self.url, {**self.data, 'end_time': (timezone.now() + timedelta(hours=2)).isoformat()})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(response.data['detail'].code, IDEMPOTENCY_ERROR_CODE_KEY_REUSED)
+
+    def test_in_flight_duplicate_is_rejected(self):
+        cache.add(f'{get_idempotency_cache_key(self.user.pk, "retry-1")}:lock', True)
+
+        response = self.post(self.url, self.data)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['detail'].code, IDEMPOTENCY_ERROR_CODE_IN_PROGRESS)
+        self.assertFalse(TimeEntry.objects.exists())
+
+    def test_keys_are_scoped_per_user(self):
+        self.post(self.url, self.data)
+        other_task = Task.objects.create(name='Other Task', owner=self.other_user)
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.post(self.url, {**self.data, 'task': str(other_task.id)})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(TimeEntry.objects.count(), 2)
+
+    def test_stored_response_survives_list_cache_invalidation(self):
+        self.post(self.url, self.data)
+
+        invalidate_user_list(self.user.id)
+
+        self.assertEqual(self.post(self.url, self.data)['Idempotent-Replayed'], 'true')
+        self.assertEqual(TimeEntry.objects.count(), 1)
+
+    def test_bulk_endpoint_replays_batch(self):
+        url = reverse('time_entry_bulk')
+
+        self.post(url, [self.data])
+        retry = self.post(url, [self.data])
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(TimeEntry.objects.count(), 1)
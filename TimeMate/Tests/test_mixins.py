@@ -6,7 +6,7 @@ from django.test import SimpleTestCase
 # DRF imports
 from rest_framework import serializers
 # Internal imports
-from TimeMate.Utils.mixins import OwnerRepresentationMixin
+from TimeMate.Utils.mixins import ConstraintViolationMixin, OwnerRepresentationMixin
 
 # Dummy serializer
 class DummyBaseSerializer(serializers.Serializer):
@@ -39,4 +39,17 @@ class OwnerRepresentationMixinTests(SimpleTestCase):
 
         self.assertIn('owner', representation)
         self.assertEqual(representation['owner'], {'username': dummy_owner.username})
-        mock_user_serializer.assert_called_once_with(dummy_owner)
\ No newline at end of file
+        mock_user_serializer.assert_called_once_with(dummy_owner)
+
+
+class ConstraintViolationMixinTests(SimpleTestCase):
+    def test_listed_constraints_require_an_error_builder(self):
+        with self.assertRaises(TypeError):
+            class IncompleteSerializer(ConstraintViolationMixin, serializers.Serializer):
+                constraint_errors = {'some_constraint': 'name'}
+
+    def test_serializer_without_constraints_needs_no_error_builder(self):
+        class PlainSerializer(ConstraintViolationMixin, serializers.Serializer):
+            pass
+
+        self.assertEqual(PlainSerializer.constraint_errors, {})
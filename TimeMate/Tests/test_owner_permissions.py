@@ -1,13 +1,23 @@
 # Python imports
+import uuid
+from datetime import timedelta
 from unittest.mock import MagicMock
 # Django imports
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
 # DRF imports
-from rest_framework.test import APIRequestFactory
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework.exceptions import PermissionDenied
 # Internal imports
+from Task.models import Task
+from TimeEntry.models import TimeEntry
 from TimeMate.Permissions.owner_permissions import PERMISSION_ERROR_CODE_NOT_TASK_OWNER, IsObjectOwner
+from TimeMate.Utils.test_helpers import get_app_queries, get_error_code
 
 User = get_user_model()
 
@@ -31,8 +41,8 @@ class IsObjectOwnerPermissionTests(TestCase):
         request = self.factory.get('/')
         request.user = self.user_owner
 
-        # Set up a mock object with the owner attribute
-        self.dummy_object.owner = self.user_owner
+        # Set up a mock object with the owner foreign key
+        self.dummy_object.owner_id = self.user_owner.id
 
         self.assertTrue(
             self.permission.has_object_permission(request, None, self.dummy_object),
@@ -45,10 +55,74 @@ class IsObjectOwnerPermissionTests(TestCase):
         """
         request = self.factory.get('/')
         request.user = self.user_not_owner
-        self.dummy_object.owner = self.user_owner
+        self.dummy_object.owner_id = self.user_owner.id
 
         with self.assertRaises(PermissionDenied) as context:
             self.permission.has_object_permission(request, None, self.dummy_object)
 
         error_detail = context.exception.detail
-        self.assertEqual(error_detail.code, PERMISSION_ERROR_CODE_NOT_TASK_OWNER)
\ No newline at end of file
+        self.assertEqual(error_detail.code, PERMISSION_ERROR_CODE_NOT_TASK_OWNER)
+
+
+class OwnedObjectLookupTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='user1', password='<PASSWORD>', email='<EMAIL>')
+        self.other_user = User.objects.create_user(username='user2', password='<PASSWORD>', email='<EMAIL>')
+        self.task = Task.objects.create(name='Test Task', owner=self.user)
+        self.time_entry = TimeEntry.objects.create(
+            task=self.task, owner=self.user, start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1)
+        )
+        self.urls = [
+            reverse('task_detail', kwargs={'pk': self.task.pk}),
+            reverse('time_entry_detail', kwargs={'pk': self.time_entry.pk}),
+        ]
+
+    def test_detail_get_is_one_query(self):
+        """
+        The lookup is filtered by owner, so the ownership check needs no query of its own.
+        """
+        self.client.force_authenticate(user=self.user)
+        for url in self.urls:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            queries = get_app_queries(context.captured_queries)
+            self.assertEqual(len(queries), 1, queries)
+            self.assertIn('"owner_id" =', queries[0])
+
+    def test_detail_delete_does_not_load_owner(self):
+        self.client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.delete(self.urls[1])
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        queries = get_app_queries(context.captured_queries)
+        self.assertEqual(len(queries), 2, queries)
+        self.assertTrue(queries[1].startswith('DELETE'))
+
+    def test_other_users_object_is_forbidden_by_default(self):
+        self.client.force_authenticate(user=self.other_user)
+        for url in self.urls:
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+            self.assertEqual(get_error_code(response.data['detail']), PERMISSION_ERROR_CODE_NOT_TASK_OWNER)
+
+    @override_settings(OWNER_LOOKUP_HIDES_OTHER_USERS_OBJECTS=True)
+    def test_other_users_object_is_not_found_when_hidden(self):
+        self.client.force_authenticate(user=self.other_user)
+        for url in self.urls:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.patch(url, {}, format='json')
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(len(get_app_queries(context.captured_queries)), 1)
+
+    def test_missing_object_is_not_found(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse('task_detail', kwargs={'pk': uuid.uuid4()}))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
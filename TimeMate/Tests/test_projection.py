@@ -0,0 +1,131 @@
+# Python imports
+import re
+from datetime import timedelta
+# Django imports
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+# DRF imports
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from Task.serializers import TaskDetailSerializer, TaskListSerializer
+from TimeEntry.models import TimeEntry
+from TimeEntry.serializers import TimeEntryListSerializer
+from TimeMate.Utils.projection import get_serializer_projection, project_queryset
+
+User = get_user_model()
+
+
+class SerializerProjectionTests(SimpleTestCase):
+    def test_plain_fields_and_identity_field(self):
+        fields, related = get_serializer_projection(TaskListSerializer(), Task)
+
+        self.assertEqual(fields, {'id', 'name'})
+        self.assertEqual(related, set())
+
+    def test_nested_serializer_becomes_select_related(self):
+        fields, related = get_serializer_projection(TimeEntryListSerializer(), TimeEntry)
+
+        self.assertEqual(related, {'task'})
+        self.assertEqual(fields, {'id', 'task', 'task__id', 'task__name', 'start_time', 'end_time', 'duration'})
+
+    def test_owner_representation_uses_user_serializer_columns(self):
+        fields, related = get_serializer_projection(TaskDetailSerializer(), Task)
+
+        self.assertEqual(related, {'owner'})
+        self.assertIn('owner__username', fields)
+        self.assertNotIn('owner__password', fields)
+
+    def test_unmappable_field_disables_projection(self):
+        class TaskWithMethodSerializer(serializers.ModelSerializer):
+            label = serializers.CharField(source='__str__', read_only=True)
+
+            class Meta:
+                model = Task
+                fields = ['id', 'label']
+
+        self.assertIsNone(get_serializer_projection(TaskWithMethodSerializer(), Task))
+        queryset = Task.objects.select_related('owner')
+        self.assertIs(project_queryset(queryset, TaskWithMethodSerializer()), queryset)
+
+
+class QuerysetProjectionViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        self.task = Task.objects.create(name='Test Task', description='Long description', owner=self.user)
+        self.time_entry = TimeEntry.objects.create(
+            task=self.task, owner=self.user, start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1)
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def get_selected_columns(self, url, table):
+        """
+        Return the `"table"."column"` names selected from `table` while serving `url`.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        columns = set()
+        for query in context.captured_queries:
+            # Skip the profiler's own bookkeeping queries.
+            if not query['sql'].startswith('SELECT') or 'silk_' in query['sql']:
+                continue
+            select_list = query['sql'].split(' FROM ', 1)[0]
+            columns |= set(re.findall(rf'"{table}"\."(\w+)"', select_list))
+        return columns
+
+    def test_task_list_selects_serialized_columns_only(self):
+        columns = self.get_selected_columns(reverse('task_list_create'), 'Task_task')
+
+        self.assertEqual(columns, {'id', 'name'})
+
+    def test_time_entry_list_selects_serialized_columns_only(self):
+        url = reverse('time_entry_list_create')
+
+        self.assertEqual(
+            self.get_selected_columns(url, 'TimeEntry_timeentry'),
+            {'id', 'task_id', 'start_time', 'end_time', 'duration'}
+        )
+        cache.clear()
+        # The compiled serializer reads the task's id from `task_id`.
+        self.assertEqual(self.get_selected_columns(url, 'Task_task'), {'name'})
+        cache.clear()
+        with override_settings(COMPILED_LIST_SERIALIZERS=False):
+            self.assertEqual(self.get_selected_columns(url, 'Task_task'), {'id', 'name'})
+
+    def test_time_entry_detail_joins_owner_without_password(self):
+        url = reverse('time_entry_detail', kwargs={'pk': self.time_entry.pk})
+
+        columns = self.get_selected_columns(url, 'auth_user')
+
+        self.assertEqual(columns, {'id', 'username', 'email'})
+        self.assertEqual(self.client.get(url).data['owner']['username'], self.user.username)
+
+    def test_cached_list_does_not_load_deferred_relations(self):
+        url = reverse('time_entry_list_create')
+        Task.objects.bulk_create([Task(name=f'Task {index}', owner=self.user) for index in range(3)])
+        for task in Task.objects.exclude(pk=self.task.pk):
+            TimeEntry.objects.create(
+                task=task, owner=self.user, start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1)
+            )
+        cache.clear()
+
+        # Caching the page must not fetch each task's owner for `Task.__str__`.
+        self.assertEqual(self.get_selected_columns(url, 'auth_user'), set())
+        self.assertEqual(self.client.get(url).data['count'], 4)
+
+    def test_writes_load_full_rows(self):
+        url = reverse('task_detail', kwargs={'pk': self.task.pk})
+
+        response = self.client.patch(url, {'name': 'Renamed Task'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.description, 'Long description')
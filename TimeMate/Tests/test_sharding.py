@@ -0,0 +1,146 @@
+# Python imports
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import patch
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+# DRF imports
+from rest_framework import status
+from rest_framework.test import APITestCase
+# Internal imports
+from Task.models import Task
+from TimeEntry.models import TimeEntry
+from TimeMate.Utils.db_routers import OwnerShardRouter, start_shard_routing, stop_shard_routing
+from TimeMate.Utils.sharding import (
+    ShardMoveInProgress,
+    copy_user_to_shard,
+    get_owner_shard,
+    set_owner_shard,
+)
+
+User = get_user_model()
+
+SHARDS = ['default', 'shard_1']
+
+
+@override_settings(DATABASE_SHARDS=SHARDS)
+@patch('TimeMate.Utils.db_routers.get_owner_shard', return_value=('shard_1', False))
+class OwnerShardRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = OwnerShardRouter()
+        self.user = User(pk=7, username='testuser')
+
+    def test_owner_hint_selects_shard(self, mocked_shard):
+        entry = TimeEntry(owner_id=7)
+
+        self.assertEqual(self.router.db_for_write(TimeEntry, instance=entry), 'shard_1')
+        self.assertEqual(self.router.db_for_read(Task, instance=self.user), 'shard_1')
+        mocked_shard.assert_called_with(7)
+
+    def test_request_user_selects_shard_once(self, mocked_shard):
+        request = RequestFactory().get('/tasks/')
+        request.user = self.user
+
+        token = start_shard_routing(request)
+        try:
+            self.assertEqual(self.router.db_for_read(Task), 'shard_1')
+            self.assertEqual(self.router.db_for_read(TimeEntry), 'shard_1')
+        finally:
+            stop_shard_routing(token)
+        mocked_shard.assert_called_once_with(7)
+
+    def test_unhinted_queries_outside_requests_are_not_routed(self, _):
+        self.assertIsNone(self.router.db_for_read(Task))
+
+    def test_users_are_not_sharded(self, _):
+        self.assertIsNone(self.router.db_for_read(User, instance=self.user))
+
+    def test_writes_are_refused_while_moving(self, mocked_shard):
+        mocked_shard.return_value = ('shard_1', True)
+
+        self.assertEqual(self.router.db_for_read(Task, instance=self.user), 'shard_1')
+        with self.assertRaises(ShardMoveInProgress):
+            self.router.db_for_write(Task, instance=self.user)
+
+    @override_settings(DATABASE_SHARDS=[])
+    def test_router_is_disabled_without_shards(self, _):
+        self.assertIsNone(self.router.db_for_read(Task, instance=self.user))
+
+
+@override_settings(DATABASE_SHARDS=[])
+class ShardMapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+
+    def test_unmapped_user_lives_in_default(self):
+        self.assertEqual(get_owner_shard(self.user.pk), ('default', False))
+
+    def test_set_owner_shard_invalidates_cached_shard(self):
+        get_owner_shard(self.user.pk)
+
+        set_owner_shard(self.user.pk, 'shard_1', moving=True)
+
+        self.assertEqual(get_owner_shard(self.user.pk), ('shard_1', True))
+
+
+@skipUnless(len(settings.DATABASE_SHARDS) > 1, 'Set POSTGRES_SHARDS to run tests against a second database.')
+class ShardingIntegrationTests(APITestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='<EMAIL>', password='<PASSWORD>')
+        set_owner_shard(self.user.pk, 'shard_1')
+        copy_user_to_shard(self.user, 'shard_1')
+        self.client.force_authenticate(user=self.user)
+
+    def create_task_with_entry(self):
+        response = self.client.post(reverse('task_list_create'), {'name': 'Sharded Task'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        task = Task.objects.using('shard_1').get(name='Sharded Task')
+        # `save()` passes the instance to the router, which picks the owner's shard.
+        TimeEntry(
+            task=task, owner=self.user, start_time=timezone.now(), end_time=timezone.now() + timedelta(hours=1)
+        ).save()
+        return task
+
+    def test_user_data_is_stored_in_their_shard(self):
+        task = self.create_task_with_entry()
+
+        self.assertFalse(Task.objects.using('default').filter(pk=task.pk).exists())
+        self.assertEqual(TimeEntry.objects.using('shard_1').filter(owner_id=self.user.pk).count(), 1)
+        response = self.client.get(reverse('time_entry_list_create'))
+        self.assertEqual(response.data['count'], 1)
+
+    def test_move_user_to_shard(self):
+        task = self.create_task_with_entry()
+
+        call_command('move_user_to_shard', self.user.username, 'default', drain_seconds=0, stdout=StringIO())
+
+        self.assertEqual(get_owner_shard(self.user.pk), ('default', False))
+        self.assertTrue(Task.objects.using('default').filter(pk=task.pk).exists())
+        self.assertFalse(Task.objects.using('shard_1').filter(pk=task.pk).exists())
+        self.assertEqual(self.client.get(reverse('time_entry_list_create')).data['count'], 1)
+
+    def test_writes_are_refused_while_moving(self):
+        set_owner_shard(self.user.pk, 'shard_1', moving=True)
+
+        response = self.client.post(reverse('task_list_create'), {'name': 'Sharded Task'})
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_deleting_user_deletes_shard_rows(self):
+        self.create_task_with_entry()
+
+        self.user.delete()
+
+        self.assertFalse(User.objects.using('shard_1').filter(pk=self.user.pk).exists())
+        self.assertFalse(Task.objects.using('shard_1').exists())
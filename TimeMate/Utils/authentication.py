@@ -0,0 +1,97 @@
+# Python imports
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+# DRF imports
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+
+# User columns kept in the caches; the password hash is left out and loads on access.
+CACHED_USER_FIELDS = [field.attname for field in User._meta.concrete_fields if field.name != 'password']
+
+# token key -> (time.monotonic() of expiry, cached credentials); per process, least recently used first.
+_local_tokens = OrderedDict()
+_local_tokens_lock = threading.Lock()
+
+
+def get_token_cache_key(key):
+    # Hashed, so the cache never holds usable credentials.
+    return f'auth_token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def invalidate_cached_token(key):
+    """
+    Forget a token in the shared cache and in this process' LRU.
+
+    LRUs of other processes expire on their own after `AUTH_TOKEN_LOCAL_CACHE_SECONDS`.
+    """
+    cache.delete(get_token_cache_key(key))
+    with _local_tokens_lock:
+        _local_tokens.pop(key, None)
+
+
+def _get_local(key):
+    with _local_tokens_lock:
+        entry = _local_tokens.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _local_tokens[key]
+            return None
+        _local_tokens.move_to_end(key)
+        return entry[1]
+
+
+def _set_local(key, credentials):
+    with _local_tokens_lock:
+        _local_tokens[key] = (time.monotonic() + settings.AUTH_TOKEN_LOCAL_CACHE_SECONDS, credentials)
+        _local_tokens.move_to_end(key)
+        while len(_local_tokens) > settings.AUTH_TOKEN_LOCAL_CACHE_SIZE:
+            _local_tokens.popitem(last=False)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `TokenAuthentication` which remembers token -> user instead of querying both tables on every request.
+
+    Credentials are looked up in an in-process LRU (`AUTH_TOKEN_LOCAL_CACHE_SECONDS`,
+    `AUTH_TOKEN_LOCAL_CACHE_SIZE`), then in Redis (`AUTH_TOKEN_CACHE_SECONDS`), and only then in the database.
+    Signals invalidate a token when it is deleted or replaced and when its user is saved (e.g. deactivated).
+    Every request gets fresh `User` and `Token` instances, never shared ones.
+    """
+
+    def authenticate_credentials(self, key):
+        credentials = _get_local(key)
+        if credentials is None:
+            credentials = cache.get(get_token_cache_key(key))
+            if credentials is None:
+                credentials = self._load_credentials(key)
+                cache.set(get_token_cache_key(key), credentials, settings.AUTH_TOKEN_CACHE_SECONDS)
+            _set_local(key, credentials)
+
+        created, user_values = credentials
+        # No database alias: routers pick one when the instances are used, like for new instances.
+        user = User.from_db(None, CACHED_USER_FIELDS, user_values)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        token = Token.from_db(None, ['key', 'user_id', 'created'], [key, user.pk, created])
+        token.user = user
+        return user, token
+
+    def _load_credentials(self, key):
+        """
+        Return `(token created, user column values)` of the token, as `TokenAuthentication` would look it up.
+        """
+        try:
+            token = Token.objects.select_related('user').get(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        return token.created, [getattr(token.user, attname) for attname in CACHED_USER_FIELDS]
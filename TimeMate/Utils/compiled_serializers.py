@@ -0,0 +1,216 @@
+# Python imports
+import uuid
+from functools import lru_cache
+# Django imports
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.duration import duration_string
+# DRF imports
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.relations import HyperlinkedIdentityField
+from rest_framework.settings import api_settings
+# Internal imports
+from TimeMate.Utils.projection import get_archived_field
+
+
+class CompiledSerializer:
+    """
+    Read-only, list-only equivalent of a serializer, rendering rows of `values_list(*lookups)` instead of
+    model instances.
+
+    Built once per serializer class by `compile_serializer`. For each request, `prepare()` turns the compiled
+    fields into one accessor per field (a plain function of the row, with everything the DRF field would
+    work out per value, such as the time zone or the URL pattern of a hyperlink, worked out once), and rows
+    are rendered by calling them in the serializer's field order. The output is the same as the serializer's,
+    down to the bytes of the rendered JSON (`TimeMate/Tests/test_compiled_serializers.py` checks it).
+
+    Attributes:
+        lookups (list[str]): What to pass to `values_list()`.
+        fields (list[tuple]): `(name, position of the lookup in the row, accessor factory)` per output field.
+    """
+
+    def __init__(self, lookups, fields):
+        self.lookups = lookups
+        self.fields = fields
+
+    def prepare(self, context):
+        """
+        :param context: Serializer context of the request (`request`, `format`, ...).
+        :return: Function rendering one row into the representation of one object.
+        :rtype: Callable[[tuple], dict]
+        """
+        accessors = [(name, make_accessor(position, context)) for name, position, make_accessor in self.fields]
+
+        def render(row):
+            return {name: accessor(row) for name, accessor in accessors}
+        return render
+
+    def render(self, rows, context):
+        """
+        :type rows: Iterable[tuple]
+        :rtype: list[dict]
+        """
+        render = self.prepare(context)
+        return [render(row) for row in rows]
+
+
+def make_value_accessor(convert):
+    # As `Serializer.to_representation()`, None is rendered as is, without the field.
+    def make_accessor(position, context):
+        def access(row):
+            value = row[position]
+            return None if value is None else convert(value)
+        return access
+    return make_accessor
+
+
+def make_datetime_accessor(field):
+    def make_accessor(position, context):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        # Same time zone as `DateTimeField.enforce_timezone()`, looked up once instead of per value.
+        field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+            return make_value_accessor(field.to_representation)(position, context)
+
+        def access(row):
+            value = row[position]
+            if value is None:
+                return None
+            if value.tzinfo is None:
+                return field.to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            return value[:-6] + 'Z' if value.endswith('+00:00') else value
+        return access
+    return make_accessor
+
+
+def make_hyperlink_accessor(field, archived_position=None):
+    # With `archived_position`, rows flagged there have no link (see `TimeEntryUrlField`).
+    def make_accessor(position, context):
+        request = context['request']
+        # As `HyperlinkedRelatedField.to_representation()`.
+        url_format = context.get('format')
+        if url_format and field.format and field.format != url_format:
+            url_format = field.format
+
+        def reverse(value):
+            kwargs = {field.lookup_url_kwarg: value}
+            return field.reverse(field.view_name, kwargs=kwargs, request=request, format=url_format)
+
+        # `(prefix, suffix)` around the lookup value, from the first URL built; False if it cannot be split.
+        template = None
+
+        def access(row):
+            nonlocal template
+            if archived_position is not None and row[archived_position]:
+                return None
+            value = row[position]
+            if template:
+                return f'{template[0]}{value}{template[1]}'
+            url = reverse(value)
+            if template is None:
+                parts = url.split(str(value)) if isinstance(value, (uuid.UUID, int)) else []
+                template = tuple(parts) if len(parts) == 2 else False
+            return url
+        return access
+    return make_accessor
+
+
+def make_nested_accessor(foreign_key_position, compiled):
+    def make_accessor(position, context):
+        render = compiled.prepare(context)
+
+        def access(row):
+            return None if row[foreign_key_position] is None else render(row)
+        return access
+    return make_accessor
+
+
+def make_uuid_converter(field):
+    return str if field.uuid_format == 'hex_verbose' else lambda value: getattr(value, field.uuid_format)
+
+
+# DRF fields, by exact class, whose `to_representation()` has a plain equivalent.
+CONVERTERS = {
+    serializers.CharField: lambda field: str,
+    serializers.IntegerField: lambda field: int,
+    serializers.UUIDField: make_uuid_converter,
+    serializers.DurationField: lambda field: duration_string,
+}
+
+
+def compile_fields(serializer, model, prefix, lookups):
+    """
+    Compile the fields of `serializer`, appending the lookups they read to `lookups`.
+
+    :return: Compiled fields, or None if any field has no compiled equivalent.
+    :rtype: list[tuple] | None
+    """
+    if type(serializer).to_representation is not serializers.Serializer.to_representation:
+        return None
+
+    def add_lookup(lookup):
+        if lookup not in lookups:
+            lookups.append(lookup)
+        return lookups.index(lookup)
+
+    fields = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, HyperlinkedIdentityField):
+            if type(field) is not HyperlinkedIdentityField and getattr(field, 'archived_field', None) is None:
+                return None
+            attr = model._meta.pk.name if field.lookup_field == 'pk' else field.lookup_field
+            archived_field = get_archived_field(field, model)
+            archived_position = None if archived_field is None else add_lookup(prefix + archived_field)
+            fields.append((name, add_lookup(prefix + attr), make_hyperlink_accessor(field, archived_position)))
+            continue
+        if len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer) or not model_field.many_to_one:
+                return None
+            nested_prefix = f'{prefix}{model_field.name}__'
+            nested = compile_fields(field, model_field.related_model, nested_prefix, lookups)
+            if nested is None:
+                return None
+            foreign_key_position = add_lookup(prefix + model_field.name)
+            fields.append((name, None, make_nested_accessor(foreign_key_position, CompiledSerializer(lookups, nested))))
+            continue
+        if model_field.is_relation:
+            return None
+        if type(field) is serializers.DateTimeField:
+            make_accessor = make_datetime_accessor(field)
+        elif type(field) in CONVERTERS:
+            make_accessor = make_value_accessor(CONVERTERS[type(field)](field))
+        else:
+            return None
+        fields.append((name, add_lookup(prefix + model_field.name), make_accessor))
+    return fields
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(serializer_class, model):
+    """
+    Compile `serializer_class` for rendering `model` rows read with `values_list()`.
+
+    Supported are plain fields (text, integers, UUIDs, datetimes, durations), hyperlinks to the object
+    itself (none for archived rows, see `TimeEntryUrlField`) and nested serializers of forward foreign keys,
+    as used by the list serializers. Serializers overriding `to_representation()` or rendered by their own
+    list serializer (`list_serializer_class`), custom fields and to-many relations are not.
+
+    :return: The compiled serializer, or None if the serializer cannot be compiled.
+    :rtype: CompiledSerializer | None
+    """
+    if getattr(getattr(serializer_class, 'Meta', None), 'list_serializer_class', None) is not None:
+        return None
+    lookups = []
+    fields = compile_fields(serializer_class(), model, '', lookups)
+    return None if fields is None else CompiledSerializer(lookups, fields)
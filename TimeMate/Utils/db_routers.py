@@ -0,0 +1,192 @@
+# Python imports
+import math
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+# Internal imports
+from TimeMate.Utils.sharding import SHARDED_APPS, ShardMoveInProgress, get_owner_shard
+
+# Apps whose tables are always read from and written to the primary (profiling data written by middleware).
+PRIMARY_ONLY_APPS = {'silk'}
+
+# Lag in seconds; 0 on a caught-up standby or on a database which is not a standby at all.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+@dataclass
+class RoutingState:
+    """
+    Routing decisions of a single request.
+
+    :param use_replica: Whether reads may go to a replica (safe method, client not pinned to the primary).
+    :param replica: Replica chosen for this request, picked on its first read.
+    :param wrote: Whether the request already wrote to the primary; later reads then stay on the primary.
+    """
+    use_replica: bool
+    replica: str | None = None
+    wrote: bool = False
+
+
+_routing_state = ContextVar('replica_routing_state', default=None)
+# Request whose authenticated user decides the shard of queries without an owner hint.
+_shard_request = ContextVar('shard_request', default=None)
+# alias -> (time.monotonic() of the check, lag in seconds); shared by all threads of the process.
+_replica_lag = {}
+
+
+def start_request_routing(use_replica):
+    """
+    Enable routing for the current request. Returns a token for `stop_request_routing`.
+    """
+    return _routing_state.set(RoutingState(use_replica=use_replica))
+
+
+def stop_request_routing(token):
+    _routing_state.reset(token)
+
+
+def get_routing_state():
+    return _routing_state.get()
+
+
+def start_shard_routing(request):
+    """
+    Route the current request's sharded queries to its user's shard. Returns a token for `stop_shard_routing`.
+    """
+    return _shard_request.set(request)
+
+
+def stop_shard_routing(token):
+    _shard_request.reset(token)
+
+
+def get_replica_lag(alias):
+    """
+    Return the replication lag of the replica in seconds, checked at most every
+    `DATABASE_REPLICA_LAG_CHECK_SECONDS` per process. An unreachable replica counts as infinitely late.
+
+    :param alias: Database alias of the replica.
+    :rtype: float
+    """
+    checked_at, lag = _replica_lag.get(alias, (None, None))
+    now = time.monotonic()
+    if checked_at is None or now - checked_at >= settings.DATABASE_REPLICA_LAG_CHECK_SECONDS:
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError:
+            lag = math.inf
+        _replica_lag[alias] = (now, lag)
+    return lag
+
+
+def choose_replica():
+    """
+    Pick a random replica lagging less than `DATABASE_REPLICA_MAX_LAG_SECONDS`, or None if there is none.
+    """
+    healthy = [
+        alias for alias in settings.DATABASE_REPLICAS
+        if get_replica_lag(alias) <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+    ]
+    return random.choice(healthy) if healthy else None
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads of safe-method requests to a replica and everything else to the primary (`default`).
+
+    Routing only happens inside requests handled by `ReplicaRoutingMiddleware`; management commands,
+    migrations and shells keep using the primary. Within a request, reads stay on the primary once
+    anything was written or while a transaction is open, so a request always sees its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = get_routing_state()
+        if state is None:
+            return None
+        if (not state.use_replica or state.wrote or model._meta.app_label in PRIMARY_ONLY_APPS
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        if state.replica is None:
+            state.replica = choose_replica() or DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = get_routing_state()
+        if state is not None and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class OwnerShardRouter:
+    """
+    Route tasks and time entries to the database of their owner's shard (see `TimeMate.Utils.sharding`).
+
+    The owner is taken from the `instance` hint (the saved object itself, or the user whose related objects
+    are read) or, for plain queries inside a request handled by `ShardRoutingMiddleware`, from the
+    authenticated user; all of a request's queries therefore hit the same shard. Other queries, including
+    unhinted ones in management commands, use `default`. Does nothing unless shards are configured.
+    """
+
+    def get_shard(self, model, hints):
+        if not settings.DATABASE_SHARDS or model._meta.app_label not in SHARDED_APPS:
+            return None
+        instance = hints.get('instance')
+        if isinstance(instance, get_user_model()):
+            owner_id = instance.pk
+        elif getattr(instance, 'owner_id', None) is not None:
+            owner_id = instance.owner_id
+        else:
+            request = _shard_request.get()
+            user = getattr(request, 'user', None)
+            if user is None or not user.is_authenticated:
+                return None
+            # Resolved once, so a shard move starting mid-request cannot split the request across databases.
+            if getattr(request, '_owner_shard', None) is None:
+                request._owner_shard = get_owner_shard(user.pk)
+            return request._owner_shard
+        return get_owner_shard(owner_id)
+
+    def db_for_read(self, model, **hints):
+        shard = self.get_shard(model, hints)
+        return shard[0] if shard else None
+
+    def db_for_write(self, model, **hints):
+        shard = self.get_shard(model, hints)
+        if shard is None:
+            return None
+        database, moving = shard
+        if moving:
+            raise ShardMoveInProgress()
+        return database
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Users live in `default` and own tasks and time entries stored in their shard.
+        # Shards get the full schema; users are copied into them so foreign keys hold.
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_SHARDS}
+        if settings.DATABASE_SHARDS and obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
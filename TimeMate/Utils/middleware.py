@@ -0,0 +1,79 @@
+# Python imports
+import hashlib
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+# DRF imports
+from rest_framework.permissions import SAFE_METHODS
+# Internal imports
+from TimeMate.Utils.db_routers import (
+    get_routing_state,
+    start_request_routing,
+    start_shard_routing,
+    stop_request_routing,
+    stop_shard_routing,
+)
+
+
+def get_primary_pin_key(request):
+    """
+    Build the cache key pinning a client to the primary, or None for anonymous clients.
+
+    Token authentication only runs inside DRF views, after the routing decision has to be made,
+    so clients are identified by their credentials (hashed) instead of by user.
+
+    :param request: Django HttpRequest object.
+    :rtype: str | None
+    """
+    credentials = request.headers.get('Authorization') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credentials:
+        return None
+    return f'db_primary_pin:{hashlib.sha256(credentials.encode()).hexdigest()}'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Enable `PrimaryReplicaRouter` for the request and provide read-your-writes consistency.
+
+    Safe-method requests may read from a replica. After a client writes, it is pinned to the primary
+    for `DATABASE_REPLICA_PIN_SECONDS`, so e.g. a GET right after a POST still returns the new entry.
+    Does nothing unless replicas are configured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        pin_key = get_primary_pin_key(request)
+        use_replica = request.method in SAFE_METHODS and not (pin_key and cache.get(pin_key))
+        token = start_request_routing(use_replica)
+        try:
+            response = self.get_response(request)
+            if pin_key and (request.method not in SAFE_METHODS or get_routing_state().wrote):
+                cache.set(pin_key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+        finally:
+            stop_request_routing(token)
+        return response
+
+
+class ShardRoutingMiddleware:
+    """
+    Enable `OwnerShardRouter` for the request, so its tasks and time entries are read from and
+    written to the authenticated user's shard. Does nothing unless shards are configured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_SHARDS:
+            return self.get_response(request)
+
+        token = start_shard_routing(request)
+        try:
+            return self.get_response(request)
+        finally:
+            stop_shard_routing(token)
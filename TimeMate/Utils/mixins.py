@@ -1,9 +1,40 @@
+# Python imports
+import hashlib
+import json
+from contextlib import contextmanager
+from functools import partial
 # Django imports
+from django.conf import settings
 from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, IntegrityError, connections, router, transaction
+from django.http import Http404
 # DRF imports
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 # Internal imports
 from TimeMate.Serializers.user_serializers import UserSerializer
+from TimeMate.Utils.compiled_serializers import compile_serializer
+from TimeMate.Utils.projection import project_queryset
+
+# Idempotency error codes
+IDEMPOTENCY_ERROR_CODE_IN_PROGRESS = "idempotent_request_in_progress"
+IDEMPOTENCY_ERROR_CODE_KEY_REUSED = "idempotency_key_reused"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+class IdempotentRequestInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'A request with this Idempotency-Key is still being processed. Retry it later.'
+    default_code = IDEMPOTENCY_ERROR_CODE_IN_PROGRESS
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = 'This Idempotency-Key was already used for a different request.'
+    default_code = IDEMPOTENCY_ERROR_CODE_KEY_REUSED
 
 class OwnerRepresentationMixin:
     """
@@ -17,6 +48,9 @@ class OwnerRepresentationMixin:
     :return: Serialized data dict with expanded `owner`.
     :rtype: dict
     """
+    # Serializer of the nested `owner`; lets `QuerysetProjectionMixin` know which user columns are read.
+    owner_serializer_class = UserSerializer
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         # Check if the instance has an `owner`
@@ -49,12 +83,15 @@ class CacheListMixin:
         if cached_data is not None:
             return Response(cached_data)
         response = super().list(request, *args, **kwargs)
-        cache.set(key, response.data, self.cache_timeout)
+        # Cache plain JSON types: pickling DRF's `Hyperlink` calls `str()` on its model instance,
+        # which may read relations the (projected) queryset never loaded.
+        cache.set(key, json.loads(JSONRenderer().render(response.data)), self.cache_timeout)
         return response
 
     def get_cache_key(self, request):
         """
-        Build cache key from view name, user ID, and query params.
+        Build cache key from view name, user ID, query params and the negotiated renderer's format,
+        since a view may build different data per renderer (e.g. columnar responses).
 
         :param request: DRF Request object.
         :type request: rest_framework.request.Request
@@ -62,4 +99,252 @@ class CacheListMixin:
         :rtype: str
         """
         params = request.query_params.urlencode()
-        return f'{self.__class__.__name__}:user={request.user.id}:{params}'
\ No newline at end of file
+        renderer_format = getattr(getattr(request, 'accepted_renderer', None), 'format', '')
+        return f'{self.__class__.__name__}:user={request.user.id}:{params}:{renderer_format}'
+
+
+class CompiledListMixin:
+    """
+    Render list pages with the compiled form of the view's serializer (see `TimeMate.Utils.compiled_serializers`):
+    rows are read with `values_list()` and turned into the same output without model instances or DRF fields.
+
+    Views whose serializer cannot be compiled, and all views when `COMPILED_LIST_SERIALIZERS` is disabled,
+    list through the serializer as before.
+
+    :param request: DRF Request object.
+    :type request: rest_framework.request.Request
+    :return: Paginated response.
+    :rtype: rest_framework.response.Response
+    """
+
+    def list(self, request, *args, **kwargs):
+        compiled = None
+        if settings.COMPILED_LIST_SERIALIZERS:
+            compiled = compile_serializer(self.get_serializer_class(), self.get_queryset().model)
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*compiled.lookups)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(compiled.render(queryset, self.get_serializer_context()))
+        return self.get_paginated_response(compiled.render(page, self.get_serializer_context()))
+
+
+class QuerysetProjectionMixin:
+    """
+    Load only the columns and joins the view's serializer reads.
+
+    On safe methods, restricts the filtered queryset with `.only()` / `.select_related()` derived from the
+    serializer's field tree (see `TimeMate.Utils.projection`), replacing the view's own `select_related()`.
+    Writes keep full rows, so validators and `save()` see every field.
+
+    :param queryset: Filtered queryset of the view.
+    :type queryset: django.db.models.QuerySet
+    :return: Projected queryset.
+    :rtype: django.db.models.QuerySet
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        return project_queryset(queryset, serializer)
+
+
+def get_violated_constraint(error):
+    """
+    Return the name of the constraint an `IntegrityError` reports, or None.
+
+    Follows the chain of exceptions: a profiler explaining the failed statement (silk does, for UPDATEs)
+    replaces the `IntegrityError` with an error about the aborted transaction, raised while handling it.
+
+    :param error: Error raised by the database backend (psycopg attaches the diagnostics to its cause).
+    :type error: django.db.DatabaseError
+    :rtype: str | None
+    """
+    while error is not None:
+        if isinstance(error, IntegrityError):
+            return getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None)
+        error = error.__context__
+    return None
+
+
+def get_foreign_key_constraint_name(model, field_name, using=DEFAULT_DB_ALIAS):
+    """
+    Return the name of the database constraint Django creates for the foreign key `field_name` of `model`,
+    so its violations can be listed in `ConstraintViolationMixin.constraint_errors`.
+
+    Foreign keys are deferred on PostgreSQL: they are checked, and fail, when the transaction commits.
+
+    :rtype: str
+    """
+    field = model._meta.get_field(field_name)
+    target = field.target_field
+    suffix = f'_fk_{target.model._meta.db_table}_{target.column}'
+    # The schema editor is only used for its naming here; it does not connect.
+    return connections[using].schema_editor()._create_index_name(model._meta.db_table, [field.column], suffix)
+
+
+@contextmanager
+def translate_constraint_violations(database, constraint_errors, get_constraint_error):
+    """
+    Run a write in a savepoint on `database`, re-raising an `IntegrityError` of a constraint listed in
+    `constraint_errors` (constraint name -> error key) as `get_constraint_error(constraint)` under the mapped key.
+    Other integrity errors propagate unchanged.
+
+    :raises ValidationError: A listed constraint is violated.
+    """
+    try:
+        # A savepoint keeps an enclosing transaction usable after the failed statement.
+        with transaction.atomic(using=database):
+            yield
+    except DatabaseError as error:
+        constraint = get_violated_constraint(error)
+        if constraint not in constraint_errors:
+            raise
+        detail = get_constraint_error(constraint).detail
+        raise ValidationError({constraint_errors[constraint]: detail}) from error
+
+
+class ConstraintViolationMixin:
+    """
+    Let database constraints validate writes and report their violations as validation errors.
+
+    Instead of checking constraints with extra queries before saving (which is racy under concurrency),
+    `create()` and `update()` run in a savepoint, and an `IntegrityError` of a constraint listed in
+    `constraint_errors` is re-raised as the serializer's `get_constraint_error()` under the mapped key
+    (a field name or `non_field_errors`). Other integrity errors propagate unchanged.
+
+    Serializers listing constraints must define `get_constraint_error(constraint, validated_data)`, returning
+    the `ValidationError` to report for a violated constraint; this is checked when the class is defined.
+
+    Attributes:
+        constraint_errors (dict[str, str]): Constraint name -> error key.
+    """
+    constraint_errors = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.constraint_errors and not callable(getattr(cls, 'get_constraint_error', None)):
+            raise TypeError(f'{cls.__name__} lists `constraint_errors` but defines no `get_constraint_error()`.')
+
+    def create(self, validated_data):
+        with self.translate_constraint_violations(validated_data):
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with self.translate_constraint_violations(validated_data):
+            return super().update(instance, validated_data)
+
+    def translate_constraint_violations(self, validated_data):
+        database = router.db_for_write(self.Meta.model, instance=self.instance)
+        return translate_constraint_violations(
+            database, self.constraint_errors, partial(self.get_constraint_error, validated_data=validated_data)
+        )
+
+
+class OwnedObjectMixin:
+    """
+    Detail views whose `get_queryset()` already filters by `owner_id=request.user.id`.
+
+    The lookup and the ownership check are then one query. When it finds nothing, objects of other users
+    are told apart from missing ones with a second query, only on that error path, and answered by the
+    view's permissions (403) as before, unless `OWNER_LOOKUP_HIDES_OTHER_USERS_OBJECTS` is enabled (404).
+
+    :return: Object of the request user.
+    :rtype: django.db.models.Model
+    """
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if settings.OWNER_LOOKUP_HIDES_OTHER_USERS_OBJECTS:
+                raise
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            model = self.get_queryset().model
+            obj = model._default_manager.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}).first()
+            if obj is None:
+                raise
+            # Raises the permission's error for another user's object.
+            self.check_object_permissions(self.request, obj)
+            raise
+
+
+class IdempotencyMixin:
+    """
+    Let clients retry writes safely with an `Idempotency-Key` header.
+
+    The first response (success or client error) to a request with a key is stored in the cache for
+    `IDEMPOTENCY_KEY_TTL_SECONDS`, per user and key, and replayed for retries (with `Idempotent-Replayed: true`)
+    without running validation or writes again. While the first request is in flight, duplicates get 409;
+    reusing a key for a different request (method, path, query or body) gets 422. Server errors are not
+    stored, so the request can be retried. Requests without the header, and anonymous ones, are unaffected.
+
+    Attributes:
+        idempotent_methods (tuple[str]): Methods the header applies to.
+    """
+    idempotent_methods = ('POST',)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # After authentication: records are per user. Swaps the handler `dispatch()` is about to call.
+        handler_name = request.method.lower()
+        if (request.method in self.idempotent_methods and request.headers.get('Idempotency-Key')
+                and request.user.is_authenticated and hasattr(self, handler_name)):
+            setattr(self, handler_name, partial(self.handle_idempotently, getattr(self, handler_name)))
+
+    def handle_idempotently(self, handler, request, *args, **kwargs):
+        key = request.headers['Idempotency-Key']
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise ValidationError(
+                {'Idempotency-Key': [f'Ensure this header has no more than {IDEMPOTENCY_KEY_MAX_LENGTH} characters.']}
+            )
+        cache_key = get_idempotency_cache_key(request.user.pk, key)
+        fingerprint = self.get_request_fingerprint(request)
+
+        stored = cache.get(cache_key)
+        if stored is None:
+            if not cache.add(f'{cache_key}:lock', True, settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS):
+                raise IdempotentRequestInProgress()
+            try:
+                # Another request may have finished between the lookup and the lock.
+                stored = cache.get(cache_key)
+                if stored is None:
+                    return self.run_and_store(handler, cache_key, fingerprint, request, *args, **kwargs)
+            finally:
+                cache.delete(f'{cache_key}:lock')
+
+        if stored['fingerprint'] != fingerprint:
+            raise IdempotencyKeyReused()
+        return Response(stored['data'], status=stored['status'], headers={'Idempotent-Replayed': 'true'})
+
+    def run_and_store(self, handler, cache_key, fingerprint, request, *args, **kwargs):
+        try:
+            response = handler(request, *args, **kwargs)
+        except APIException as exc:
+            # Client errors are part of the outcome retries must see, e.g. a failed validation.
+            response = self.handle_exception(exc)
+        if response.status_code < 500:
+            cache.set(cache_key, {
+                'fingerprint': fingerprint,
+                'status': response.status_code,
+                # Plain JSON types, for the same reason as in `CacheListMixin`.
+                'data': json.loads(JSONRenderer().render(response.data)) if response.data is not None else None,
+            }, settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+        return response
+
+    @staticmethod
+    def get_request_fingerprint(request):
+        data = request.data
+        if hasattr(data, 'lists'):
+            data = dict(data.lists())
+        payload = json.dumps([request.method, request.get_full_path(), data], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_idempotency_cache_key(user_id, key):
+    # Not matched by `invalidate_user_list()`, which must not drop stored responses.
+    return f'idempotency:{user_id}:{hashlib.sha256(key.encode()).hexdigest()}'
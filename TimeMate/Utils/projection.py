@@ -0,0 +1,113 @@
+# Django imports
+from django.core.exceptions import FieldDoesNotExist
+# DRF imports
+from rest_framework import serializers
+from rest_framework.relations import HyperlinkedIdentityField, ManyRelatedField, PrimaryKeyRelatedField
+
+
+def get_archived_field(field, model):
+    """
+    :return: Name of the column of `model` flagging rows `field` renders no link for, or None.
+    :rtype: str | None
+    """
+    archived_field = getattr(field, 'archived_field', None)
+    if archived_field is None:
+        return None
+    try:
+        model._meta.get_field(archived_field)
+    except FieldDoesNotExist:
+        return None
+    return archived_field
+
+
+def get_serializer_projection(serializer, model, prefix=''):
+    """
+    Map the fields a serializer reads onto model columns.
+
+    Walks the serializer's field tree: plain fields become columns, forward foreign keys rendered by a
+    nested serializer (or read through a dotted source) become `select_related` paths, and foreign keys
+    rendered as ids only need their own column. To-many fields are skipped, as they are served by
+    prefetching and need no columns of this model beyond the primary key.
+
+    :param serializer: Serializer instance (the child for `many=True`).
+    :param model: Model the serializer reads from.
+    :param prefix: Lookup prefix of `model` relative to the queryset's model, e.g. `task__`.
+    :return: `(only fields, select_related paths)`, or None if the serializer reads anything which cannot
+        be mapped to columns (properties, methods, `source='*'` fields), in which case nothing is deferred.
+    :rtype: tuple[set[str], set[str]] | None
+    """
+    fields = {prefix + model._meta.pk.name}
+    related = set()
+    for name, field in serializer.fields.items():
+        if field.write_only or isinstance(field, (serializers.ListSerializer, ManyRelatedField)):
+            continue
+        owner_serializer_class = getattr(serializer, 'owner_serializer_class', None)
+        if name == 'owner' and owner_serializer_class is not None:
+            # Rendered by `OwnerRepresentationMixin` with its own serializer, whatever the declared field is.
+            field, attrs = owner_serializer_class(), ['owner']
+        elif isinstance(field, HyperlinkedIdentityField):
+            attrs = [field.lookup_field]
+            # Flag of rows rendered without a link, where the model has one (see `TimeEntryUrlField`).
+            archived_field = get_archived_field(field, model)
+            if archived_field is not None:
+                fields.add(prefix + archived_field)
+        elif field.source == '*':
+            if not isinstance(field, serializers.BaseSerializer):
+                return None
+            nested = get_serializer_projection(field, model, prefix)
+            if nested is None:
+                return None
+            fields |= nested[0]
+            related |= nested[1]
+            continue
+        else:
+            attrs = field.source_attrs
+
+        current_model, path = model, prefix
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = current_model._meta.pk if attr == 'pk' else current_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                return None
+            last = index == len(attrs) - 1
+            if not model_field.concrete or model_field.many_to_many:
+                return None
+            fields.add(path + model_field.name)
+            if not model_field.is_relation:
+                if not last:
+                    return None
+                break
+            if last and not isinstance(field, serializers.BaseSerializer):
+                # Rendered from the foreign key column alone.
+                if not isinstance(field, PrimaryKeyRelatedField):
+                    return None
+                break
+            related.add(path + model_field.name)
+            current_model, path = model_field.related_model, f'{path}{model_field.name}__'
+            fields.add(path + current_model._meta.pk.name)
+            if last:
+                nested = get_serializer_projection(field, current_model, path)
+                if nested is None:
+                    return None
+                fields |= nested[0]
+                related |= nested[1]
+    return fields, related
+
+
+def project_queryset(queryset, serializer, extra_fields=()):
+    """
+    Restrict the queryset to the columns and joins the serializer needs.
+
+    Replaces any `select_related()` of the queryset. Returns the queryset unchanged when the
+    serializer cannot be mapped (see `get_serializer_projection`).
+
+    :param extra_fields: Columns needed besides the serializer's, e.g. a foreign key used for prefetching.
+    """
+    projection = get_serializer_projection(serializer, queryset.model)
+    if projection is None:
+        return queryset
+    fields, related = projection
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*sorted(related))
+    return queryset.only(*sorted(fields | set(extra_fields)))
@@ -0,0 +1,117 @@
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+# DRF imports
+from rest_framework import status
+from rest_framework.exceptions import APIException
+# Internal imports
+from Task.models import Task
+from TimeEntry.models import ArchivedTimeEntry, TimeEntry, TimeEntryDailyAggregate, TimeEntryExport, TimeEntryImport
+from TimeMate.models import UserShard
+
+# Sharding error codes
+SHARDING_ERROR_CODE_SHARD_MOVE_IN_PROGRESS = "shard_move_in_progress"
+
+# Apps whose tables are split across shards by owner; everything else (users, tokens, ...) lives in `default`.
+SHARDED_APPS = {'Task', 'TimeEntry'}
+# Tables holding a user's sharded rows, in foreign key order.
+SHARDED_MODELS = [Task, TimeEntry, ArchivedTimeEntry, TimeEntryDailyAggregate, TimeEntryImport, TimeEntryExport]
+SHARD_CACHE_TIMEOUT = 3600
+
+User = get_user_model()
+
+
+class ShardMoveInProgress(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Your data is being moved to another database. Please retry in a moment.'
+    default_code = SHARDING_ERROR_CODE_SHARD_MOVE_IN_PROGRESS
+
+
+def get_shard_cache_key(owner_id):
+    return f'user_shard:{owner_id}'
+
+
+def get_owner_shard(owner_id):
+    """
+    Return `(database alias, moving)` of the owner's shard. Owners missing from the shard map live in `default`.
+
+    :param owner_id: Primary key of the user.
+    :rtype: tuple[str, bool]
+    """
+    key = get_shard_cache_key(owner_id)
+    shard = cache.get(key)
+    if shard is None:
+        shard = (
+            UserShard.objects.using(DEFAULT_DB_ALIAS).
+            filter(user_id=owner_id).
+            values_list('database', 'moving').
+            first()
+        ) or (DEFAULT_DB_ALIAS, False)
+        cache.set(key, shard, SHARD_CACHE_TIMEOUT)
+    return tuple(shard)
+
+
+def set_owner_shard(owner_id, database, moving=False):
+    UserShard.objects.using(DEFAULT_DB_ALIAS).update_or_create(
+        user_id=owner_id, defaults={'database': database, 'moving': moving}
+    )
+    cache.delete(get_shard_cache_key(owner_id))
+
+
+def choose_shard_for_new_user(user):
+    return settings.DATABASE_SHARDS[user.pk % len(settings.DATABASE_SHARDS)]
+
+
+def copy_user_to_shard(user, database):
+    """
+    Insert or update the user's row in a shard, so foreign keys of the user's tasks and time entries hold there.
+    """
+    if database == DEFAULT_DB_ALIAS:
+        return
+    fields = [field for field in User._meta.concrete_fields if not field.primary_key]
+    copy = User(**{field.attname: getattr(user, field.attname) for field in User._meta.concrete_fields})
+    User._base_manager.using(database).bulk_create(
+        [copy],
+        update_conflicts=True,
+        unique_fields=[User._meta.pk.name],
+        update_fields=[field.name for field in fields],
+    )
+
+
+def copy_owner_rows(owner_id, source, target, batch_size=1000):
+    """
+    Copy all of the owner's sharded rows from `source` to `target`, which must not hold any of them yet.
+
+    :return: Number of copied rows per model name.
+    :rtype: dict[str, int]
+    """
+    copied = {}
+    for model in SHARDED_MODELS:
+        rows = model._base_manager.using(source).filter(owner_id=owner_id).order_by('pk').iterator(batch_size)
+        copied[model.__name__] = 0
+        batch = []
+        for row in rows:
+            if model is TimeEntryDailyAggregate:
+                # Aggregates are identified by (owner, task, day); their serial ids are local to each database.
+                row.pk = None
+            batch.append(row)
+            if len(batch) == batch_size:
+                copied[model.__name__] += len(model._base_manager.using(target).bulk_create(batch))
+                batch = []
+        if batch:
+            copied[model.__name__] += len(model._base_manager.using(target).bulk_create(batch))
+    return copied
+
+
+def delete_owner_rows(owner_id, database):
+    """
+    Delete all of the owner's sharded rows from a database.
+
+    Runs plain DELETE statements: the ORM would load every row to send `post_delete` signals.
+    """
+    qn = connections[database].ops.quote_name
+    with connections[database].cursor() as cursor:
+        for model in reversed(SHARDED_MODELS):
+            cursor.execute(f'DELETE FROM {qn(model._meta.db_table)} WHERE owner_id = %s', [owner_id])
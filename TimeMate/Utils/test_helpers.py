@@ -18,4 +18,29 @@ def get_error_code(error):
     """
     if isinstance(error, list):
         return error[0].code
-    return error.code
\ No newline at end of file
+    return error.code
+
+
+def get_app_queries(captured_queries):
+    """
+    Filters the SQL statements issued by the application out of captured queries.
+
+    The problem:
+        `assertNumQueries` / `CaptureQueriesContext` also count the profiler's
+        (silk) bookkeeping queries and `EXPLAIN`s, and transaction control
+        statements, none of which depend on the code under test.
+
+    The solution:
+        Keep only statements which neither touch silk tables nor are
+        `EXPLAIN`, `SAVEPOINT` or `RELEASE SAVEPOINT` statements.
+
+    :param captured_queries: `captured_queries` of a `CaptureQueriesContext`.
+    :type captured_queries: list[dict]
+    :return: SQL of the application's queries, in execution order.
+    :rtype: list[str]
+    """
+    return [
+        query['sql'] for query in captured_queries
+        if 'silk_' not in query['sql']
+        and not query['sql'].startswith(('EXPLAIN', 'SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT'))
+    ]
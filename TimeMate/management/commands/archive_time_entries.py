@@ -0,0 +1,41 @@
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+# Internal imports
+from TimeEntry.archive import archive_time_entries_batch, get_archive_cutoff
+from TimeMate.Signals.signals import invalidate_user_list
+
+
+class Command(BaseCommand):
+    help = 'Move time entries older than TIME_ENTRY_ARCHIVE_HORIZON_DAYS into the archive, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.TIME_ENTRY_ARCHIVE_BATCH_SIZE,
+            help='Number of entries moved per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        """
+        The horizon is only read from settings, so list endpoints and this command always agree
+        on which entries can live in the archive.
+        """
+        cutoff = get_archive_cutoff()
+        if cutoff is None:
+            raise CommandError('Archiving is disabled. Set TIME_ENTRY_ARCHIVE_HORIZON_DAYS to enable it.')
+
+        self.stdout.write(f'Archiving time entries which ended before {cutoff}...')
+        total = 0
+        while True:
+            archived_per_owner = archive_time_entries_batch(cutoff, options['batch_size'])
+            if not archived_per_owner:
+                break
+            # Rows are moved with SQL, so no `post_delete` signals fire; invalidate once per owner and batch.
+            for owner_id in archived_per_owner:
+                invalidate_user_list(owner_id)
+            total += sum(archived_per_owner.values())
+            self.stdout.write(f'Archived {total} time entries')
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} time entries in total.'))
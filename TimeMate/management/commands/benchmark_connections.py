@@ -0,0 +1,106 @@
+# Python imports
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.urls import resolve, reverse
+# DRF imports
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory
+# Internal imports
+from Task.models import Task
+from .benchmark_time_entries import BENCHMARK_USERNAME_PREFIX
+
+User = get_user_model()
+
+# (label, environment overrides) of the connection modes compared by `--compare`.
+CONNECTION_MODES = [
+    ('new connection per request', {'POSTGRES_CONN_MAX_AGE': '0', 'POSTGRES_POOL': 'False'}),
+    ('persistent connections', {'POSTGRES_CONN_MAX_AGE': '600', 'POSTGRES_POOL': 'False'}),
+    ('psycopg pool', {'POSTGRES_CONN_MAX_AGE': '0', 'POSTGRES_POOL': 'True'}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark per-request database connection overhead of the task detail endpoint under concurrent load, '
+        'with the connection settings of the current environment or (--compare) with every connection mode.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8, help='Number of concurrent worker threads.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per worker thread.')
+        parser.add_argument('--compare', action='store_true',
+                            help='Run the benchmark once per connection mode, each in a fresh process.')
+
+    def handle(self, *args, **options):
+        if options['compare']:
+            for label, environment in CONNECTION_MODES:
+                self.stdout.write(f'--- {label} ---')
+                self.stdout.flush()
+                subprocess.run(
+                    [sys.executable, '-m', 'django', 'benchmark_connections',
+                     '--concurrency', str(options['concurrency']), '--requests', str(options['requests'])],
+                    env={**os.environ, **environment, 'DJANGO_SETTINGS_MODULE': os.environ['DJANGO_SETTINGS_MODULE']},
+                    cwd=settings.BASE_DIR,
+                    check=True,
+                )
+            return
+
+        user, _ = User.objects.get_or_create(
+            username=f'{BENCHMARK_USERNAME_PREFIX}0', defaults={'email': f'{BENCHMARK_USERNAME_PREFIX}0@example.com'}
+        )
+        task = Task.objects.filter(owner=user).first() or Task.objects.create(name='Benchmark task 0', owner=user)
+        token, _ = Token.objects.get_or_create(user=user)
+        connection.close()
+
+        path = reverse('task_detail', kwargs={'pk': task.pk})
+        view = resolve(path).func
+        factory = APIRequestFactory()
+        headers = {'HTTP_HOST': settings.ALLOWED_HOSTS[0], 'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        timings = []
+        statuses = set()
+        opened = []
+        connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+
+        def worker():
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                # Same connection handling as Django's request_started / request_finished signals.
+                close_old_connections()
+                response = view(factory.get(path, **headers), pk=task.pk)
+                response.render()
+                close_old_connections()
+                statuses.add(response.status_code)
+                timings.append((time.perf_counter() - started) * 1000)
+            connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        timings.sort()
+        # With a pool, Django "connects" on every checkout; count the physical connections the pool opened instead.
+        opened_count = connection.pool.get_stats().get('connections_num', 0) if connection.pool else len(opened)
+        default = settings.DATABASES['default']
+        self.stdout.write(
+            f"CONN_MAX_AGE={default['CONN_MAX_AGE']} pool={default['OPTIONS'].get('pool', False)} "
+            f"health_checks={default['CONN_HEALTH_CHECKS']}"
+        )
+        self.stdout.write(
+            f'{len(timings)} requests, {options["concurrency"]} threads: '
+            f'median {statistics.median(timings):.2f} ms | p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms | '
+            f'{len(timings) / elapsed:.0f} req/s | {opened_count} connections opened | status {sorted(statuses)}'
+        )
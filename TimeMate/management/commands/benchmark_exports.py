@@ -0,0 +1,134 @@
+# Python imports
+import asyncio
+import io
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.urls import reverse
+# DRF imports
+from rest_framework.authtoken.models import Token
+# Internal imports
+from TimeEntry.models import TimeEntry
+from .benchmark_time_entries import BENCHMARK_USERNAME_PREFIX
+
+User = get_user_model()
+
+READ_STEP_SECONDS = 0.01
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark concurrent full exports of one user: the CSV export served synchronously (WSGI, one thread '
+        'per export in flight) against the NDJSON export streamed asynchronously (ASGI, one event loop). '
+        'Seed entries first with `benchmark_time_entries --rows <N>`.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exports', type=int, default=50, help='Concurrent exports.')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Worker threads of the synchronous server, e.g. gunicorn threads.')
+        parser.add_argument('--client-mib-per-second', type=float, default=1,
+                            help='Download speed of each simulated client; slow clients keep an export in flight.')
+
+    def handle(self, *args, **options):
+        user = User.objects.get(username=f'{BENCHMARK_USERNAME_PREFIX}0')
+        token, _ = Token.objects.get_or_create(user=user)
+        self.stdout.write(f'{TimeEntry.objects.filter(owner=user).count()} entries per export, '
+                          f'{options["exports"]} concurrent exports, clients reading {options["client_mib_per_second"]} MiB/s.')
+        connection.close()
+        headers = {'Host': settings.ALLOWED_HOSTS[0], 'Authorization': f'Token {token.key}'}
+        # Seconds a client takes to read one byte.
+        delay = 1 / (options['client_mib_per_second'] * 2 ** 20)
+
+        self.report('sync CSV (WSGI)', *self.run_sync(headers, delay, options['exports'], options['threads']))
+        self.report('async NDJSON (ASGI)', *self.run_async(headers, delay, options['exports']))
+
+    def report(self, label, elapsed, timings, sizes, threads):
+        timings.sort()
+        self.stdout.write(
+            f'{label:<22} total {elapsed:7.2f} s | median {statistics.median(timings):7.2f} s | '
+            f'p95 {timings[max(0, int(len(timings) * 0.95) - 1)]:7.2f} s | '
+            f'{sum(sizes) / elapsed / 2 ** 20:6.1f} MiB/s | peak threads {threads}'
+        )
+
+    def run_sync(self, headers, delay, exports, threads):
+        application = get_wsgi_application()
+        path = reverse('time_entry_export_csv')
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SERVER_NAME': headers['Host'],
+            'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'http',
+            **{f'HTTP_{name.upper()}': value for name, value in headers.items()},
+        }
+
+        def export():
+            started = time.perf_counter()
+            size = 0
+            response = application({**environ, 'wsgi.input': io.BytesIO()}, lambda status, response_headers: None)
+            for part in response:
+                size += len(part)
+                time.sleep(len(part) * delay)
+            response.close()
+            return time.perf_counter() - started, size
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(lambda _: export(), range(exports)))
+        elapsed = time.perf_counter() - started
+        return elapsed, [timing for timing, _ in results], [size for _, size in results], threads + 1
+
+    def run_async(self, headers, delay, exports):
+        application = get_asgi_application()
+        path = reverse('time_entry_export_ndjson')
+        raw_headers = [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+        peak_threads = threading.active_count()
+
+        async def export():
+            nonlocal peak_threads
+            started = time.perf_counter()
+            size = 0
+            # Reading time owed by the client; slept in steps of at least READ_STEP_SECONDS, not once per line.
+            owed = 0
+            disconnected = asyncio.Event()
+
+            async def receive():
+                if not hasattr(receive, 'sent'):
+                    receive.sent = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                nonlocal size, owed, peak_threads
+                if message['type'] == 'http.response.body':
+                    body = message.get('body', b'')
+                    size += len(body)
+                    owed += len(body) * delay
+                    peak_threads = max(peak_threads, threading.active_count())
+                    if owed >= READ_STEP_SECONDS or not message.get('more_body'):
+                        await asyncio.sleep(owed)
+                        owed = 0
+
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+                'headers': raw_headers, 'server': (headers['Host'], 80), 'client': ('127.0.0.1', 0),
+            }
+            await application(scope, receive, send)
+            disconnected.set()
+            return time.perf_counter() - started, size
+
+        async def run():
+            return await asyncio.gather(*(export() for _ in range(exports)))
+
+        started = time.perf_counter()
+        results = asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        return elapsed, [timing for timing, _ in results], [size for _, size in results], peak_threads
@@ -0,0 +1,110 @@
+# Python imports
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+# DRF imports
+from rest_framework.authtoken.models import Token
+# Internal imports
+from Task.models import Task
+from TimeEntry.models import TimeEntry
+from .benchmark_time_entries import BENCHMARK_USERNAME_PREFIX
+
+User = get_user_model()
+
+# (label, environment overrides) of the binding modes compared by `--compare`.
+BINDING_MODES = [
+    ('client-side binding', {'POSTGRES_SERVER_SIDE_BINDING': 'False'}),
+    ('server-side binding', {'POSTGRES_SERVER_SIDE_BINDING': 'True', 'POSTGRES_PREPARE_THRESHOLD': ''}),
+    ('server-side binding + prepared statements',
+     {'POSTGRES_SERVER_SIDE_BINDING': 'True', 'POSTGRES_PREPARE_THRESHOLD': '5'}),
+]
+
+
+def get_hot_queries(user, task, token):
+    """
+    Return `(label, queryset)` of the hot queries: a time entry list page, the unique task name check
+    and the token lookup, written the way the views, validators and `TokenAuthentication` run them.
+    """
+    return [
+        ('time entry list page',
+         TimeEntry.objects.filter(owner=user).select_related('task', 'owner', 'task__owner').order_by('-end_time')[:10]),
+        ('unique task name check',
+         Task.objects.filter(owner=user, name=task.name).values_list('pk', flat=True)[:1]),
+        ('token lookup',
+         Token.objects.select_related('user').filter(key=token.key)[:21]),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the hot queries with the binding settings of the current environment or (--compare) with '
+        'client-side binding, server-side binding and prepared statements, reporting the planning time saved.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000, help='Measured executions per query.')
+        parser.add_argument('--compare', action='store_true',
+                            help='Run the benchmark once per binding mode, each in a fresh process.')
+
+    def handle(self, *args, **options):
+        if options['compare']:
+            for label, environment in BINDING_MODES:
+                self.stdout.write(f'--- {label} ---')
+                self.stdout.flush()
+                subprocess.run(
+                    [sys.executable, '-m', 'django', 'benchmark_prepared_statements',
+                     '--iterations', str(options['iterations'])],
+                    env={**os.environ, **environment, 'DJANGO_SETTINGS_MODULE': os.environ['DJANGO_SETTINGS_MODULE']},
+                    cwd=settings.BASE_DIR,
+                    check=True,
+                )
+            return
+
+        user = User.objects.filter(username=f'{BENCHMARK_USERNAME_PREFIX}0').first()
+        task = Task.objects.filter(owner=user).first()
+        if task is None:
+            raise CommandError('No benchmark data. Run `benchmark_time_entries --rows <N>` first.')
+        token, _ = Token.objects.get_or_create(user=user)
+
+        for label, queryset in get_hot_queries(user, task, token):
+            timings = []
+            # Warm up past the prepare threshold and Postgres' switch from custom to generic plans.
+            for iteration in range(20 + options['iterations']):
+                started = time.perf_counter()
+                list(queryset.all())
+                if iteration >= 20:
+                    timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f'{label:<25} median {statistics.median(timings):.3f} ms | '
+                f'planning {self._get_planning_time(queryset):.3f} ms per unprepared execution'
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*), coalesce(sum(generic_plans), 0), coalesce(sum(custom_plans), 0) '
+                           'FROM pg_prepared_statements')
+            prepared, generic_plans, custom_plans = cursor.fetchone()
+        self.stdout.write(
+            f'{prepared} prepared statements on this connection: '
+            f'{generic_plans} executions reused a generic plan, {custom_plans} were planned again'
+        )
+
+    @staticmethod
+    def _get_planning_time(queryset):
+        """
+        Return the planning time Postgres reports for the query, i.e. what a prepared statement saves per execution.
+        """
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Planning Time']
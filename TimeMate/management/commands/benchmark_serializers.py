@@ -0,0 +1,80 @@
+# Python imports
+import statistics
+import time
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+# DRF imports
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+# Internal imports
+from Task.models import Task
+from Task.serializers import TaskListSerializer
+from TimeEntry.models import TimeEntry
+from TimeEntry.serializers import TimeEntryListSerializer
+from TimeMate.Utils.compiled_serializers import compile_serializer
+from .benchmark_time_entries import BENCHMARK_USERNAME_PREFIX
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the throughput of the list serializers against their compiled equivalents (see '
+        '`TimeMate.Utils.compiled_serializers`), rendering the same rows of one user to JSON. '
+        'Seed entries first with `benchmark_time_entries --rows <N>`.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows rendered per iteration.')
+        parser.add_argument('--iterations', type=int, default=20, help='Measured iterations per serializer.')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=f'{BENCHMARK_USERNAME_PREFIX}0').first()
+        if user is None:
+            raise CommandError('No benchmark data; run `benchmark_time_entries --rows <N>` first.')
+        request = Request(APIRequestFactory().get('/', HTTP_HOST=settings.ALLOWED_HOSTS[0]))
+        context = {'request': request, 'format': None, 'view': None}
+        # Ordered and joined like the list views read them.
+        querysets = [
+            (TimeEntryListSerializer,
+             TimeEntry.objects.filter(owner=user).select_related('task').order_by('-end_time')[:options['rows']]),
+            (TaskListSerializer, Task.objects.filter(owner=user).order_by('-created_at')[:options['rows']]),
+        ]
+        for serializer_class, queryset in querysets:
+            compiled = compile_serializer(serializer_class, queryset.model)
+            instances = list(queryset)
+            rows = list(queryset.values_list(*compiled.lookups))
+            if JSONRenderer().render(compiled.render(rows, context)) != JSONRenderer().render(
+                    serializer_class(instances, many=True, context=context).data):
+                raise CommandError(f'{serializer_class.__name__}: compiled output differs.')
+
+            self.stdout.write(f'--- {serializer_class.__name__}, {len(rows)} rows ---')
+            self.report('serializer', len(rows), self.measure(
+                lambda: serializer_class(instances, many=True, context=context).data, options['iterations']
+            ))
+            self.report('compiled', len(rows), self.measure(
+                lambda: compiled.render(rows, context), options['iterations']
+            ))
+            # Including the query: model instances against `values_list()` rows.
+            self.report('serializer + query', len(rows), self.measure(
+                lambda: serializer_class(queryset.all(), many=True, context=context).data, options['iterations']
+            ))
+            self.report('compiled + query', len(rows), self.measure(
+                lambda: compiled.render(queryset.values_list(*compiled.lookups), context), options['iterations']
+            ))
+
+    def measure(self, render, iterations):
+        render()
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def report(self, label, rows, timings):
+        median = statistics.median(timings)
+        self.stdout.write(f'{label:<20} median {median * 1000:8.2f} ms | {rows / median:10.0f} rows/s')
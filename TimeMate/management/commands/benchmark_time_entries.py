@@ -0,0 +1,159 @@
+# Python imports
+import statistics
+import time
+from datetime import timedelta
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+# DRF imports
+from rest_framework.test import APIRequestFactory, force_authenticate
+# Internal imports
+from Task.models import Task
+from TimeEntry.models import TimeEntry
+from TimeEntry.partitioning import get_partition_key
+from TimeMate.Signals.signals import invalidate_user_list
+
+User = get_user_model()
+
+BENCHMARK_USERNAME_PREFIX = 'benchmark_user_'
+TASKS_PER_USER = 10
+SEED_BATCH_SIZE = 1_000_000
+SEED_WINDOW_DAYS = 3 * 365
+
+
+def get_benchmark_cases(now):
+    """
+    Return `(label, url name, query params)` of the measured list and filter requests.
+    """
+    return [
+        ('list', 'time_entry_list_create', {}),
+        ('filter start_time (last 30 days)', 'time_entry_list_create',
+         {'start_time_after': (now - timedelta(days=30)).isoformat()}),
+        ('filter end_time (older than 1 year)', 'time_entry_list_create',
+         {'end_time_before': (now - timedelta(days=365)).isoformat()}),
+        ('filter overlaps (2h window, 90 days ago)', 'time_entry_list_create',
+         {'overlaps_after': (now - timedelta(days=90)).isoformat(),
+          'overlaps_before': (now - timedelta(days=90, hours=-2)).isoformat()}),
+        ('sorted-by-date', 'time_entry_sorted_by_date', {}),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the time entry list and filter endpoints. '
+        'Optionally seeds synthetic entries spread over the last three years for benchmark users.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=0,
+                            help='Number of synthetic time entries to insert before measuring (0 = reuse existing).')
+        parser.add_argument('--users', type=int, default=100,
+                            help='Number of benchmark users the seeded entries are spread across.')
+        parser.add_argument('--iterations', type=int, default=20, help='Measured requests per case.')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per case.')
+
+    def handle(self, *args, **options):
+        users = self._get_or_create_users(options['users'])
+        if options['rows']:
+            self._seed_time_entries(users, options['rows'])
+
+        user = users[0]
+        table = TimeEntry._meta.db_table
+        partition_key = get_partition_key(table)
+        self.stdout.write(
+            f'Table: {table} ({f"partitioned by {partition_key}" if partition_key else "not partitioned"}), '
+            f'{self._estimate_rows(table)} rows (estimate), '
+            f'{TimeEntry.objects.filter(owner=user).count()} rows of the measured user.'
+        )
+
+        factory = APIRequestFactory()
+        host = settings.ALLOWED_HOSTS[0]
+        for label, url_name, params in get_benchmark_cases(timezone.now()):
+            path = reverse(url_name)
+            view = resolve(path).func
+            timings = []
+            queries = 0
+            for iteration in range(options['warmup'] + options['iterations']):
+                # Measure the database path, not `CacheListMixin`.
+                invalidate_user_list(user.id)
+                request = factory.get(path, params, HTTP_HOST=host)
+                force_authenticate(request, user=user)
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = view(request)
+                    response.render()
+                    elapsed = time.perf_counter() - started
+                if iteration >= options['warmup']:
+                    timings.append(elapsed * 1000)
+                    queries = len(captured)
+            timings.sort()
+            p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+            self.stdout.write(
+                f'{label:<45} median {statistics.median(timings):8.2f} ms | '
+                f'p95 {p95:8.2f} ms | {queries} queries | status {response.status_code}'
+            )
+
+    def _get_or_create_users(self, amount):
+        users = []
+        for idx in range(amount):
+            user, created = User.objects.get_or_create(
+                username=f'{BENCHMARK_USERNAME_PREFIX}{idx}',
+                defaults={'email': f'{BENCHMARK_USERNAME_PREFIX}{idx}@example.com'}
+            )
+            if created:
+                Task.objects.bulk_create(
+                    Task(name=f'Benchmark task {task_idx}', owner=user) for task_idx in range(TASKS_PER_USER)
+                )
+            users.append(user)
+        return users
+
+    def _seed_time_entries(self, users, rows):
+        """
+        Insert synthetic entries (5 - 120 minutes long) with `generate_series`, in batches.
+        Entries are spread evenly over the last SEED_WINDOW_DAYS and across all benchmark tasks.
+        """
+        task_ids = [
+            str(task_id) for task_id in
+            Task.objects.filter(owner__in=users).order_by('owner_id', 'name').values_list('id', flat=True)
+        ]
+        step_seconds = SEED_WINDOW_DAYS * 24 * 3600 / rows
+        qn = connection.ops.quote_name
+        sql = f"""
+            INSERT INTO {qn(TimeEntry._meta.db_table)} (id, task_id, owner_id, start_time, end_time, created_at)
+            SELECT gen_random_uuid(), t.id, t.owner_id,
+                   now() - make_interval(secs => g.i * %(step)s),
+                   now() - make_interval(secs => g.i * %(step)s) + make_interval(mins => (5 + (g.i * 7919) %% 115)::int),
+                   now()
+            FROM generate_series(%(first)s::bigint, %(last)s::bigint) AS g(i)
+            JOIN unnest(%(task_ids)s::uuid[]) WITH ORDINALITY AS ids(id, position)
+              ON ids.position = g.i %% %(task_count)s + 1
+            JOIN {qn(Task._meta.db_table)} t ON t.id = ids.id
+        """
+        for first in range(1, rows + 1, SEED_BATCH_SIZE):
+            last = min(first + SEED_BATCH_SIZE - 1, rows)
+            with connection.cursor() as cursor:
+                cursor.execute(sql, {
+                    'step': step_seconds, 'first': first, 'last': last,
+                    'task_ids': task_ids, 'task_count': len(task_ids),
+                })
+            self.stdout.write(f'Seeded {last}/{rows} time entries')
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {qn(TimeEntry._meta.db_table)}')
+        for user in users:
+            invalidate_user_list(user.id)
+
+    @staticmethod
+    def _estimate_rows(table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                # A partitioned parent holds no rows itself, so only plain tables (the table or its partitions) count.
+                "SELECT coalesce(sum(c.reltuples), 0)::bigint FROM pg_class c WHERE c.relkind = 'r' AND "
+                "(c.oid = to_regclass(%s) OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(%s)))",
+                [connection.ops.quote_name(table)] * 2
+            )
+            return cursor.fetchone()[0]
@@ -0,0 +1,53 @@
+# Python imports
+from datetime import datetime, timezone as dt_timezone
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+# Internal imports
+from TimeEntry.models import TimeEntry
+from TimeEntry.partitioning import (
+    add_months,
+    create_month_partitions,
+    get_oldest_default_partition_row,
+    get_partition_key,
+    month_start,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Create upcoming monthly partitions of the time entries table and move rows out of the default partition. '
+        'Meant to be run periodically (e.g. daily).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=settings.TIME_ENTRY_PARTITION_MONTHS_AHEAD,
+            help='Number of months after the current one to create partitions for.'
+        )
+
+    def handle(self, *args, **options):
+        table = TimeEntry._meta.db_table
+        partition_key = get_partition_key(table)
+        if partition_key is None:
+            raise CommandError(
+                'The time entries table is not partitioned. Set TIME_ENTRY_PARTITION_KEY and run the migrations.'
+            )
+
+        current_month = month_start(datetime.now(dt_timezone.utc))
+        with transaction.atomic():
+            # Rows of past months without a partition sit in the default partition; give them their own too.
+            oldest_default_row = get_oldest_default_partition_row(table)
+            first_month = min(current_month, month_start(oldest_default_row)) if oldest_default_row else current_month
+            created = create_month_partitions(
+                table, first_month, add_months(current_month, options['months_ahead'])
+            )
+
+        for name in created:
+            self.stdout.write(f'Partition "{name}": Created')
+        self.stdout.write(self.style.SUCCESS(
+            f'Time entries partitioned by {partition_key}: {len(created)} new partitions.'
+        ))
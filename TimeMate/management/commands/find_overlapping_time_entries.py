@@ -0,0 +1,40 @@
+# Django imports
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+# Internal imports
+from TimeEntry.models import TimeEntry
+
+
+class Command(BaseCommand):
+    help = 'Report time entries that overlap another entry of the same owner.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, help='Only check entries of the user with this id.')
+
+    def handle(self, *args, **options):
+        """
+        Find overlapping entries with a single query.
+        Each entry is probed with an `EXISTS (... time_range && ...)` subquery served by the GiST index
+        on `time_range`, so entries are never loaded into Python for pairwise comparison.
+        """
+        entries = TimeEntry.objects.all()
+        if options['owner'] is not None:
+            entries = entries.filter(owner_id=options['owner'])
+
+        overlapping_entry = TimeEntry.objects.filter(
+            owner_id=OuterRef('owner_id'),
+            time_range__overlap=OuterRef('time_range'),
+        ).exclude(pk=OuterRef('pk'))
+
+        found = 0
+        rows = (entries.filter(Exists(overlapping_entry))
+                .order_by('owner_id', 'start_time')
+                .values_list('owner_id', 'id', 'start_time', 'end_time'))
+        for owner_id, entry_id, start_time, end_time in rows.iterator():
+            found += 1
+            self.stdout.write(f'User {owner_id}: TimeEntry {entry_id} [{start_time} - {end_time}]')
+
+        if found:
+            self.stdout.write(self.style.WARNING(f'Found {found} overlapping time entries.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('No overlapping time entries found.'))
@@ -0,0 +1,75 @@
+# Python imports
+import os
+import sys
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+# Internal imports
+from TimeEntry.importing import (
+    IMPORT_FORMAT_CSV,
+    IMPORT_FORMAT_NDJSON,
+    IMPORT_FORMATS,
+    ImportInProgress,
+    iter_import_rows,
+    run_import,
+    start_import,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream time entries of one user from a CSV (task,start_time,end_time) or NDJSON file, creating '
+        'missing tasks by name. Re-running an interrupted import of the same source resumes it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for standard input.')
+        parser.add_argument('--user', required=True, help='Username of the owner of the imported entries.')
+        parser.add_argument('--format', choices=IMPORT_FORMATS,
+                            help='Input format; guessed from the file extension by default.')
+        parser.add_argument('--source',
+                            help='Name of the import checkpoint; the absolute path of the file by default.')
+        parser.add_argument('--batch-size', type=int, default=settings.TIME_ENTRY_IMPORT_BATCH_SIZE,
+                            help='Number of rows inserted per transaction.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['format'] or (
+            IMPORT_FORMAT_CSV if path.lower().endswith('.csv') else IMPORT_FORMAT_NDJSON
+        )
+        source = options['source'] or ('stdin' if path == '-' else os.path.abspath(path))
+        try:
+            owner = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["user"]} does not exist.')
+
+        time_entry_import = start_import(owner, source)
+        if time_entry_import.rows_processed:
+            self.stdout.write(f'Resuming {source} after row {time_entry_import.rows_processed}...')
+
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        try:
+            errors = run_import(
+                time_entry_import,
+                iter_import_rows(stream, import_format),
+                batch_size=options['batch_size'],
+                on_batch=self._report_progress,
+            )
+        except ImportInProgress as error:
+            raise CommandError(str(error.detail))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for row_number, detail in errors:
+            self.stderr.write(f'Row {row_number}: {detail}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {time_entry_import.rows_imported} time entries from {time_entry_import.rows_processed} rows '
+            f'({time_entry_import.rows_failed} rejected).'
+        ))
+
+    def _report_progress(self, time_entry_import):
+        self.stdout.write(f'Processed {time_entry_import.rows_processed} rows')
@@ -0,0 +1,43 @@
+# Python imports
+import os
+import socket
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+# Internal imports
+from TimeEntry.ingestion import ensure_consumer_group, get_ingest_redis, process_messages, read_messages
+
+
+class Command(BaseCommand):
+    help = (
+        'Insert time entries queued by POST /time-entries/ingest/, in batches. Run as many workers as needed; '
+        'messages of a crashed worker are taken over after TIME_ENTRY_INGEST_CLAIM_IDLE_SECONDS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.TIME_ENTRY_INGEST_BATCH_SIZE,
+                            help='Messages read and inserted at once.')
+        parser.add_argument('--block-seconds', type=float, default=5,
+                            help='How long to wait for new messages before checking for abandoned ones again.')
+        parser.add_argument('--consumer', default=f'{socket.gethostname()}-{os.getpid()}',
+                            help='Name of this worker in the consumer group; keep it stable across restarts.')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is drained.')
+
+    def handle(self, *args, **options):
+        redis = get_ingest_redis()
+        ensure_consumer_group(redis)
+        self.stdout.write(f'Ingesting time entries from {settings.TIME_ENTRY_INGEST_STREAM} as {options["consumer"]}...')
+
+        block_ms = int(options['block_seconds'] * 1000)
+        while True:
+            messages = read_messages(redis, options['consumer'], options['batch_size'], block_ms)
+            if not messages:
+                if options['once']:
+                    break
+                continue
+            result = process_messages(redis, messages)
+            for error in result.errors:
+                self.stderr.write(f'Batch left pending for a retry: {error}')
+            self.stdout.write(f'Inserted {result.inserted} time entries, dead-lettered {result.dead_lettered}')
+
+        self.stdout.write(self.style.SUCCESS('Ingestion queue drained.'))
@@ -0,0 +1,77 @@
+# Python imports
+import time
+# Django imports
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+# Internal imports
+from TimeMate.Signals.signals import invalidate_user_list
+from TimeMate.Utils.sharding import (
+    copy_owner_rows,
+    copy_user_to_shard,
+    delete_owner_rows,
+    get_owner_shard,
+    set_owner_shard,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Move one user's tasks and time entries to another shard while the API stays up. "
+        "Reads keep being served during the move; writes of that user are answered with 503 until it finishes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='User to move.')
+        parser.add_argument('shard', help='Target database alias, one of DATABASE_SHARDS.')
+        parser.add_argument(
+            '--drain-seconds',
+            type=float,
+            default=2,
+            help='Time given to requests already writing to the old shard before rows are copied.'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows inserted per statement.')
+
+    def handle(self, *args, **options):
+        """
+        1. Mark the user as moving: new writes are refused, in-flight ones get `--drain-seconds` to finish.
+        2. Copy the user row and all sharded rows to the target shard in one transaction.
+        3. Point the shard map at the target, which ends the write freeze.
+        4. Delete the rows from the old shard.
+        """
+        target = options['shard']
+        if target not in settings.DATABASE_SHARDS:
+            raise CommandError(f'Unknown shard "{target}". Configured shards: {settings.DATABASE_SHARDS}')
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["username"]}" does not exist.')
+        source, moving = get_owner_shard(user.pk)
+        if moving:
+            raise CommandError(f'User "{user.username}" is already being moved.')
+        if source == target:
+            raise CommandError(f'User "{user.username}" already lives in "{target}".')
+
+        set_owner_shard(user.pk, source, moving=True)
+        try:
+            time.sleep(options['drain_seconds'])
+            copy_user_to_shard(user, target)
+            with transaction.atomic(using=target):
+                # Leftovers of an earlier, interrupted move would collide with the copied rows.
+                delete_owner_rows(user.pk, target)
+                copied = copy_owner_rows(user.pk, source, target, options['batch_size'])
+        except BaseException:
+            set_owner_shard(user.pk, source)
+            raise
+        set_owner_shard(user.pk, target)
+
+        with transaction.atomic(using=source):
+            delete_owner_rows(user.pk, source)
+        invalidate_user_list(user.pk)
+
+        for model_name, count in copied.items():
+            self.stdout.write(f'{model_name}: {count} rows moved')
+        self.stdout.write(self.style.SUCCESS(f'User "{user.username}" moved from "{source}" to "{target}".'))
@@ -0,0 +1,44 @@
+# Python imports
+import time
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+# Internal imports
+from TimeEntry.export_jobs import claim_export, delete_expired_exports, run_export
+
+
+class Command(BaseCommand):
+    help = (
+        'Write the background exports requested with POST /exports/ to files, one at a time, and delete expired '
+        'ones. Run as many workers as needed; exports of a crashed worker are taken over after '
+        'TIME_ENTRY_EXPORT_STALE_SECONDS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-seconds', type=float, default=5,
+                            help='How long to wait before looking for new exports when none is pending.')
+        parser.add_argument('--once', action='store_true', help='Exit once no export is pending.')
+
+    def handle(self, *args, **options):
+        databases = settings.DATABASE_SHARDS or [DEFAULT_DB_ALIAS]
+        while True:
+            ran = 0
+            for database in databases:
+                deleted = delete_expired_exports(database)
+                if deleted:
+                    self.stdout.write(f'Deleted {deleted} expired exports from {database}')
+                while (export := claim_export(database)) is not None:
+                    ran += 1
+                    try:
+                        run_export(export)
+                    except Exception as error:
+                        self.stderr.write(f'Export {export.id} failed: {error}')
+                        continue
+                    self.stdout.write(f'Export {export.id}: {export.rows_exported} time entries written')
+            if not ran:
+                if options['once']:
+                    break
+                time.sleep(options['poll_seconds'])
+
+        self.stdout.write(self.style.SUCCESS('No export pending.'))
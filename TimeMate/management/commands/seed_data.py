@@ -10,6 +10,7 @@ from rest_framework.authtoken.models import Token
 # Internal imports
 from Task.models import Task
 from TimeEntry.models import TimeEntry
+from TimeMate.Signals.signals import invalidate_user_list
 from .demo_tasks import DEMO_TASKS
 
 User = get_user_model()
@@ -115,10 +116,17 @@ class Command(BaseCommand):
         Seed the TimeEntry model for each Task with multiple entries.
         Each entry has a random duration between MIN and MAX minutes.
         Entries are non-overlapping and distributed over the last week.
+        All new entries are inserted with a single `bulk_create`; `duration` is computed by the database.
         """
         now = timezone.now()
         start_window = now - timedelta(days=SEED_WINDOW_DAYS)
 
+        # Fetch already seeded entries in one query instead of one `get_or_create` per entry.
+        existing = set(
+            TimeEntry.objects.filter(owner=owner, task__in=tasks).values_list('task_id', 'start_time')
+        )
+        new_entries = []
+
         for task in tasks:
             current_start = start_window
             for idx in range(ENTRIES_PER_TASK):
@@ -132,12 +140,11 @@ class Command(BaseCommand):
                 entry_start = current_start
                 entry_end = entry_start + duration
 
-                entry, created = TimeEntry.objects.get_or_create(
-                    task=task,
-                    owner=owner,
-                    start_time=entry_start,
-                    defaults={'end_time': entry_end},
-                )
+                created = (task.id, entry_start) not in existing
+                if created:
+                    new_entries.append(
+                        TimeEntry(task=task, owner=owner, start_time=entry_start, end_time=entry_end)
+                    )
                 status = 'Created' if created else 'Exists'
                 self.stdout.write(
                     f'TimeEntry [{entry_start} - {entry_end}] ' \
@@ -146,3 +153,7 @@ class Command(BaseCommand):
 
                 # Move start forward to avoid overlap
                 current_start = entry_end
+
+        TimeEntry.objects.bulk_create(new_entries)
+        # `bulk_create` does not send `post_save`, so drop the owner's cached lists explicitly.
+        invalidate_user_list(owner.id)
@@ -0,0 +1,29 @@
+# Python imports
+from datetime import timedelta
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+# Internal imports
+from TimeEntry.timers import sweep_abandoned_timers
+
+
+class Command(BaseCommand):
+    help = (
+        'Discard running timers started more than TIME_ENTRY_TIMER_ABANDONED_AFTER_HOURS ago, without saving '
+        'them as time entries. Meant to be run periodically, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-hours', type=int, default=settings.TIME_ENTRY_TIMER_ABANDONED_AFTER_HOURS,
+                            help='Age from which a running timer counts as abandoned.')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the timers which would be discarded.')
+
+    def handle(self, *args, **options):
+        started_before = timezone.now() - timedelta(hours=options['older_than_hours'])
+        swept = sweep_abandoned_timers(started_before, dry_run=options['dry_run'])
+        for user_id, timer in swept:
+            self.stdout.write(f'User {user_id}: timer on task {timer["task"]} started at {timer["started_at"].isoformat()}')
+
+        action = 'Would discard' if options['dry_run'] else 'Discarded'
+        self.stdout.write(self.style.SUCCESS(f'{action} {len(swept)} abandoned timers.'))
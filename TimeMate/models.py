@@ -0,0 +1,20 @@
+# Django imports
+from django.conf import settings
+from django.db import models
+
+
+class UserShard(models.Model):
+    """
+    Shard map entry: the database holding a user's tasks and time entries.
+
+    Lives in the `default` database only. Users without an entry are stored in `default`.
+    While `moving` is set, the user's data is being moved by `move_user_to_shard` and writes are refused.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True,
+                                related_name='shard')
+    database = models.CharField(max_length=64)
+    moving = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.database}'
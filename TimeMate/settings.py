@@ -35,6 +35,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # 3rd-party apps
     'django_filters',
     'rest_framework',
@@ -55,6 +56,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'TimeMate.Utils.middleware.ReplicaRoutingMiddleware',
+    'TimeMate.Utils.middleware.ShardRoutingMiddleware',
     'silk.middleware.SilkyMiddleware',
 ]
 
@@ -81,6 +84,29 @@ WSGI_APPLICATION = 'TimeMate.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Connection reuse: either keep each worker's connection open between requests (`POSTGRES_CONN_MAX_AGE`
+# seconds, `None` = unlimited, `0` = new connection per request), or share a psycopg pool (`POSTGRES_POOL`).
+# Health checks make sure a reused connection still works before a request uses it.
+POSTGRES_CONN_MAX_AGE = os.getenv('POSTGRES_CONN_MAX_AGE', '0')
+POSTGRES_POOL = os.getenv('POSTGRES_POOL', 'False') == 'True'
+if POSTGRES_POOL and POSTGRES_CONN_MAX_AGE != '0':
+    raise ImproperlyConfigured('POSTGRES_POOL cannot be combined with POSTGRES_CONN_MAX_AGE; set it to 0.')
+# Server-side parameter binding; with it, psycopg prepares every query executed `POSTGRES_PREPARE_THRESHOLD` times
+# on a connection (empty = never), keeping the `POSTGRES_PREPARED_MAX` most used ones, so Postgres skips
+# re-planning hot queries. Only pays off when connections are reused (persistent connections or the pool).
+POSTGRES_SERVER_SIDE_BINDING = os.getenv('POSTGRES_SERVER_SIDE_BINDING', 'False') == 'True'
+POSTGRES_PREPARE_THRESHOLD = os.getenv('POSTGRES_PREPARE_THRESHOLD', '5')
+POSTGRES_PREPARE_THRESHOLD = int(POSTGRES_PREPARE_THRESHOLD) if POSTGRES_PREPARE_THRESHOLD else None
+POSTGRES_PREPARED_MAX = int(os.getenv('POSTGRES_PREPARED_MAX', '100'))
+# Set when connections go through a transaction-mode pooler (e.g. PgBouncer), which may run consecutive
+# statements of one client on different server connections where its prepared statements do not exist.
+POSTGRES_TRANSACTION_POOLER = os.getenv('POSTGRES_TRANSACTION_POOLER', 'False') == 'True'
+if POSTGRES_SERVER_SIDE_BINDING and POSTGRES_PREPARE_THRESHOLD is not None and POSTGRES_TRANSACTION_POOLER:
+    raise ImproperlyConfigured(
+        'Prepared statements are unsafe behind a transaction-mode pooler; '
+        'set POSTGRES_PREPARE_THRESHOLD to an empty value to only use server-side binding.'
+    )
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -89,8 +115,64 @@ DATABASES = {
         'PASSWORD': get_env_variable('POSTGRES_PASSWORD'),
         'HOST': os.getenv('POSTGRES_HOST', 'db'),
         'PORT': os.getenv('POSTGRES_PORT', '5432'),
+        'CONN_MAX_AGE': None if POSTGRES_CONN_MAX_AGE == 'None' else int(POSTGRES_CONN_MAX_AGE),
+        'CONN_HEALTH_CHECKS': os.getenv('POSTGRES_CONN_HEALTH_CHECKS', 'True') == 'True',
+        # Server-side cursors (used by `.iterator()`, e.g. for exports) do not survive a transaction-mode pooler.
+        'DISABLE_SERVER_SIDE_CURSORS': POSTGRES_TRANSACTION_POOLER,
+        'OPTIONS': {
+            **({
+                'pool': {
+                    'min_size': int(os.getenv('POSTGRES_POOL_MIN_SIZE', '2')),
+                    'max_size': int(os.getenv('POSTGRES_POOL_MAX_SIZE', '10')),
+                    # Seconds a request waits for a free connection before failing.
+                    'timeout': float(os.getenv('POSTGRES_POOL_TIMEOUT', '10')),
+                },
+            } if POSTGRES_POOL else {}),
+            **({
+                'server_side_binding': True,
+                'prepare_threshold': POSTGRES_PREPARE_THRESHOLD,
+            } if POSTGRES_SERVER_SIDE_BINDING else {}),
+        },
     }
 }
+
+# Optional read replicas: comma-separated `host[:port][/database]` entries; missing parts are taken from `default`.
+# Safe-method requests read from a replica (see `TimeMate.Utils.db_routers`), everything else uses `default`.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(filter(None, os.getenv('POSTGRES_REPLICAS', '').split(','))):
+    address, _, replica_name = replica.strip().partition('/')
+    replica_host, _, replica_port = address.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'NAME': replica_name or DATABASES['default']['NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+# Optional owner-based sharding: comma-separated `host[:port][/database]` entries of additional shards.
+# `default` is always the first shard and keeps users and the shard map (see `TimeMate.Utils.sharding`).
+DATABASE_SHARDS = []
+for index, shard in enumerate(filter(None, os.getenv('POSTGRES_SHARDS', '').split(',')), start=1):
+    address, _, shard_name = shard.strip().partition('/')
+    shard_host, _, shard_port = address.partition(':')
+    DATABASES[f'shard_{index}'] = {
+        **DATABASES['default'],
+        'HOST': shard_host,
+        'PORT': shard_port or DATABASES['default']['PORT'],
+        'NAME': shard_name or DATABASES['default']['NAME'],
+    }
+    DATABASE_SHARDS.append(f'shard_{index}')
+if DATABASE_SHARDS:
+    DATABASE_SHARDS.insert(0, 'default')
+DATABASE_ROUTERS = [
+    'TimeMate.Utils.db_routers.OwnerShardRouter',
+    'TimeMate.Utils.db_routers.PrimaryReplicaRouter',
+]
+# Clients are pinned to the primary for this long after writing; keep it above the accepted replica lag.
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv('DATABASE_REPLICA_PIN_SECONDS', '5'))
+DATABASE_REPLICA_MAX_LAG_SECONDS = float(os.getenv('DATABASE_REPLICA_MAX_LAG_SECONDS', '1'))
+DATABASE_REPLICA_LAG_CHECK_SECONDS = float(os.getenv('DATABASE_REPLICA_LAG_CHECK_SECONDS', '5'))
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -141,11 +223,20 @@ CACHES = {
         }
     }
 }
+# Token -> user lookups of `CachedTokenAuthentication`: shared via Redis, and per process in a small LRU.
+# Invalidation on token or user changes reaches the LRUs of other processes only after their timeout.
+AUTH_TOKEN_CACHE_SECONDS = int(os.getenv('AUTH_TOKEN_CACHE_SECONDS', '60'))
+AUTH_TOKEN_LOCAL_CACHE_SECONDS = float(os.getenv('AUTH_TOKEN_LOCAL_CACHE_SECONDS', '5'))
+AUTH_TOKEN_LOCAL_CACHE_SIZE = int(os.getenv('AUTH_TOKEN_LOCAL_CACHE_SIZE', '1024'))
+# Responses to writes sent with an `Idempotency-Key` header are replayed to retries for this long.
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_KEY_TTL_SECONDS', str(24 * 3600)))
+# Upper bound on how long a request holds its key; duplicates arriving meanwhile get 409.
+IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = int(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT_SECONDS', '60'))
 # Django Rest Framework Settings
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'TimeMate.Utils.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     # 'DEFAULT_FILTER_BACKENDS': (
@@ -154,6 +245,50 @@ REST_FRAMEWORK = {
 
 }
 
+# Detail endpoints look objects up among the request user's own. Objects of other users are answered with
+# 403 by default; when enabled, with 404 instead, so their existence is not revealed (and no extra query is run).
+OWNER_LOOKUP_HIDES_OTHER_USERS_OBJECTS = os.getenv('OWNER_LOOKUP_HIDES_OTHER_USERS_OBJECTS', 'False') == 'True'
+# List endpoints render pages from `values_list()` rows with compiled serializers (same output, without a DRF
+# field call per value); disable to list through the regular serializers.
+COMPILED_LIST_SERIALIZERS = os.getenv('COMPILED_LIST_SERIALIZERS', 'True') == 'True'
+
+# Time entries
+# When enabled, creating or updating a time entry that overlaps another entry of the same owner is rejected.
+TIME_ENTRY_REJECT_OVERLAPS = os.getenv('TIME_ENTRY_REJECT_OVERLAPS', 'False') == 'True'
+# Largest number of entries accepted by one `POST /time-entries/bulk/` request.
+TIME_ENTRY_BULK_MAX_SIZE = int(os.getenv('TIME_ENTRY_BULK_MAX_SIZE', '500'))
+# Optional monthly range partitioning of the time entries table: `start_time`, `end_time` or empty (disabled).
+# Applied by the `TimeEntry` migrations; future partitions are created by `create_time_entry_partitions`.
+TIME_ENTRY_PARTITION_KEY = os.getenv('TIME_ENTRY_PARTITION_KEY', '')
+TIME_ENTRY_PARTITION_MONTHS_AHEAD = int(os.getenv('TIME_ENTRY_PARTITION_MONTHS_AHEAD', '3'))
+# Optional archiving: entries which ended more than this many days ago are moved to the archive by
+# `archive_time_entries`. Empty disables archiving, and list endpoints then never read the archive.
+TIME_ENTRY_ARCHIVE_HORIZON_DAYS = int(os.getenv('TIME_ENTRY_ARCHIVE_HORIZON_DAYS')) if os.getenv('TIME_ENTRY_ARCHIVE_HORIZON_DAYS') else None
+TIME_ENTRY_ARCHIVE_BATCH_SIZE = int(os.getenv('TIME_ENTRY_ARCHIVE_BATCH_SIZE', '10000'))
+# Rows validated and inserted per transaction by streamed imports (`/time-entries/import/`, `import_time_entries`).
+TIME_ENTRY_IMPORT_BATCH_SIZE = int(os.getenv('TIME_ENTRY_IMPORT_BATCH_SIZE', '1000'))
+# Optional write-behind ingestion: `POST /time-entries/ingest/` appends entries to a Redis stream and answers 202;
+# `ingest_time_entries` workers insert them in batches. Producers get 503 while the backlog is at its maximum.
+TIME_ENTRY_INGEST_ENABLED = os.getenv('TIME_ENTRY_INGEST_ENABLED', 'False') == 'True'
+TIME_ENTRY_INGEST_STREAM = os.getenv('TIME_ENTRY_INGEST_STREAM', 'time_entry_ingest')
+TIME_ENTRY_INGEST_MAX_BACKLOG = int(os.getenv('TIME_ENTRY_INGEST_MAX_BACKLOG', '100000'))
+TIME_ENTRY_INGEST_BATCH_SIZE = int(os.getenv('TIME_ENTRY_INGEST_BATCH_SIZE', '500'))
+# Messages a worker took but did not acknowledge for this long (e.g. it crashed) are taken over by another worker;
+# after this many deliveries they are moved to the dead-letter stream instead.
+TIME_ENTRY_INGEST_CLAIM_IDLE_SECONDS = int(os.getenv('TIME_ENTRY_INGEST_CLAIM_IDLE_SECONDS', '60'))
+TIME_ENTRY_INGEST_MAX_DELIVERIES = int(os.getenv('TIME_ENTRY_INGEST_MAX_DELIVERIES', '5'))
+# Running timers (`/time-entries/timer/`) live in Redis until stopped; `sweep_timers` discards those
+# running for longer than this, which were most likely forgotten.
+TIME_ENTRY_TIMER_ABANDONED_AFTER_HOURS = int(os.getenv('TIME_ENTRY_TIMER_ABANDONED_AFTER_HOURS', '24'))
+# Rows fetched per round trip from the server-side cursor of exports (`/time-entries/export.csv`).
+TIME_ENTRY_EXPORT_CHUNK_SIZE = int(os.getenv('TIME_ENTRY_EXPORT_CHUNK_SIZE', '2000'))
+# Background exports (`/exports/`): `run_export_jobs` writes them below `TIME_ENTRY_EXPORT_ROOT` and deletes them
+# `TIME_ENTRY_EXPORT_TTL_HOURS` after completion. An export whose worker reported no progress for
+# `TIME_ENTRY_EXPORT_STALE_SECONDS` (e.g. it crashed) is taken over by another worker.
+TIME_ENTRY_EXPORT_ROOT = os.getenv('TIME_ENTRY_EXPORT_ROOT', str(BASE_DIR / 'media' / 'exports'))
+TIME_ENTRY_EXPORT_TTL_HOURS = int(os.getenv('TIME_ENTRY_EXPORT_TTL_HOURS', '24'))
+TIME_ENTRY_EXPORT_STALE_SECONDS = int(os.getenv('TIME_ENTRY_EXPORT_STALE_SECONDS', '300'))
+
 # Spectacular settings
 SPECTACULAR_SETTINGS = {
     'TITLE': 'TimeMate',